@@ -0,0 +1,132 @@
+"""Replays synthetic request traces against the eviction policies of `hordes.cache`.
+
+Usage: python benchmarks/cache_policies.py [--requests N] [--seed N]
+
+Traces model what the caches of the renderers see:
+
+- zipf: skewed popularity of equally sized and equally expensive entries, e.g. rendered cards.
+- scan: same as zipf, with bursts of one-off requests, e.g. a leaderboard crawl rendering every character once.
+- shift: popular entries change over time, e.g. new items after a patch.
+- assets: skewed popularity of files with different sizes, where rasterized SVGs cost ~100x more than reads.
+
+Cache size is 10% of the total size of distinct entries.
+
+Results with default arguments, as share of requests, bytes and miss cost served from cache:
+
+    trace    policy      hits   bytes    cost
+    zipf     lru       66.94%  66.94%  66.94%
+    zipf     tinylfu   71.28%  71.28%  71.28%
+    zipf     gdsf      71.13%  71.13%  71.13%
+    scan     lru       68.03%  68.03%  68.03%
+    scan     tinylfu   70.13%  70.13%  70.13%
+    scan     gdsf      70.11%  70.11%  70.11%
+    shift    lru       75.99%  75.99%  75.99%
+    shift    tinylfu   58.27%  58.27%  58.27%
+    shift    gdsf      74.62%  74.62%  74.62%
+    assets   lru       55.64%  55.35%  63.98%
+    assets   tinylfu   61.64%  61.32%  73.42%
+    assets   gdsf      49.55%  44.76%  84.14%
+
+LRU stays the default of `PolicyCache`. TinyLFU and GDSF gain only 2-4 points on stable popularity, and
+TinyLFU loses 18 points when popularity shifts, while LRU is never more than 5 points behind the best policy
+on equal costs. GDSF is worth setting as `buffer_policy` of `AssetLoader` when SVGs are rasterized, where it
+serves the most miss cost at the price of fewer hits.
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+from itertools import accumulate
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from hordes.cache import EvictionPolicy, GDSFPolicy, LRUPolicy, TinyLFUPolicy, compare_policies  # noqa: E402
+
+Trace = list[tuple[int, int, float]]
+
+KEYS = 10_000
+CACHE_SHARE = 0.1
+
+POLICIES: dict[str, Callable[[int], EvictionPolicy[int]]] = {
+    'lru': LRUPolicy,
+    'tinylfu': TinyLFUPolicy,
+    'gdsf': GDSFPolicy,
+}
+
+
+def zipf_keys(rng: random.Random, amount: int, keys: int = KEYS, exponent: float = 1.0) -> list[int]:
+    weights = list(accumulate(1 / (rank + 1) ** exponent for rank in range(keys)))
+    return rng.choices(range(keys), cum_weights=weights, k=amount)
+
+
+def zipf_trace(rng: random.Random, requests: int) -> Trace:
+    return [(key, 1, 1.0) for key in zipf_keys(rng, requests)]
+
+
+def scan_trace(rng: random.Random, requests: int) -> Trace:
+    trace: Trace = []
+    scanned = KEYS
+    for i, key in enumerate(zipf_keys(rng, requests)):
+        trace.append((key, 1, 1.0))
+        if i % 10_000 == 9_999:
+            trace.extend((scanned + offset, 1, 1.0) for offset in range(2_000))
+            scanned += 2_000
+
+    return trace
+
+
+def shift_trace(rng: random.Random, requests: int) -> Trace:
+    phases = 4
+    trace: Trace = []
+    for phase in range(phases):
+        offset = phase * KEYS // 2
+        trace.extend((key + offset, 1, 1.0) for key in zipf_keys(rng, requests // phases))
+
+    return trace
+
+
+def assets_trace(rng: random.Random, requests: int) -> Trace:
+    sizes = [rng.randint(2_000, 200_000) for _ in range(KEYS)]
+    svg = [rng.random() < 0.3 for _ in range(KEYS)]
+    # Reads take ~0.1ms, rasterization ~10ms
+    costs = [rng.uniform(5, 15) if is_svg else rng.uniform(0.05, 0.15) for is_svg in svg]
+
+    return [(key, sizes[key], costs[key]) for key in zipf_keys(rng, requests, exponent=0.9)]
+
+
+TRACES: dict[str, Callable[[random.Random, int], Trace]] = {
+    'zipf': zipf_trace,
+    'scan': scan_trace,
+    'shift': shift_trace,
+    'assets': assets_trace,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Replays synthetic request traces against eviction policies.')
+    parser.add_argument('--requests', type=int, default=200_000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f'{"trace":<8} {"policy":<8} {"hits":>7} {"bytes":>7} {"cost":>7}')
+    for trace_name, create_trace in TRACES.items():
+        trace = create_trace(random.Random(args.seed), args.requests)
+
+        distinct: dict[int, int] = {}
+        for key, size, _ in trace:
+            distinct[key] = size
+        max_size = max(int(sum(distinct.values()) * CACHE_SHARE), 1)
+
+        for policy_name, result in compare_policies(trace, max_size, POLICIES).items():
+            print(
+                f'{trace_name:<8} {policy_name:<8} {result.hit_ratio:>7.2%} '
+                f'{result.byte_hit_ratio:>7.2%} {result.cost_hit_ratio:>7.2%}'
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -8,6 +8,9 @@ if TYPE_CHECKING:
     from .types.character import ClassId
 
 
+BLOCK_MULTIPLIERS = (0.6, 0.45, 0.45, 0.45)
+
+
 class Buildscore(NamedTuple):
     dps: float
     burst: float
@@ -27,16 +30,14 @@ def get_buildscore(stats: Stats, class_id: ClassId) -> Buildscore:
     crit = min(stats[14] / 10, 100)
     haste = stats[16] / 10
 
-    block_multiplier = (0.6, 0.45, 0.45, 0.45)
-
     avgdmg = (min_dmg + max_dmg) / 2
     defred = (1 - math.exp(-defense * 0.0022)) * 0.87
-    blockvalue = 1 - block / 100 * block_multiplier[class_id]
+    blockvalue = 1 - block / 100 * BLOCK_MULTIPLIERS[class_id]
 
     dps = avgdmg * (1 + crit / 100) * (1 + haste / 100)
     burst = avgdmg * (1 + crit / 100)
     ehp = hp / ((1 - defred) * blockvalue)
-    dmgred = defred + (((block / 100) * block_multiplier[class_id]))
+    dmgred = defred + (((block / 100) * BLOCK_MULTIPLIERS[class_id]))
     hpvalue = 1 / (1 - (1 - (1 - defred) * blockvalue))
 
     if class_id == 0:
@@ -0,0 +1,6 @@
+from .budget import *
+from .concurrent import *
+from .disk import *
+from .lru import *
+from .memoize import *
+from .policy import *
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import weakref
+from threading import Lock
+from typing import NamedTuple, Protocol
+
+from .concurrent import CacheInfo
+
+__all__ = (
+    'ResizableCache',
+    'CacheUsage',
+    'CacheRegistry',
+    'cache_registry',
+)
+
+
+class ResizableCache(Protocol):
+    """Cache with size measured in bytes, e.g. `ConcurrentBytesCache` or `PolicyCache`."""
+
+    @property
+    def max_size(self) -> int: ...
+
+    def info(self) -> CacheInfo: ...
+
+    def resize(self, max_size: int) -> None: ...
+
+
+class CacheUsage(NamedTuple):
+    name: str
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    hit_ratio: float
+    weight: float
+
+
+class _Entry:
+    __slots__ = ('ref', 'weight', 'hits')
+
+    def __init__(self, ref: weakref.ref[ResizableCache], weight: float, hits: int) -> None:
+        self.ref = ref
+        self.weight = weight
+        self.hits = hits
+
+
+class CacheRegistry:
+    """Shares a memory budget between registered caches.
+
+    Every cache is guaranteed `min_share` of the budget divided equally, the rest is split proportionally
+    to weighted hits since the previous rebalance. Allocations move halfway towards the target on each
+    `rebalance` to avoid thrashing. Caches are referenced weakly and dropped once garbage collected.
+
+    Parameters
+    ----------
+    budget : int
+        Total size of registered caches in bytes.
+    min_share : float, optional
+        Share of the budget split equally between caches regardless of their hits. Defaults to 0.2.
+    """
+
+    def __init__(self, budget: int, *, min_share: float = 0.2) -> None:
+        if not budget > 0:
+            raise ValueError(f'Expected budget to be more than 0, received {budget}')
+        if not 0 <= min_share <= 1:
+            raise ValueError(f'Expected min share to be between 0 and 1, received {min_share}')
+
+        self._budget = budget
+        self.min_share = min_share
+
+        self._lock = Lock()
+        self._entries: dict[str, _Entry] = {}
+
+    @property
+    def budget(self) -> int:
+        return self._budget
+
+    def set_budget(self, budget: int) -> None:
+        if not budget > 0:
+            raise ValueError(f'Expected budget to be more than 0, received {budget}')
+
+        with self._lock:
+            self._budget = budget
+            self._rebalance(damping=0)
+
+    def register(self, name: str, cache: ResizableCache, *, weight: float = 1.0) -> None:
+        """Adds `cache` under a unique `name` and rebalances.
+
+        `weight` multiplies the value of hits, e.g. set it higher for caches whose misses are more expensive.
+        """
+
+        if not weight > 0:
+            raise ValueError(f'Expected weight to be more than 0, received {weight}')
+
+        with self._lock:
+            if name in self._entries and self._entries[name].ref() is not None:
+                raise ValueError(f'Cache {name!r} is already registered')
+
+            self._entries[name] = _Entry(weakref.ref(cache), weight, cache.info().hits)
+            self._rebalance(damping=0)
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            del self._entries[name]
+
+    def _get_caches(self) -> dict[str, tuple[_Entry, ResizableCache]]:
+        caches: dict[str, tuple[_Entry, ResizableCache]] = {}
+        for name, entry in list(self._entries.items()):
+            cache = entry.ref()
+            if cache is None:
+                del self._entries[name]
+            else:
+                caches[name] = (entry, cache)
+
+        return caches
+
+    def rebalance(self) -> None:
+        """Redistributes the budget according to hits since the previous call, should be called periodically."""
+        with self._lock:
+            self._rebalance(damping=0.5)
+
+    def _rebalance(self, *, damping: float) -> None:
+        caches = self._get_caches()
+        if not caches:
+            return
+
+        values: dict[str, float] = {}
+        for name, (entry, cache) in caches.items():
+            hits = cache.info().hits
+            values[name] = max(hits - entry.hits, 0) * entry.weight
+            entry.hits = hits
+
+        total_value = sum(values.values())
+        if not total_value:
+            if damping:  # Nothing was requested, keep current allocations
+                return
+
+            values = {name: entry.weight for name, (entry, _) in caches.items()}
+            total_value = sum(values.values())
+
+        shared = self._budget * (1 - self.min_share)
+        floor = self._budget * self.min_share / len(caches)
+
+        targets = {name: floor + shared * value / total_value for name, value in values.items()}
+        if damping:
+            total_current = sum(cache.max_size for _, cache in caches.values())
+            scale = self._budget / total_current if total_current else 1
+            targets = {
+                name: damping * caches[name][1].max_size * scale + (1 - damping) * target for name, target in targets.items()
+            }
+
+        # Shrink first, so the total never goes over budget
+        sizes = {name: max(int(target), 1) for name, target in targets.items()}
+        for name in sorted(sizes, key=lambda name: sizes[name] - caches[name][1].max_size):
+            caches[name][1].resize(sizes[name])
+
+    def snapshot(self) -> list[CacheUsage]:
+        """Usage of every registered cache."""
+        with self._lock:
+            usage: list[CacheUsage] = []
+            for name, (entry, cache) in self._get_caches().items():
+                info = cache.info()
+                requests = info.hits + info.misses
+                usage.append(
+                    CacheUsage(
+                        name=name,
+                        size=info.size,
+                        max_size=info.max_size,
+                        hits=info.hits,
+                        misses=info.misses,
+                        hit_ratio=info.hits / requests if requests else 0,
+                        weight=entry.weight,
+                    )
+                )
+
+            return usage
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} budget={self._budget} caches={len(self._entries)}>'
+
+
+cache_registry = CacheRegistry(64 * 1024 * 1024)
+"""Process-wide registry with 64MB budget, default target of `register_caches` of loaders."""
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import math
+from abc import abstractmethod
+from threading import Lock
+from typing import Generic, Iterator, MutableMapping, NamedTuple, TypeVar
+
+from .lru import BytesCache, LRUDict, SizedCache
+
+__all__ = (
+    'CacheInfo',
+    'ConcurrentSizedCache',
+    'ConcurrentBytesCache',
+)
+
+KT = TypeVar('KT')
+VT = TypeVar('VT')
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    length: int
+    size: int
+    peak_size: int
+    max_size: int
+
+
+class _Shard(Generic[KT, VT]):
+    __slots__ = ('lock', 'cache', 'hits', 'misses', 'evictions', 'peak_size')
+
+    def __init__(self, cache: LRUDict[KT, VT]) -> None:
+        self.lock = Lock()
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.peak_size = 0
+
+
+class _ConcurrentCache(MutableMapping[KT, VT]):
+    """Lock-sharded LRU cache with hit, miss and eviction counters.
+
+    Keys are spread between `shards` independent caches by hash, each with its own lock
+    and an equal part of `max_size`. Subclasses create the cache of a shard in `_create_cache`.
+    """
+
+    _shards: list[_Shard[KT, VT]]
+
+    def __init__(self, *, max_size: int, shards: int = 1) -> None:
+        if not max_size > 0:
+            raise ValueError(f'Expected size to be more than 0, received {max_size}')
+        if not shards > 0:
+            raise ValueError(f'Expected shards to be more than 0, received {shards}')
+
+        self._max_size = max_size
+        self._shards = [_Shard(self._create_cache(math.ceil(max_size / shards))) for _ in range(shards)]
+
+    @abstractmethod
+    def _create_cache(self, max_size: int) -> LRUDict[KT, VT]: ...
+
+    def _get_size(self, cache: LRUDict[KT, VT]) -> int:
+        return len(cache)
+
+    def _get_shard(self, key: KT) -> _Shard[KT, VT]:
+        return self._shards[hash(key) % len(self._shards)]
+
+    @property
+    def max_size(self) -> int:
+        return self._max_size
+
+    @property
+    def size(self) -> int:
+        return sum(self._get_size(shard.cache) for shard in self._shards)
+
+    def resize(self, max_size: int) -> None:
+        """Changes `max_size`, evicting least recently used items if needed."""
+        if not max_size > 0:
+            raise ValueError(f'Expected size to be more than 0, received {max_size}')
+
+        self._max_size = max_size
+        shard_size = math.ceil(max_size / len(self._shards))
+        for shard in self._shards:
+            with shard.lock:
+                length = len(shard.cache)
+                if isinstance(shard.cache, (SizedCache, BytesCache)):
+                    shard.cache.resize(shard_size)
+                shard.evictions += length - len(shard.cache)
+
+    def info(self) -> CacheInfo:
+        """Snapshot of cache counters.
+
+        `peak_size` is the sum of peaks of each shard, so it's an upper bound when there is more than one shard.
+        """
+
+        hits = misses = evictions = length = size = peak_size = 0
+        for shard in self._shards:
+            with shard.lock:
+                hits += shard.hits
+                misses += shard.misses
+                evictions += shard.evictions
+                length += len(shard.cache)
+                size += self._get_size(shard.cache)
+                peak_size += shard.peak_size
+
+        return CacheInfo(hits, misses, evictions, length, size, peak_size, self._max_size)
+
+    def __getitem__(self, key: KT) -> VT:
+        shard = self._get_shard(key)
+        with shard.lock:
+            try:
+                value = shard.cache[key]
+            except KeyError:
+                shard.misses += 1
+                raise
+
+            shard.hits += 1
+            return value
+
+    def __setitem__(self, key: KT, value: VT) -> None:
+        shard = self._get_shard(key)
+        with shard.lock:
+            expected = len(shard.cache) + (key not in shard.cache)
+            shard.cache[key] = value
+
+            shard.evictions += expected - len(shard.cache)
+            shard.peak_size = max(shard.peak_size, self._get_size(shard.cache))
+
+    def __delitem__(self, key: KT) -> None:
+        shard = self._get_shard(key)
+        with shard.lock:
+            del shard.cache[key]
+
+    def __contains__(self, key: object) -> bool:
+        """Checks presence without affecting LRU order or counters."""
+        shard = self._get_shard(key)  # pyright: ignore[reportArgumentType]
+        with shard.lock:
+            return key in shard.cache
+
+    def __iter__(self) -> Iterator[KT]:
+        keys: list[KT] = []
+        for shard in self._shards:
+            with shard.lock:
+                keys.extend(shard.cache.keys())
+
+        return iter(keys)
+
+    def __len__(self) -> int:
+        return sum(len(shard.cache) for shard in self._shards)
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.cache.clear()
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} len={len(self)} size={self.size} max_size={self.max_size}>'
+
+
+class ConcurrentSizedCache(_ConcurrentCache[KT, VT]):
+    """Thread-safe `SizedCache`, size is the amount of items."""
+
+    def _create_cache(self, max_size: int) -> LRUDict[KT, VT]:
+        return SizedCache(max_size=max_size)
+
+
+class ConcurrentBytesCache(_ConcurrentCache[KT, bytes]):
+    """Thread-safe `BytesCache`, size is the total length of values in bytes."""
+
+    def _create_cache(self, max_size: int) -> LRUDict[KT, bytes]:
+        return BytesCache(max_size=max_size)
+
+    def _get_size(self, cache: LRUDict[KT, bytes]) -> int:
+        return cache.size if isinstance(cache, BytesCache) else len(cache)
@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from pathlib import Path
+from threading import Lock
+from typing import Iterator, MutableMapping, Optional, Union
+
+from .concurrent import CacheInfo
+
+__all__ = (
+    'DiskCache',
+    'TieredCache',
+)
+
+
+class DiskCache:
+    """Directory of values addressed by the SHA-256 of their key, shared between processes.
+
+    Writes are atomic, so concurrent readers never see partial files. Least recently used files are removed
+    when the directory grows over `max_size`, down to `low_water` of it, so pruning doesn't run on every write.
+
+    Files are tracked in memory in LRU order, the directory is only scanned on `sync`. Files written by other
+    processes are tracked once they're read or overwritten, or after `sync`.
+
+    Parameters
+    ----------
+    directory : str | Path
+        Cache directory, created if missing.
+    max_size : int
+        Maximum total size of stored values in bytes.
+    low_water : float, optional
+        Share of `max_size` pruning removes files down to, from 0 to 1. Defaults to 0.9.
+    """
+
+    SUFFIX = '.bin'
+
+    def __init__(self, directory: Union[str, Path], *, max_size: int, low_water: float = 0.9) -> None:
+        if not max_size > 0:
+            raise ValueError(f'Expected size to be more than 0, received {max_size}')
+        if not 0 <= low_water <= 1:
+            raise ValueError(f'Expected low water to be between 0 and 1, received {low_water}')
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_size = max_size
+        self.low_water = low_water
+
+        self._lock = Lock()
+        # Sizes of tracked files, least recently used first
+        self._index: OrderedDict[Path, int] = OrderedDict()
+        self._size = 0
+        self.hits = self.misses = self.evictions = 0
+        self.peak_size = 0
+
+        self.sync()
+
+    def _get_path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self.directory / digest[:2] / (digest[2:] + self.SUFFIX)
+
+    def _scan(self) -> list[tuple[float, Path, int]]:
+        files: list[tuple[float, Path, int]] = []
+        for path in self.directory.glob(f'*/*{self.SUFFIX}'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:  # Removed by another process
+                continue
+            files.append((stat.st_mtime, path, stat.st_size))
+
+        return files
+
+    @property
+    def size(self) -> int:
+        """Total size of stored values in bytes, as seen by this process."""
+        return self._size
+
+    def sync(self) -> None:
+        """Rescans the directory, e.g. to account for files written by other processes."""
+        files = sorted(self._scan())
+
+        with self._lock:
+            self._index = OrderedDict((path, size) for _, path, size in files)
+            self._size = sum(self._index.values())
+            self.peak_size = max(self.peak_size, self._size)
+            victims = self._prune() if self._size > self.max_size else []
+
+        self._unlink(victims)
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self.hits, self.misses, self.evictions, len(self._index), self._size, self.peak_size, self.max_size
+            )
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._get_path(key)
+        try:
+            value = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+                self._remove(path)
+            return None
+
+        with self._lock:
+            self.hits += 1
+            self._track(path, len(value))
+            victims = self._prune() if self._size > self.max_size else []
+
+        self._unlink(victims)
+        return value
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_size:
+            return
+
+        path = self._get_path(key)
+        path.parent.mkdir(exist_ok=True)
+
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(value)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+        with self._lock:
+            self._track(path, len(value))
+            victims = self._prune() if self._size > self.max_size else []
+
+        self._unlink(victims)
+
+    def __contains__(self, key: str) -> bool:
+        """Checks presence without affecting counters or LRU order."""
+        return self._get_path(key).exists()
+
+    def delete(self, key: str) -> bool:
+        path = self._get_path(key)
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except FileNotFoundError:
+            return False
+
+        with self._lock:
+            if path in self._index:
+                self._remove(path)
+            else:  # Written by another process
+                self._size = max(self._size - size, 0)
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            for _, path, _ in self._scan():
+                path.unlink(missing_ok=True)
+            self._index.clear()
+            self._size = 0
+
+    def _track(self, path: Path, size: int) -> None:
+        """Marks `path` as most recently used, an overwritten value doesn't count towards the size anymore."""
+        self._size += size - self._index.pop(path, 0)
+        self._index[path] = size
+        self.peak_size = max(self.peak_size, self._size)
+
+    def _remove(self, path: Path) -> None:
+        self._size -= self._index.pop(path, 0)
+
+    def _prune(self) -> list[Path]:
+        """Untracks least recently used files down to `low_water`, they're unlinked outside of the lock."""
+        target = self.max_size * self.low_water
+        victims: list[Path] = []
+        while self._index and self._size > target:
+            path, size = self._index.popitem(last=False)
+            self._size -= size
+            victims.append(path)
+
+        self.evictions += len(victims)
+        return victims
+
+    @staticmethod
+    def _unlink(paths: list[Path]) -> None:
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} directory={str(self.directory)!r} size={self._size} max_size={self.max_size}>'
+
+
+class TieredCache(MutableMapping[str, bytes]):
+    """In-memory cache in front of a `DiskCache`, e.g. `render_cache` of renderers that is kept across restarts.
+
+    Values missing from `memory` are read from `disk` and kept in memory afterwards, writes go to both tiers.
+    Iteration and length only cover `memory`.
+
+    Parameters
+    ----------
+    memory : MutableMapping[str, bytes]
+        Fast tier, e.g. `ConcurrentBytesCache`.
+    disk : DiskCache
+        Persistent tier, can be shared between processes.
+    namespace : str, optional
+        Prefix of keys on disk. Render keys only describe what is rendered, so it should change whenever
+        anything else affecting the output does, e.g. assets, fonts or localization. Defaults to no prefix.
+    """
+
+    def __init__(self, memory: MutableMapping[str, bytes], disk: DiskCache, *, namespace: str = '') -> None:
+        self.memory = memory
+        self.disk = disk
+        self.namespace = namespace
+
+    def __getitem__(self, key: str) -> bytes:
+        try:
+            return self.memory[key]
+        except KeyError:
+            pass
+
+        value = self.disk.get(self.namespace + key)
+        if value is None:
+            raise KeyError(key)
+
+        self.memory[key] = value
+        return value
+
+    def __setitem__(self, key: str, value: bytes) -> None:
+        self.memory[key] = value
+        self.disk.set(self.namespace + key, value)
+
+    def __delitem__(self, key: str) -> None:
+        in_memory = key in self.memory
+        if in_memory:
+            del self.memory[key]
+
+        if not self.disk.delete(self.namespace + key) and not in_memory:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and (key in self.memory or (self.namespace + key) in self.disk)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.memory)
+
+    def __len__(self) -> int:
+        return len(self.memory)
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} memory={self.memory!r} disk={self.disk!r}>'
@@ -4,11 +4,12 @@ from collections import OrderedDict
 from typing import TYPE_CHECKING, Any, Iterable, TypeVar, overload
 
 if TYPE_CHECKING:
-    from .types.common import SupportsKeysAndGetItem
+    from ..types.common import SupportsKeysAndGetItem
 
 
 __all__ = (
     'LRUDict',
+    'SizedCache',
     'BytesCache',
 )
 
@@ -66,12 +67,22 @@ class SizedCache(LRUDict[KT, VT]):
 
         self.max_size = max_size
 
-    def __setitem__(self, key, value) -> None:
-        super().__setitem__(key, value)
+    def resize(self, max_size: int) -> None:
+        if not max_size > 0:
+            raise ValueError(f'Expected size to be more than 0, received {max_size}')
 
+        self.max_size = max_size
+        self._evict()
+
+    def _evict(self) -> None:
         while len(self) > self.max_size:
             self.__delitem__(next(iter(self)))
 
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+
+        self._evict()
+
 
 class BytesCache(LRUDict[KT, bytes]):
     # Reused overloads from dict type stubs licensed under Apache 2.0 by typeshed
@@ -111,13 +122,35 @@ class BytesCache(LRUDict[KT, bytes]):
 
         self._size: int = sum([len(i) for i in self.values()])
 
+    @property
+    def size(self) -> int:
+        """Total size of stored values in bytes."""
+        return self._size
+
+    def resize(self, max_size: int) -> None:
+        if not max_size > 0:
+            raise ValueError(f'Expected size to be more than 0, received {max_size}')
+
+        self.max_size = max_size
+        self._evict()
+
+    def _evict(self) -> None:
+        while self._size > self.max_size:
+            self.__delitem__(next(iter(self)))
+
     def __setitem__(self, key: KT, value: bytes) -> None:
+        if key in self:
+            self.__delitem__(key)
+
         super().__setitem__(key, value)
 
         self._size += len(value)
 
-        while self._size > self.max_size:
-            self.__delitem__(next(iter(self)))
+        self._evict()
+
+    def clear(self) -> None:
+        super().clear()
+        self._size = 0
 
     def __delitem__(self, key: KT) -> None:
         value = self.get(key)
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+from threading import Event, Lock
+from typing import Any, Awaitable, Callable, Generic, Hashable, MutableMapping, Optional, TypeVar
+
+__all__ = (
+    'make_key',
+    'SingleFlight',
+    'memoize',
+    'memoize_method',
+    'memoize_async',
+)
+
+KT = TypeVar('KT', bound=Hashable)
+VT = TypeVar('VT')
+F = TypeVar('F', bound=Callable[..., Any])
+AF = TypeVar('AF', bound=Callable[..., Awaitable[Any]])
+
+
+def make_key(*args: Hashable, **kwargs: Hashable) -> Hashable:
+    """Default key of `memoize` decorators, arguments have to be hashable."""
+    if not kwargs:
+        return args
+
+    return (args, tuple(sorted(kwargs.items())))
+
+
+class _Call(Generic[VT]):
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self) -> None:
+        self.event = Event()
+        self.value: Optional[VT] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight(Generic[KT, VT]):
+    """Runs at most one computation per key at a time, concurrent callers wait for its result.
+
+    Results are not kept after the computation is done, combine with a cache for that.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._calls: dict[KT, _Call[VT]] = {}
+
+    def do(self, key: KT, func: Callable[[], VT]) -> VT:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value  # pyright: ignore[reportReturnType]
+
+        try:
+            call.value = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+        return call.value
+
+
+def memoize(cache: MutableMapping[Any, Any], *, key: Callable[..., Hashable] = make_key) -> Callable[[F], F]:
+    """Caches results of a function in `cache`, e.g. `SizedCache` or `ConcurrentBytesCache`.
+
+    Concurrent calls with the same key share one computation. Exceptions are not cached.
+
+    Parameters
+    ----------
+    cache : MutableMapping
+        Storage of results, should be thread-safe if the function is called from several threads.
+    key : Callable[..., Hashable], optional
+        Creates a cache key from call arguments. Defaults to `make_key`.
+    """
+
+    def decorator(func: F) -> F:
+        flight: SingleFlight[Hashable, Any] = SingleFlight()
+
+        def load(cache_key: Hashable, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+            value = func(*args, **kwargs)
+            cache[cache_key] = value
+            return value
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            cache_key = key(*args, **kwargs)
+            try:
+                return cache[cache_key]
+            except KeyError:
+                pass
+
+            return flight.do(cache_key, lambda: load(cache_key, args, kwargs))
+
+        return wrapper  # pyright: ignore[reportReturnType]
+
+    return decorator
+
+
+def memoize_method(attribute: str, *, key: Callable[..., Hashable] = make_key) -> Callable[[F], F]:
+    """Same as `memoize`, but results are stored in the instance attribute `attribute`.
+
+    `key` is called without `self`.
+    """
+
+    def decorator(func: F) -> F:
+        flight: SingleFlight[tuple[int, Hashable], Any] = SingleFlight()
+
+        def load(self: Any, cache_key: Hashable, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+            value = func(self, *args, **kwargs)
+            getattr(self, attribute)[cache_key] = value
+            return value
+
+        @functools.wraps(func)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            cache: MutableMapping[Hashable, Any] = getattr(self, attribute)
+            cache_key = key(*args, **kwargs)
+            try:
+                return cache[cache_key]
+            except KeyError:
+                pass
+
+            # `self` is alive while its call is in flight, so its id can't be reused by another instance
+            return flight.do((id(self), cache_key), lambda: load(self, cache_key, args, kwargs))
+
+        return wrapper  # pyright: ignore[reportReturnType]
+
+    return decorator
+
+
+def memoize_async(cache: MutableMapping[Any, Any], *, key: Callable[..., Hashable] = make_key) -> Callable[[AF], AF]:
+    """Async version of `memoize`.
+
+    Computation runs as a separate task, so it is not cancelled when one of waiting callers is cancelled.
+    Intended to be used from a single event loop.
+    """
+
+    def decorator(func: AF) -> AF:
+        pending: dict[Hashable, asyncio.Future[Any]] = {}
+
+        def done(cache_key: Hashable, task: asyncio.Future[Any]) -> None:
+            del pending[cache_key]
+            if not task.cancelled() and task.exception() is None:
+                cache[cache_key] = task.result()
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            cache_key = key(*args, **kwargs)
+            try:
+                return cache[cache_key]
+            except KeyError:
+                pass
+
+            task = pending.get(cache_key)
+            if task is None:
+                task = pending[cache_key] = asyncio.ensure_future(func(*args, **kwargs))
+                task.add_done_callback(functools.partial(done, cache_key))
+
+            return await asyncio.shield(task)
+
+        return wrapper  # pyright: ignore[reportReturnType]
+
+    return decorator
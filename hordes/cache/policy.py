@@ -0,0 +1,543 @@
+from __future__ import annotations
+
+import heapq
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Generic, Iterable, Iterator, MutableMapping, NamedTuple, Optional, Protocol, TypeVar
+
+from .concurrent import CacheInfo
+
+__all__ = (
+    'EvictionPolicy',
+    'LRUPolicy',
+    'TinyLFUPolicy',
+    'GDSFPolicy',
+    'PolicyCache',
+    'TraceResult',
+    'replay_trace',
+    'compare_policies',
+)
+
+KT = TypeVar('KT')
+VT = TypeVar('VT')
+
+
+class EvictionPolicy(Protocol[KT]):
+    """Decides which entries a `PolicyCache` keeps.
+
+    Policy only tracks keys, their sizes and costs, values are stored by the cache.
+    """
+
+    max_size: int
+
+    @property
+    def size(self) -> int: ...
+
+    def access(self, key: KT, hit: bool) -> None:
+        """Records a lookup of `key`, called on both hits and misses."""
+        ...
+
+    def insert(self, key: KT, size: int, cost: float) -> list[KT]:
+        """Adds `key` and returns keys that have to be evicted, which may include `key` itself if it's rejected."""
+        ...
+
+    def remove(self, key: KT) -> None: ...
+
+    def resize(self, max_size: int) -> list[KT]:
+        """Changes `max_size` and returns keys that have to be evicted."""
+        ...
+
+
+class LRUPolicy(Generic[KT]):
+    """Least Recently Used, same as `BytesCache`."""
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[KT, int] = OrderedDict()
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def access(self, key: KT, hit: bool) -> None:
+        if hit:
+            self._entries.move_to_end(key)
+
+    def insert(self, key: KT, size: int, cost: float) -> list[KT]:
+        self._entries[key] = size
+        self._size += size
+
+        return self._evict()
+
+    def remove(self, key: KT) -> None:
+        self._size -= self._entries.pop(key)
+
+    def resize(self, max_size: int) -> list[KT]:
+        self.max_size = max_size
+        return self._evict()
+
+    def _evict(self) -> list[KT]:
+        evicted: list[KT] = []
+        while self._size > self.max_size:
+            key, size = self._entries.popitem(last=False)
+            self._size -= size
+            evicted.append(key)
+
+        return evicted
+
+
+class _FrequencySketch:
+    """Count-min sketch of 4-bit counters with periodic aging."""
+
+    _DEPTH = 4
+
+    def __init__(self, width: int) -> None:
+        self._mask = (1 << max(width - 1, 1).bit_length()) - 1
+        self._rows = [bytearray(self._mask + 1) for _ in range(self._DEPTH)]
+        self._sample_size = 10 * (self._mask + 1)
+        self._additions = 0
+
+    def _indexes(self, key: object) -> Iterator[int]:
+        for seed in range(self._DEPTH):
+            yield hash((seed, key)) & self._mask
+
+    def increment(self, key: object) -> None:
+        added = False
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < 15:
+                row[index] += 1
+                added = True
+
+        if added:
+            self._additions += 1
+            if self._additions >= self._sample_size:
+                self._reset()
+
+    def frequency(self, key: object) -> int:
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+    def _reset(self) -> None:
+        # Halving keeps the sketch biased towards recent popularity
+        for row in self._rows:
+            row[:] = bytes(value >> 1 for value in row)
+        self._additions //= 2
+
+
+class TinyLFUPolicy(Generic[KT]):
+    """Window TinyLFU.
+
+    New entries go into a small LRU window. Entries leaving the window are only admitted into the main
+    segmented LRU if they are worth more than the entries they would evict, so one-off entries don't flush
+    popular ones. Worth of an entry is its request frequency, as estimated by a frequency sketch, times its
+    miss cost. With equal costs admission only depends on frequency.
+
+    Parameters
+    ----------
+    max_size : int
+        Maximum total size of entries.
+    window : float, optional
+        Share of `max_size` used by the window. Defaults to 0.01.
+    protected : float, optional
+        Share of the main segment used by frequently accessed entries. Defaults to 0.8.
+    sketch_width : int, optional
+        Amount of counters in each row of the frequency sketch, should be a few times larger than the
+        expected amount of entries. Defaults to 4096.
+    """
+
+    def __init__(self, max_size: int, *, window: float = 0.01, protected: float = 0.8, sketch_width: int = 4096) -> None:
+        if not 0 < window < 1:
+            raise ValueError(f'Expected window to be between 0 and 1, received {window}')
+        if not 0 < protected < 1:
+            raise ValueError(f'Expected protected to be between 0 and 1, received {protected}')
+
+        self._window_share = window
+        self._protected_share = protected
+        self._sketch = _FrequencySketch(sketch_width)
+
+        self._window: OrderedDict[KT, int] = OrderedDict()
+        self._probation: OrderedDict[KT, int] = OrderedDict()
+        self._protected: OrderedDict[KT, int] = OrderedDict()
+        self._window_size = self._probation_size = self._protected_size = 0
+        self._costs: dict[KT, float] = {}
+
+        self._set_max_size(max_size)
+
+    def _set_max_size(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._max_window = max(int(max_size * self._window_share), 1)
+        self._max_protected = int((max_size - self._max_window) * self._protected_share)
+
+    @property
+    def size(self) -> int:
+        return self._window_size + self._probation_size + self._protected_size
+
+    def access(self, key: KT, hit: bool) -> None:
+        self._sketch.increment(key)
+        if not hit:
+            return
+
+        if key in self._window:
+            self._window.move_to_end(key)
+        elif key in self._protected:
+            self._protected.move_to_end(key)
+        elif key in self._probation:
+            size = self._probation.pop(key)
+            self._probation_size -= size
+            self._protected[key] = size
+            self._protected_size += size
+
+            while self._protected_size > self._max_protected and len(self._protected) > 1:
+                demoted, demoted_size = self._protected.popitem(last=False)
+                self._protected_size -= demoted_size
+                self._probation[demoted] = demoted_size
+                self._probation_size += demoted_size
+
+    def insert(self, key: KT, size: int, cost: float) -> list[KT]:
+        self._window[key] = size
+        self._window_size += size
+        self._costs[key] = cost
+
+        evicted: list[KT] = []
+        while self._window_size > self._max_window and self._window:
+            candidate, candidate_size = self._window.popitem(last=False)
+            self._window_size -= candidate_size
+            if not self._admit(candidate, candidate_size, evicted):
+                del self._costs[candidate]
+                evicted.append(candidate)
+
+        return evicted
+
+    def _get_worth(self, key: KT) -> float:
+        return self._sketch.frequency(key) * self._costs[key]
+
+    def _admit(self, candidate: KT, size: int, evicted: list[KT]) -> bool:
+        victims: list[tuple[OrderedDict[KT, int], KT]] = []
+        free = self.max_size - self.size - size
+        for segment in (self._probation, self._protected):
+            for key, victim_size in segment.items():
+                if free >= 0:
+                    break
+                victims.append((segment, key))
+                free += victim_size
+
+        if free < 0:
+            return False
+
+        worth = self._get_worth(candidate)
+        if victims and any(self._get_worth(key) >= worth for _, key in victims):
+            return False
+
+        for segment, key in victims:
+            self._remove_from(segment, key)
+            evicted.append(key)
+
+        self._probation[candidate] = size
+        self._probation_size += size
+        return True
+
+    def _remove_from(self, segment: OrderedDict[KT, int], key: KT) -> None:
+        size = segment.pop(key)
+        del self._costs[key]
+        if segment is self._window:
+            self._window_size -= size
+        elif segment is self._probation:
+            self._probation_size -= size
+        else:
+            self._protected_size -= size
+
+    def remove(self, key: KT) -> None:
+        for segment in (self._window, self._probation, self._protected):
+            if key in segment:
+                self._remove_from(segment, key)
+                return
+
+        raise KeyError(key)
+
+    def resize(self, max_size: int) -> list[KT]:
+        self._set_max_size(max_size)
+
+        evicted: list[KT] = []
+        for segment in (self._window, self._probation, self._protected):
+            while self.size > self.max_size and segment:
+                key = next(iter(segment))
+                self._remove_from(segment, key)
+                evicted.append(key)
+
+        return evicted
+
+
+class _GDSFEntry(NamedTuple):
+    priority: float
+    frequency: int
+    size: int
+    cost: float
+
+
+class GDSFPolicy(Generic[KT]):
+    """GreedyDual-Size-Frequency.
+
+    Priority of an entry is `clock + frequency * cost / size` and the entry with the lowest priority
+    is evicted first. Clock is raised to the priority of every evicted entry, which ages entries that
+    are no longer requested. Small, expensive and frequently requested entries are kept the longest.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._entries: dict[KT, _GDSFEntry] = {}
+        self._heap: list[tuple[float, int, KT]] = []
+        self._sequence = 0
+        self._clock = 0.0
+        self._size = 0
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _push(self, key: KT, frequency: int, size: int, cost: float) -> None:
+        priority = self._clock + frequency * cost / max(size, 1)
+        self._entries[key] = _GDSFEntry(priority, frequency, size, cost)
+
+        # Outdated heap items are skipped when popped
+        heapq.heappush(self._heap, (priority, self._sequence, key))
+        self._sequence += 1
+
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [(entry.priority, i, key) for i, (key, entry) in enumerate(self._entries.items())]
+            heapq.heapify(self._heap)
+            self._sequence = len(self._heap)
+
+    def access(self, key: KT, hit: bool) -> None:
+        if hit:
+            entry = self._entries[key]
+            self._push(key, entry.frequency + 1, entry.size, entry.cost)
+
+    def insert(self, key: KT, size: int, cost: float) -> list[KT]:
+        self._push(key, 1, size, cost)
+        self._size += size
+
+        return self._evict()
+
+    def remove(self, key: KT) -> None:
+        self._size -= self._entries.pop(key).size
+
+    def resize(self, max_size: int) -> list[KT]:
+        self.max_size = max_size
+        return self._evict()
+
+    def _evict(self) -> list[KT]:
+        evicted: list[KT] = []
+        while self._size > self.max_size:
+            priority, _, key = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            if entry is None or entry.priority != priority:
+                continue
+
+            self._clock = priority
+            self.remove(key)
+            evicted.append(key)
+
+        return evicted
+
+
+def _identity_size(value: object) -> int:
+    return len(value)  # pyright: ignore[reportArgumentType]
+
+
+class PolicyCache(MutableMapping[KT, VT]):
+    """Thread-safe cache with pluggable eviction policy.
+
+    Parameters
+    ----------
+    max_size : int
+        Maximum total size of values.
+    policy : Callable[[int], EvictionPolicy], optional
+        Policy factory, called with `max_size`. Defaults to `LRUPolicy`, the most consistent one across traces
+        of `benchmarks/cache_policies.py`.
+    sizeof : Callable[[VT], int], optional
+        Size of a value. Defaults to `len`.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_size: int,
+        policy: Callable[[int], EvictionPolicy[KT]] = LRUPolicy,
+        sizeof: Callable[[VT], int] = _identity_size,
+    ) -> None:
+        if not max_size > 0:
+            raise ValueError(f'Expected size to be more than 0, received {max_size}')
+
+        self._policy = policy(max_size)
+        self._sizeof = sizeof
+        self._values: dict[KT, VT] = {}
+        self._lock = Lock()
+
+        self.hits = self.misses = self.evictions = self.peak_size = 0
+
+    @property
+    def max_size(self) -> int:
+        return self._policy.max_size
+
+    @property
+    def size(self) -> int:
+        return self._policy.size
+
+    @property
+    def policy(self) -> EvictionPolicy[KT]:
+        return self._policy
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(
+                self.hits, self.misses, self.evictions, len(self._values), self.size, self.peak_size, self.max_size
+            )
+
+    def set(self, key: KT, value: VT, *, cost: float = 1.0) -> bool:
+        """Stores `value` unless the policy rejects it.
+
+        `cost` is the price of a miss, e.g. time it took to produce the value.
+
+        Returns
+        -------
+        bool
+            Whether `value` was admitted.
+        """
+
+        size = self._sizeof(value)
+        with self._lock:
+            if key in self._values:
+                del self._values[key]
+                self._policy.remove(key)
+
+            if size > self.max_size:
+                return False
+
+            self._values[key] = value
+            evicted = self._policy.insert(key, size, cost)
+            self._discard(evicted)
+            self.peak_size = max(self.peak_size, self.size)
+
+            return key in self._values
+
+    def resize(self, max_size: int) -> None:
+        if not max_size > 0:
+            raise ValueError(f'Expected size to be more than 0, received {max_size}')
+
+        with self._lock:
+            self._discard(self._policy.resize(max_size))
+
+    def _discard(self, keys: list[KT]) -> None:
+        for key in keys:
+            del self._values[key]
+        self.evictions += len(keys)
+
+    def __getitem__(self, key: KT) -> VT:
+        with self._lock:
+            try:
+                value = self._values[key]
+            except KeyError:
+                self.misses += 1
+                self._policy.access(key, False)
+                raise
+
+            self.hits += 1
+            self._policy.access(key, True)
+            return value
+
+    def __setitem__(self, key: KT, value: VT) -> None:
+        self.set(key, value)
+
+    def __delitem__(self, key: KT) -> None:
+        with self._lock:
+            del self._values[key]
+            self._policy.remove(key)
+
+    def __contains__(self, key: object) -> bool:
+        """Checks presence without affecting the policy or counters."""
+        return key in self._values
+
+    def __iter__(self) -> Iterator[KT]:
+        with self._lock:
+            return iter(list(self._values))
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in self._values:
+                self._policy.remove(key)
+            self._values.clear()
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} len={len(self)} size={self.size} max_size={self.max_size}>'
+
+
+class TraceResult(NamedTuple):
+    requests: int
+    hits: int
+    hit_ratio: float
+    byte_hit_ratio: float
+    cost_hit_ratio: float
+
+
+def replay_trace(trace: Iterable[tuple[KT, int, float]], policy: EvictionPolicy[KT]) -> TraceResult:
+    """Replays a request trace against `policy` without storing values.
+
+    Parameters
+    ----------
+    trace : Iterable[tuple[KT, int, float]]
+        Requested keys with size and miss cost of their values.
+    policy : EvictionPolicy
+        Policy to evaluate, should be fresh.
+
+    Returns
+    -------
+    TraceResult
+        Share of requests, bytes and cost served from cache.
+    """
+
+    present: set[KT] = set()
+    requests = hits = 0
+    total_size = hit_size = 0
+    total_cost = hit_cost = 0.0
+    for key, size, cost in trace:
+        requests += 1
+        total_size += size
+        total_cost += cost
+
+        hit = key in present
+        policy.access(key, hit)
+        if hit:
+            hits += 1
+            hit_size += size
+            hit_cost += cost
+        elif size <= policy.max_size:
+            present.add(key)
+            present.difference_update(policy.insert(key, size, cost))
+
+    return TraceResult(
+        requests=requests,
+        hits=hits,
+        hit_ratio=hits / requests if requests else 0,
+        byte_hit_ratio=hit_size / total_size if total_size else 0,
+        cost_hit_ratio=hit_cost / total_cost if total_cost else 0,
+    )
+
+
+def compare_policies(
+    trace: Iterable[tuple[KT, int, float]],
+    max_size: int,
+    policies: Optional[dict[str, Callable[[int], EvictionPolicy[KT]]]] = None,
+) -> dict[str, TraceResult]:
+    """Replays `trace` against every policy, see `replay_trace`.
+
+    Compares `LRUPolicy`, `TinyLFUPolicy` and `GDSFPolicy` by default.
+    """
+
+    if policies is None:
+        policies = {'lru': LRUPolicy, 'tinylfu': TinyLFUPolicy, 'gdsf': GDSFPolicy}
+
+    requests = list(trace)
+    return {name: replay_trace(requests, factory(max_size)) for name, factory in policies.items()}
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Mapping, Optional
+import math
+from typing import TYPE_CHECKING, Any, Iterable, Mapping, Optional
 
 from ..buildscore import get_buildscore
 from ..data import CHARACTER_BLOODLINES, EQUIP_SLOT_IDS, STATPOINTS_PER_LEVEL
 from ..effects import Effect, Effects
 from ..entity import Entity, EntityStats
 from ..item import Item
+from ..stats import MutableStats, Stats
 from ..utils import MISSING
+from .curve import LevelCurve
 from .elo import Elo
 from .prestige import Prestige
 from .slots import MutableSlots, SlotsProxy
@@ -45,6 +48,34 @@ DEFAULT_STATS = {
 }
 
 
+def get_items_stats(items: Iterable[Optional[Item]]) -> tuple[MutableStats, int]:
+    stats = MutableStats()
+    gearscore = 0
+
+    for item in items:
+        if item:
+            for stat in item.stats:
+                stats[stat.id] += stat.value
+            gearscore += item.gearscore
+
+    return stats, gearscore
+
+
+def select_gear(items: Iterable[Item], level: int) -> list[Item]:
+    """Picks the highest gearscore items legal at `level`, as many per slot group as it has slots."""
+    groups: dict[tuple[int, ...], list[Item]] = {}
+    for item in items:
+        if item.level <= level and item.slot:
+            groups.setdefault(item.slot, []).append(item)
+
+    gear: list[Item] = []
+    for slots, group in groups.items():
+        group.sort(key=lambda item: item.gearscore, reverse=True)
+        gear.extend(group[: len(slots)])
+
+    return gear
+
+
 class Character(Entity):
     class_id: ClassId
 
@@ -124,53 +155,113 @@ class Character(Entity):
 
         self._reload_stats()
 
-    def _set_stats(self, stats: EntityStats, *, tierlist: bool = False, **kwargs: Any) -> None:
-        super()._set_stats(stats, tierlist=tierlist, **kwargs)
+    def level_curve(self, levels: Iterable[int] = range(1, 46), *, items: Optional[Iterable[Item]] = None) -> LevelCurve:
+        """Evaluates stats and buildscore of this build at each of `levels` without changing the character.
+
+        At each level the highest gearscore items legal for that level are equipped out of `items`,
+        which defaults to currently equipped items. Assigned statpoints are scaled down proportionally
+        at levels where fewer of them are available.
+
+        Parameters
+        ----------
+        levels : Iterable[int], optional
+            Levels to evaluate. Defaults to 1-45.
+        items : Iterable[Item], optional
+            Pool of items to pick gear from. Defaults to currently equipped items.
+
+        Returns
+        -------
+        LevelCurve
+            Columnar table of stats per level.
+        """
+
+        if items is None:
+            pool = [item for _, item in self.slots if item]
+        else:
+            pool = [item for item in items if not item.class_id or item.class_id == self.class_id]
+
+        # Level-independent contributions are computed once for the whole sweep
+        pool_stats = {id(item): get_items_stats((item,))[0] for item in pool}
+        base = self._get_base_stats()
+        tierlist_base = self._get_base_stats(tierlist=True)
+        tierlist_effects = self._get_tierlist_effects()
+
+        evaluated: list[int] = []
+        rows: list[Stats] = []
+        gear: list[tuple[Item, ...]] = []
+        for level in levels:
+            equipped = select_gear(pool, level)
+            items_stats = MutableStats()
+            for item in equipped:
+                items_stats += pool_stats[id(item)]
+            gearscore = sum(item.gearscore for item in equipped)
+            statpoints, statpoints_used = self._get_statpoints_stats(level)
+
+            parts = (level, items_stats, gearscore, statpoints, statpoints_used)
+            tierlist_stats = self._evaluate_stats(tierlist_base, *parts, effects=tierlist_effects)
+            stats = self._evaluate_stats(base, *parts, effects=self.effects, overall_score=tierlist_stats[107])
+
+            evaluated.append(level)
+            rows.append(stats)
+            gear.append(tuple(equipped))
+
+        return LevelCurve(evaluated, rows, gear)
+
+    def _get_base_stats(self, *, tierlist: bool = False) -> MutableStats:
+        stats = MutableStats()
 
         for id, value in DEFAULT_STATS.items():
             stats[id] += value
 
         prestige = self.prestige if not tierlist else Prestige(48000)
-
-        # Stats from level
-        stats[1] += 2 * self.level
-        stats[6] += 8 * self.level
-        stats[CHARACTER_BLOODLINES[self.class_id]] += self.level
-
-        # Prestige
         stats += prestige.get_stats()
 
-        # Items
-        gearscore = 0
-        for slot in EQUIP_SLOT_IDS:
-            item = self.slots[slot]
-            if item:
-                for stat in item.stats:
-                    stats[stat.id] += stat.value
-                gearscore += item.gearscore
+        return stats
 
-        # Statpoints
+    def _get_statpoints_stats(self, level: int) -> tuple[MutableStats, int]:
+        available = level * STATPOINTS_PER_LEVEL
+        used = self._statpoints.used
+        scale = available / used if used > available else 1
+
+        stats = MutableStats()
         for id, value in self._statpoints:
-            stats[id] += value
+            stats[id] += math.floor(value * scale)
 
-        # Additional
-        stats[22] = self.level * STATPOINTS_PER_LEVEL - self._statpoints.used
-        stats[25] = gearscore
-        stats[26] = min(45, max(self.level, (gearscore ** (5 / 6)) / 3.6))
+        return stats, int(sum(value for _, value in stats))
 
-    def _reload_stats(self, *, effects: Optional[Effects] = MISSING, tierlist: bool = False, **kwargs: Any) -> EntityStats:
-        if not tierlist:
-            tierlist_effects = Effects()
-            for effect in filter(lambda x: x.id - 61 == self.class_id, self.effects):
-                tierlist_effects.set_effect(effect)
+    def _get_tierlist_effects(self) -> Effects:
+        effects = Effects()
+        for effect in filter(lambda x: x.id - 61 == self.class_id, self.effects):
+            effects.set_effect(effect)
 
-            tierlist_stats = self._reload_stats(tierlist=True, effects=tierlist_effects)
-            overall_score = tierlist_stats[107]
-        else:
-            overall_score = None
+        return effects
 
-        stats = super()._reload_stats(effects=effects, tierlist=tierlist, **kwargs)
+    def _fill_stats(
+        self,
+        stats: MutableStats,
+        base: Stats,
+        level: int,
+        items: Stats,
+        gearscore: int,
+        statpoints: Stats,
+        statpoints_used: int,
+    ) -> None:
+        stats += base
+
+        # Stats from level
+        stats[1] += 2 * level
+        stats[6] += 8 * level
+        stats[CHARACTER_BLOODLINES[self.class_id]] += level
+
+        stats += items
+        stats += statpoints
 
+        # Additional
+        stats[22] = level * STATPOINTS_PER_LEVEL - statpoints_used
+        stats[25] = gearscore
+        stats[26] = min(45, max(level, (gearscore ** (5 / 6)) / 3.6))
+
+    def _set_buildscore(self, stats: MutableStats, overall_score: Optional[float] = None) -> None:
         buildscore = get_buildscore(stats, class_id=self.class_id)
         stats[101] = buildscore.dps
         stats[102] = buildscore.burst
@@ -180,6 +271,54 @@ class Character(Entity):
         stats[106] = buildscore.hybrid_score
         stats[107] = overall_score or buildscore.overall_score
 
+    def _evaluate_stats(
+        self,
+        base: Stats,
+        level: int,
+        items: Stats,
+        gearscore: int,
+        statpoints: Stats,
+        statpoints_used: int,
+        *,
+        effects: Effects,
+        overall_score: Optional[float] = None,
+    ) -> EntityStats:
+        stats = EntityStats()
+        self._fill_stats(stats, base, level, items, gearscore, statpoints, statpoints_used)
+        stats.evaluate(effects=effects)
+        self._set_buildscore(stats, overall_score)
+
+        return stats
+
+    def _set_stats(self, stats: EntityStats, *, tierlist: bool = False, **kwargs: Any) -> None:
+        super()._set_stats(stats, tierlist=tierlist, **kwargs)
+
+        items, gearscore = get_items_stats(self.slots[slot] for slot in EQUIP_SLOT_IDS)
+
+        statpoints = MutableStats()
+        for id, value in self._statpoints:
+            statpoints[id] += value
+
+        self._fill_stats(
+            stats,
+            self._get_base_stats(tierlist=tierlist),
+            self.level,
+            items,
+            gearscore,
+            statpoints,
+            self._statpoints.used,
+        )
+
+    def _reload_stats(self, *, effects: Optional[Effects] = MISSING, tierlist: bool = False, **kwargs: Any) -> EntityStats:
+        if not tierlist:
+            tierlist_stats = self._reload_stats(tierlist=True, effects=self._get_tierlist_effects())
+            overall_score = tierlist_stats[107]
+        else:
+            overall_score = None
+
+        stats = super()._reload_stats(effects=effects, tierlist=tierlist, **kwargs)
+        self._set_buildscore(stats, overall_score)
+
         return stats
 
     @classmethod
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterator, Mapping, Sequence
+
+if TYPE_CHECKING:
+    from ..item import Item
+    from ..stats import Stats
+
+__all__ = ()
+
+
+class LevelCurve(Mapping[int, tuple[float, ...]]):
+    """Columnar table of stats per level, indexed by stat ID."""
+
+    _columns: dict[int, tuple[float, ...]]
+
+    def __init__(self, levels: Sequence[int], rows: Sequence[Stats], gear: Sequence[tuple[Item, ...]]) -> None:
+        self._levels = tuple(levels)
+        self._gear = tuple(gear)
+
+        ids = sorted({id for row in rows for id, _ in row})
+        self._columns = {id: tuple(row[id] for row in rows) for id in ids}
+
+    @property
+    def levels(self) -> tuple[int, ...]:
+        return self._levels
+
+    @property
+    def gear(self) -> tuple[tuple[Item, ...], ...]:
+        """Items equipped at each level."""
+        return self._gear
+
+    def get_row(self, level: int) -> dict[int, float]:
+        index = self._levels.index(level)
+        return {id: column[index] for id, column in self._columns.items()}
+
+    def __getitem__(self, key: int) -> tuple[float, ...]:
+        return self._columns[key]
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return self._columns.__len__()
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} levels={len(self._levels)} stats={len(self._columns)}>'
@@ -1,10 +1,11 @@
 from __future__ import annotations
 
 from collections import defaultdict
+from itertools import chain
 from typing import TYPE_CHECKING, Any, MutableMapping, Optional, Union
 
 from .effects import Effect, Effects
-from .stats import MutableStats, StatsProxy
+from .stats import MutableStats, Stats, StatsProxy
 from .utils import MISSING, math_round
 
 if TYPE_CHECKING:
@@ -168,6 +169,17 @@ class Entity:
     def get_stat_gains(self, id: int, amount: int) -> dict[int, float]:
         return self._stats.get_gains(id, amount)  # Proxy this method outside because it's not accessible on StatsProxy.
 
+    def get_stats_with_effects(self, *effects: Effect) -> Stats:
+        """Evaluates stats as if `effects` were applied on top of current ones, without keeping them."""
+        combined = Effects()
+        for effect in chain(self.effects, effects):
+            combined.set_effect(effect)
+
+        try:
+            return self._reload_stats(effects=combined).copy()
+        finally:
+            self._reload_stats()
+
     @property
     def effects(self) -> Effects:
         return self._effects
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, Iterator, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .buildscore import BLOCK_MULTIPLIERS
+
+if TYPE_CHECKING:
+    import numpy.typing as npt
+
+    from .character import Character
+
+__all__ = (
+    'MatchupProfiles',
+    'MatchupTile',
+    'get_matchup_profiles',
+    'iter_matchup_tiles',
+    'get_matchup_matrix',
+)
+
+
+class MatchupProfiles(NamedTuple):
+    dps: npt.NDArray[np.float64]
+    burst: npt.NDArray[np.float64]
+    ehp: npt.NDArray[np.float64]
+    variance: npt.NDArray[np.float64]
+
+
+class MatchupTile(NamedTuple):
+    rows: slice
+    columns: slice
+    ttk: npt.NDArray[np.floating]
+    win: npt.NDArray[np.floating]
+
+
+DEFAULT_SPREAD = 0.15  # Baseline spread of fight outcome in log-time units
+
+
+def get_matchup_profiles(characters: Iterable[Character]) -> MatchupProfiles:
+    """Collects combat values of evaluated `characters` into arrays.
+
+    `variance` is the per-hit variance of damage taken caused by block chance, defense is accounted for in `ehp`.
+    """
+
+    dps: list[float] = []
+    burst: list[float] = []
+    ehp: list[float] = []
+    variance: list[float] = []
+    for character in characters:
+        stats = character.stats
+        block = min(stats[13] / 1000, 1)
+
+        dps.append(stats[101])
+        burst.append(stats[102])
+        ehp.append(stats[103])
+        variance.append(block * (1 - block) * BLOCK_MULTIPLIERS[character.class_id] ** 2)
+
+    return MatchupProfiles(
+        dps=np.asarray(dps, dtype=np.float64),
+        burst=np.asarray(burst, dtype=np.float64),
+        ehp=np.asarray(ehp, dtype=np.float64),
+        variance=np.asarray(variance, dtype=np.float64),
+    )
+
+
+def _get_ttk(
+    dps: npt.NDArray[np.float64],
+    burst: npt.NDArray[np.float64],
+    ehp: npt.NDArray[np.float64],
+) -> npt.NDArray[np.float64]:
+    # Attacker opens with burst damage and continues with sustained DPS
+    remaining = np.maximum(ehp - burst, 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ttk = remaining / dps
+
+    return np.where(remaining == 0, 0, ttk)
+
+
+def iter_matchup_tiles(
+    profiles: MatchupProfiles,
+    *,
+    tile_size: int = 2048,
+    spread: float = DEFAULT_SPREAD,
+    dtype: npt.DTypeLike = np.float32,
+) -> Iterator[MatchupTile]:
+    """Yields time-to-kill and win probability of every pair of profiles, tile by tile.
+
+    `ttk[i, j]` is the time it takes `i` to kill `j`, `win[i, j]` is the probability of `i` winning against `j`.
+    Only one tile of temporaries is alive at a time, so this works for populations that don't fit in memory as a matrix.
+
+    Parameters
+    ----------
+    profiles : MatchupProfiles
+        Combat values, see `get_matchup_profiles`.
+    tile_size : int, optional
+        Maximum amount of rows and columns of a tile. Defaults to 2048.
+    spread : float, optional
+        Baseline spread of fight outcome, larger values make win probability less decisive. Defaults to 0.15.
+    dtype : DTypeLike, optional
+        Type of yielded arrays. Defaults to `float32`.
+    """
+
+    if not tile_size > 0:
+        raise ValueError(f'Expected tile size to be more than 0, received {tile_size}')
+
+    size = profiles.dps.shape[0]
+    for row_start in range(0, size, tile_size):
+        rows = slice(row_start, min(row_start + tile_size, size))
+
+        dps_i = profiles.dps[rows, None]
+        burst_i = profiles.burst[rows, None]
+        ehp_i = profiles.ehp[rows, None]
+        variance_i = profiles.variance[rows, None]
+
+        for column_start in range(0, size, tile_size):
+            columns = slice(column_start, min(column_start + tile_size, size))
+
+            dps_j = profiles.dps[None, columns]
+            burst_j = profiles.burst[None, columns]
+            ehp_j = profiles.ehp[None, columns]
+            variance_j = profiles.variance[None, columns]
+
+            ttk = _get_ttk(dps_i, burst_i, ehp_j)
+            ttk_reverse = _get_ttk(dps_j, burst_j, ehp_i)
+
+            with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+                advantage = np.log(ttk_reverse) - np.log(ttk)
+                np.nan_to_num(advantage, copy=False, nan=0.0)
+                advantage /= np.sqrt(spread**2 + variance_i + variance_j)
+                win = 1 / (1 + np.exp(-advantage))
+
+            yield MatchupTile(rows=rows, columns=columns, ttk=ttk.astype(dtype), win=win.astype(dtype))
+
+
+def get_matchup_matrix(
+    profiles: MatchupProfiles,
+    *,
+    tile_size: int = 2048,
+    spread: float = DEFAULT_SPREAD,
+    dtype: npt.DTypeLike = np.float32,
+    out: Optional[Sequence[npt.NDArray[np.floating]]] = None,
+) -> tuple[npt.NDArray[np.floating], npt.NDArray[np.floating]]:
+    """Computes N×N time-to-kill and win probability matrices, see `iter_matchup_tiles`.
+
+    Two `float32` matrices for 20k profiles take about 3.2GB. Pass `out` (e.g. a pair of `numpy.memmap`)
+    to write results elsewhere, or use `iter_matchup_tiles` directly to stream them.
+
+    Returns
+    -------
+    tuple[NDArray, NDArray]
+        Time-to-kill and win probability matrices.
+    """
+
+    size = profiles.dps.shape[0]
+    if out is None:
+        ttk = np.empty((size, size), dtype=dtype)
+        win = np.empty((size, size), dtype=dtype)
+    else:
+        ttk, win = out
+        if ttk.shape != (size, size) or win.shape != (size, size):
+            raise ValueError(f'Expected output arrays of shape {(size, size)}, received {ttk.shape} and {win.shape}')
+
+    for tile in iter_matchup_tiles(profiles, tile_size=tile_size, spread=spread, dtype=dtype):
+        ttk[tile.rows, tile.columns] = tile.ttk
+        win[tile.rows, tile.columns] = tile.win
+
+    return ttk, win
@@ -53,8 +53,10 @@ class ItemModel(Protocol):
 
 
 class RankingP(Protocol):
-    leaderboard: Sequence[float]
-    ranks: Sequence[float]
+    @property
+    def leaderboard(self) -> Sequence[float]: ...
+    @property
+    def ranks(self) -> Sequence[float]: ...
 
 
 class RankingDict(TypedDict):
@@ -1,5 +1,7 @@
 from .assets import *
 from .character import *
 from .colors import *
+from .display import *
 from .font import *
 from .item import *
+from .output import *
@@ -1,10 +1,23 @@
+import time
 from io import BytesIO
 from pathlib import Path
-from typing import Protocol, Union, cast
+from typing import Any, Callable, Optional, Protocol, Union, cast, runtime_checkable
 
 from cairosvg import svg2png  # pyright: ignore[reportMissingTypeStubs,reportUnknownVariableType]
-
-from ..cache import BytesCache
+from PIL import Image
+
+from ..cache import (
+    CacheInfo,
+    CacheRegistry,
+    ConcurrentBytesCache,
+    DiskCache,
+    EvictionPolicy,
+    PolicyCache,
+    SingleFlight,
+    cache_registry,
+    memoize_method,
+)
+from .utils import get_image_size, resize
 
 # fmt: off
 __all__ = (
@@ -12,17 +25,76 @@ __all__ = (
 )
 # fmt: on
 
+SVG_SCALE = 2
+
+
+def _svg2png(source: bytes, **options: Any) -> bytes:
+    return cast(bytes, svg2png(source, **options))  # Have to cast here to prevent Unknown
+
+
+def _rasterize_svg(source: bytes, size: Optional[tuple[int, int]]) -> bytes:
+    """PNG of `source` at `SVG_SCALE`, or as large as fits in `size` keeping aspect ratio."""
+    if size is None:
+        return _svg2png(source, scale=SVG_SCALE)
+
+    width, height = size
+    file = _svg2png(source, output_width=width)
+    with Image.open(BytesIO(file)) as image:
+        fits = image.height <= height
+
+    return file if fits else _svg2png(source, output_height=height)
+
+
+def _get_buffer_key(resolved: Path, size: Optional[tuple[int, int]]) -> str:
+    return f'{resolved}@{size[0]}x{size[1]}' if size and resolved.suffix == '.svg' else str(resolved)
+
+
+def _get_image_key(
+    path: Path, size: Optional[tuple[int, int]], mode: Optional[str]
+) -> tuple[str, Optional[tuple[int, int]], Optional[str]]:
+    return (str(path), size, mode)
+
 
 class AssetLoaderP(Protocol):
     def open(self, path: Union[str, Path]) -> BytesIO: ...
 
 
+@runtime_checkable
+class ImageLoaderP(AssetLoaderP, Protocol):
+    """Loader that also returns decoded images, e.g. `AssetLoader`."""
+
+    def open_image(
+        self, path: Union[str, Path], size: Optional[tuple[int, int]] = ..., mode: Optional[str] = ...
+    ) -> Image.Image: ...
+
+
+def open_image(
+    loader: AssetLoaderP, path: Union[str, Path], size: Optional[tuple[int, int]] = None, mode: Optional[str] = None
+) -> Image.Image:
+    """Decoded image of `path`, see `AssetLoader.open_image`.
+
+    Loaders without `open_image` are supported too, their images are decoded on every call.
+    """
+
+    if isinstance(loader, ImageLoaderP):
+        return loader.open_image(path, size, mode)
+
+    with Image.open(loader.open(path)) as file:
+        image = file.convert(mode) if mode else file.copy()
+
+    return resize(image, size) if size else image
+
+
 class AssetLoader:
     def __init__(
         self,
         asset_paths: dict[str, Union[str, Path]],
         *,
         max_buffer_size: int = 5 * 1024 * 1024,
+        buffer_shards: int = 1,
+        buffer_policy: Optional[Callable[[int], EvictionPolicy[str]]] = None,
+        disk_cache: Optional[DiskCache] = None,
+        max_image_cache_size: int = 16 * 1024 * 1024,
     ) -> None:
         """Image loader with in-memory cache for local assets.
 
@@ -32,10 +104,34 @@ class AssetLoader:
             Mapping of asset paths. Example: `{'': '/etc/files/{path}.webp'}`.
         max_buffer_size : int, optional
             Maximum cache buffer size in bytes. Defaults to 5MB.
+        buffer_shards : int, optional
+            Amount of independently locked parts of the cache buffer. Defaults to 1.
+        buffer_policy : Callable[[int], EvictionPolicy], optional
+            Eviction policy of the cache buffer, e.g. `TinyLFUPolicy` or `GDSFPolicy`. Load time of a file
+            is used as its cost, so rasterized SVGs are kept over plain reads. `buffer_shards` is ignored
+            when set. Defaults to sharded LRU.
+        disk_cache : DiskCache, optional
+            Persistent cache for rasterized SVGs behind the cache buffer, keyed by source path, modification
+            time, file size and target size. Can be shared between processes. Defaults to None.
+        max_image_cache_size : int, optional
+            Maximum size of decoded images returned by `open_image` in bytes. Defaults to 16MB.
+
+        SVGs opened with `open_image` and a size are rasterized at that size instead of being shrunk, so every size
+        multiplier gets sharp icons. Each size is a separate entry of the cache buffer and `disk_cache`.
         """
 
         self.asset_paths = {key: Path(value) for key, value in asset_paths.items()}
-        self._buffer: BytesCache[str] = BytesCache(max_size=max_buffer_size)
+        self.disk_cache = disk_cache
+        self._loads: SingleFlight[str, bytes] = SingleFlight()
+        self._buffer: Union[ConcurrentBytesCache[str], PolicyCache[str, bytes]]
+        if buffer_policy is None:
+            self._buffer = ConcurrentBytesCache(max_size=max_buffer_size, shards=buffer_shards)
+        else:
+            self._buffer = PolicyCache(max_size=max_buffer_size, policy=buffer_policy)
+
+        self._images: PolicyCache[tuple[str, Optional[tuple[int, int]], Optional[str]], Image.Image] = PolicyCache(
+            max_size=max_image_cache_size, sizeof=get_image_size
+        )
 
     def _resolve_path(self, path: Path) -> Path:
         dirname = str(path.parent)
@@ -43,20 +139,87 @@ class AssetLoader:
 
         return Path(str(self.asset_paths[key]).format(path=path))
 
-    def _get_file(self, path: Path) -> bytes:
-        resolved = self._resolve_path(path)
+    def _rasterize(self, path: Path, size: Optional[tuple[int, int]]) -> bytes:
+        if self.disk_cache is None:
+            return _rasterize_svg(path.read_bytes(), size)
 
-        str_path = str(resolved)
-        if str_path in self._buffer:
-            return self._buffer[str_path]
+        stat = path.stat()
+        target = f'{size[0]}x{size[1]}' if size else SVG_SCALE
+        key = f'{path}:{stat.st_mtime_ns}:{stat.st_size}:{target}'
 
-        file = resolved.read_bytes()
-        if resolved.suffix == '.svg':
-            file = cast(bytes, svg2png(file, scale=2))  # Have to cast here to prevent Unknown
+        file = self.disk_cache.get(key)
+        if file is None:
+            file = _rasterize_svg(path.read_bytes(), size)
+            self.disk_cache.set(key, file)
+
+        return file
 
-        self._buffer[str_path] = file
+    def _load_file(self, resolved: Path, size: Optional[tuple[int, int]], key: str) -> bytes:
+        start = time.perf_counter()
+        if resolved.suffix == '.svg':
+            file = self._rasterize(resolved, size)
+        else:
+            file = resolved.read_bytes()
+
+        if isinstance(self._buffer, PolicyCache):
+            self._buffer.set(key, file, cost=time.perf_counter() - start)
+        else:
+            self._buffer[key] = file
         return file
 
+    def _get_file(self, path: Path, size: Optional[tuple[int, int]] = None) -> bytes:
+        """Contents of `path`, SVGs are rasterized to fit in `size` when it's set."""
+        resolved = self._resolve_path(path)
+
+        key = _get_buffer_key(resolved, size)
+        cached = self._buffer.get(key)
+        if cached is not None:
+            return cached
+
+        # Concurrent requests for the same file wait for one load
+        return self._loads.do(key, lambda: self._load_file(resolved, size, key))
+
+    @memoize_method('_images', key=_get_image_key)
+    def _get_image(self, path: Path, size: Optional[tuple[int, int]], mode: Optional[str]) -> Image.Image:
+        with Image.open(BytesIO(self._get_file(path, size))) as file:
+            image = file.convert(mode) if mode else file.copy()
+
+        # No-op for SVGs, they're already rasterized to fit
+        if size:
+            image.thumbnail(size, Image.Resampling.LANCZOS)
+
+        return image
+
+    def cache_info(self) -> CacheInfo:
+        return self._buffer.info()
+
+    def image_cache_info(self) -> CacheInfo:
+        return self._images.info()
+
+    def register_caches(
+        self, registry: CacheRegistry = cache_registry, *, name: str = 'assets', weight: float = 1.0
+    ) -> None:
+        """Puts the cache buffer and decoded images under the memory budget of `registry` as `name` and `name.images`.
+
+        `max_buffer_size` and `max_image_cache_size` are managed by the registry afterwards.
+        """
+
+        registry.register(name, self._buffer, weight=weight)
+        registry.register(f'{name}.images', self._images, weight=weight)
+
     def open(self, path: Union[str, Path]) -> BytesIO:
         file = self._get_file(Path(path))
         return BytesIO(file)
+
+    def open_image(
+        self, path: Union[str, Path], size: Optional[tuple[int, int]] = None, mode: Optional[str] = None
+    ) -> Image.Image:
+        """Decoded image, converted to `mode` and shrunk to fit in `size` keeping aspect ratio.
+
+        SVGs are rasterized to fit in `size` instead, so they may also be enlarged.
+
+        Images are cached and shared between callers, so they must not be modified or closed.
+        Use `Image.copy` to get an editable image.
+        """
+
+        return self._get_image(Path(path), size, mode)
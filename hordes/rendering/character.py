@@ -1,20 +1,37 @@
+import json
+from dataclasses import asdict
+from functools import reduce
 from io import BytesIO
 from itertools import chain
-from typing import Any, Mapping, Optional
+from typing import IO, TYPE_CHECKING, Any, Hashable, Mapping, MutableMapping, NamedTuple, Optional, Sequence, Union, overload
 
-from PIL import Image, ImageOps
+from PIL import Image, ImageChops, ImageOps
 
+from ..cache import CacheRegistry, PolicyCache, cache_registry, memoize_method
 from ..character import Character
 from ..data import EQUIP_SLOT_IDS
 from ..item import Item
 from ..models import Ranking
 from ..tierlist import get_leaderboard_rank, get_tierlist_rank
-from ..utils import math_round
-from .assets import AssetLoaderP
+from ..utils import MISSING, math_round
+from .assets import AssetLoaderP, open_image
 from .colors import DEFAULT_CHARACTER_SCHEME, CharacterScheme, get_quality
 from .font import FontLoaderP
 from .formatters import format_bigint, format_stat
-from .layout import Gap, Grid, GridColumns, Indentation, Layout, Panel, Rectangle, create_panels, pad_bbox
+from .layout import (
+    FontMetrics,
+    Gap,
+    Grid,
+    GridColumns,
+    Indentation,
+    Layout,
+    Panel,
+    Rectangle,
+    create_panels,
+    layout_cache,
+    pad_bbox,
+)
+from .output import DEFAULT_OUTPUT, OutputOptions, encode_image, get_array, get_buffer, open_output, save_image
 from .strings import (
     get_charpanel_keys,
     get_class_name,
@@ -23,7 +40,11 @@ from .strings import (
     get_stat_name,
     get_tierlist_rank_name,
 )
-from .utils import DrawScaler, resize, set_opacity
+from .utils import DrawScaler, GlyphCache, MeasureCache, get_image_size, set_opacity
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
 
 # fmt: off
 __all__ = (
@@ -46,6 +67,8 @@ BUILDSCORE_STAT_LAYOUT: StatLayout = (
     (103, 101, 102, 18, 25, 107),
 )
 
+STATPOINT_IDS = (0, 1, 2, 3, 4, 5, 22)
+
 
 def get_item_image_path(item: Item, quality: int) -> str:
     return f'items/{item.type}/{item.type}{item.tier}_q{quality}'
@@ -60,20 +83,47 @@ def get_prestige_string(character: Character, loc: Mapping[str, Any]) -> str:
     return f"{character.prestige.value:,} / {requirement}k ({loc['ui']['charpanel']['rank']} {character.prestige.rank}/12)"
 
 
+SlotSpec = tuple[int, str, str, Optional[str]]  # Slot, image path, border color and upgrade text
+
+
+class _Patch(NamedTuple):
+    position: tuple[int, int]
+    image: Image.Image
+    mask: Image.Image
+
+
+def _get_patch(image: Image.Image, base: Image.Image) -> Optional[_Patch]:
+    """Pixels of `image` that differ from `base`, cropped to their bounding box."""
+    difference = reduce(ImageChops.lighter, ImageChops.difference(image, base).split())
+    mask = difference.point(lambda p: 255 if p else 0)  # pyright: ignore[reportUnknownMemberType]
+
+    bbox = mask.getbbox()
+    if bbox is None:
+        return None
+
+    return _Patch(position=(bbox[0], bbox[1]), image=image.crop(bbox), mask=mask.crop(bbox))
+
+
+def _get_patch_size(patch: Optional[_Patch]) -> int:
+    return get_image_size(patch.image) + get_image_size(patch.mask) if patch else 0
+
+
 class CharacterLayout(Layout):
-    def __init__(self, font_loader: FontLoaderP):
-        font_large = font_loader.get_font(400, 15)
-        font_small = font_loader.get_font(400, 13)
+    FONTS = ((400, 15), (400, 13))
+
+    def __init__(self, font_loader: Union[FontLoaderP, FontMetrics], *, boxes: Optional[Sequence[int]] = None):
+        metrics = self._get_metrics(font_loader)
+        font_large, font_small = self.FONTS
 
-        font_large_line_height = sum(font_large.getmetrics())
-        font_small_line_height = sum(font_small.getmetrics())
+        font_large_line_height = sum(metrics[font_large])
+        font_small_line_height = sum(metrics[font_small])
 
         panel_padding = Indentation(4)
         panel_gap = Gap(0, 3)
         gap = Gap(4)
 
         self.title = Panel(
-            height=math_round(font_large.size * 1.15 + 3 * 2),
+            height=math_round(font_large[1] * 1.15 + 3 * 2),
             padding=Indentation(8, 0, 8, 4),
         )
         self.char_data = Grid(
@@ -124,109 +174,243 @@ class CharacterLayout(Layout):
             ),
             padding=Indentation(0, 5, 5),
             outline=1,
+            boxes=boxes,
         )
 
 
+def _get_render_key(
+    character: Character, rank: bool, buildscore: bool, extended_quality: bool, output: OutputOptions
+) -> str:
+    return json.dumps(
+        [
+            [character.name, character.class_id, character.faction_id, character.level],
+            [character.prestige.value, character.elo.value],
+            [(slot, item.to_dict() if item else None) for slot, item in character.slots],
+            [(effect.id, effect.level) for effect in character.effects],
+            sorted(character.statpoints),
+            character.statpoints_available,
+            sorted(character.stats),
+            rank,
+            buildscore,
+            extended_quality,
+            asdict(output),
+        ]
+    )
+
+
+def _get_template_key(rank: bool, buildscore: bool) -> tuple[bool, bool]:
+    return (rank, buildscore)
+
+
 class CharacterImage:
+    @overload
     def __init__(
         self,
-        background: BytesIO,
+        background: Optional[BytesIO],
         loc: Mapping[str, Any],
         loader: AssetLoaderP,
         font_loader: FontLoaderP,
+        color_scheme: CharacterScheme = ...,
+        ranking: Optional[Ranking] = ...,
+        render_cache: Optional[MutableMapping[str, bytes]] = ...,
+        max_tile_cache_size: int = ...,
+        max_layer_cache_size: int = ...,
+        max_glyph_cache_size: int = ...,
+        max_template_cache_size: int = ...,
+        output: OutputOptions = ...,
+    ) -> None: ...
+
+    @overload
+    def __init__(
+        self,
+        *,
+        loc: Mapping[str, Any],
+        loader: AssetLoaderP,
+        font_loader: FontLoaderP,
+        background: Optional[BytesIO] = ...,
+        color_scheme: CharacterScheme = ...,
+        ranking: Optional[Ranking] = ...,
+        render_cache: Optional[MutableMapping[str, bytes]] = ...,
+        max_tile_cache_size: int = ...,
+        max_layer_cache_size: int = ...,
+        max_glyph_cache_size: int = ...,
+        max_template_cache_size: int = ...,
+        output: OutputOptions = ...,
+    ) -> None: ...
+
+    def __init__(
+        self,
+        background: Optional[BytesIO] = None,
+        loc: Mapping[str, Any] = MISSING,
+        loader: AssetLoaderP = MISSING,
+        font_loader: FontLoaderP = MISSING,
         color_scheme: CharacterScheme = DEFAULT_CHARACTER_SCHEME,
         ranking: Optional[Ranking] = None,
+        render_cache: Optional[MutableMapping[str, bytes]] = None,
+        max_tile_cache_size: int = 4 * 1024 * 1024,
+        max_layer_cache_size: int = 8 * 1024 * 1024,
+        max_glyph_cache_size: int = 2 * 1024 * 1024,
+        max_template_cache_size: int = 4 * 1024 * 1024,
+        output: OutputOptions = DEFAULT_OUTPUT,
     ) -> None:
+        """Character panel renderer.
+
+        Parameters
+        ----------
+        background : BytesIO | None, optional
+            Pre-rendered background from `render_background`, used for every render option. When None, backgrounds
+            are drawn on first use for each `rank` and `buildscore` combination and kept decoded. Can only be
+            omitted when `loc`, `loader` and `font_loader` are passed by keyword.
+        render_cache : MutableMapping[str, bytes], optional
+            Encoded renders keyed by character state, e.g. `TieredCache` to reuse them across restarts.
+        output : OutputOptions, optional
+            Default encoding of renders. Defaults to PNG with default settings.
+
+        Cards are drawn in layers that are cached separately: the background, the equipment layer
+        (item slots and buffs) and the stats layer (character data, statpoints and stats).
+        """
+
         self.background = background
         self.loader = loader
         self.font_loader = font_loader
         self.loc = loc
         self.color_scheme = color_scheme
         self.ranking = ranking
+        self.render_cache = render_cache
+        self.output = output
+
+        # Decoded backgrounds, keyed by `rank` and `buildscore` render options
+        self._templates: dict[tuple[bool, bool], Image.Image] = {}
+        # Backgrounds of other locales of `render_locales`, keyed by their texts and render options
+        self._localized_templates: PolicyCache[Hashable, Image.Image] = PolicyCache(
+            max_size=max_template_cache_size, sizeof=get_image_size
+        )
+        # Finished item slots, keyed by icon, border and upgrade badge
+        self._tiles: PolicyCache[Hashable, Image.Image] = PolicyCache(max_size=max_tile_cache_size, sizeof=get_image_size)
+        # Changed pixels of equipment and stats layers, keyed by what is drawn on them
+        self._layers: PolicyCache[Hashable, Optional[_Patch]] = PolicyCache(
+            max_size=max_layer_cache_size, sizeof=_get_patch_size
+        )
+        # Text masks and measurements, shared by all layers
+        self._glyphs = GlyphCache(max_glyph_cache_size)
+        self._measures = MeasureCache(font_loader)
+
+        self.layout = layout_cache.get(CharacterLayout, font_loader)
+
+    def register_caches(
+        self, registry: CacheRegistry = cache_registry, *, name: str = 'character', weight: float = 1.0
+    ) -> None:
+        """Puts render caches under the memory budget of `registry`.
 
-        self.layout = CharacterLayout(font_loader)
+        Caches are registered as `name.tiles`, `name.layers`, `name.templates`, `name.glyphs` and `name.measures`.
+        """
+        registry.register(f'{name}.tiles', self._tiles, weight=weight)
+        registry.register(f'{name}.layers', self._layers, weight=weight)
+        registry.register(f'{name}.templates', self._localized_templates, weight=weight)
+        registry.register(f'{name}.glyphs', self._glyphs, weight=weight)
+        registry.register(f'{name}.measures', self._measures, weight=weight)
 
     @staticmethod
-    def render_background(
-        loc: Mapping[str, Any],
+    def _get_background_texts(loc: Mapping[str, Any], rank: bool, buildscore: bool) -> tuple[str, ...]:
+        """Localized texts of the background in drawing order: header, character data, statpoint and stat rows."""
+        stat_layout = BUILDSCORE_STAT_LAYOUT if buildscore else DEFAULT_STAT_LAYOUT
+        return (
+            loc['ui']['headers']['character'],
+            *(get_row_name(loc, element) for element in get_charpanel_keys(rank=rank)),
+            *(get_stat_name(loc, id) for id in STATPOINT_IDS),
+            *(get_stat_name(loc, row) for column in stat_layout for row in column),
+        )
+
+    @staticmethod
+    def _draw_background(
+        background_texts: tuple[str, ...],
         font_loader: FontLoaderP,
-        color_scheme: CharacterScheme = DEFAULT_CHARACTER_SCHEME,
-        rank: bool = False,
-        buildscore: bool = False,
-    ) -> BytesIO:
-        layout = CharacterLayout(font_loader)
+        color_scheme: CharacterScheme,
+        rank: bool,
+        buildscore: bool,
+    ) -> Image.Image:
+        layout = layout_cache.get(CharacterLayout, font_loader)
+        texts = iter(background_texts)
 
         width, height = layout.outer_box.width, layout.outer_box.height
 
-        with Image.new('RGBA', (width, height)) as image:
-            draw = DrawScaler(image, font_loader=font_loader)
+        image = Image.new('RGBA', (width, height))
+        draw = DrawScaler(image, font_loader=font_loader)
 
-            draw.rectangle(
-                layout.outer_box.bbox,
-                fill=color_scheme.BACKGROUND,
-                outline=color_scheme.OUTLINE,
-                width=layout.outline,
-            )
+        draw.rectangle(
+            layout.outer_box.bbox,
+            fill=color_scheme.BACKGROUND,
+            outline=color_scheme.OUTLINE,
+            width=layout.outline,
+        )
 
-            draw.rectangle(
-                layout.char_data.outer_box.bbox,
-                fill=color_scheme.BACKGROUND_2,
-            )
+        draw.rectangle(
+            layout.char_data.outer_box.bbox,
+            fill=color_scheme.BACKGROUND_2,
+        )
 
+        draw.rectangle(
+            layout.statpoints.outer_box.bbox,
+            fill=color_scheme.BACKGROUND_2,
+        )
+
+        for panel in layout.stats:
             draw.rectangle(
-                layout.statpoints.outer_box.bbox,
+                panel.outer_box.bbox,
                 fill=color_scheme.BACKGROUND_2,
             )
 
-            for panel in layout.stats:
-                draw.rectangle(
-                    panel.outer_box.bbox,
-                    fill=color_scheme.BACKGROUND_2,
-                )
+        draw.text(
+            (layout.title.inner_box.top_left[0], layout.title.inner_box.center[1]),
+            next(texts),
+            fill=color_scheme.PRIMARY,
+            font_weight=700,
+            font_size=17,
+            anchor='lm',
+        )
 
+        for i, element in enumerate(get_charpanel_keys(rank=rank)):
             draw.text(
-                (layout.title.inner_box.top_left[0], layout.title.inner_box.center[1]),
-                loc['ui']['headers']['character'],
-                fill=color_scheme.PRIMARY,
-                font_weight=700,
-                font_size=17,
-                anchor='lm',
+                layout.char_data.rows[i][0].inner_box.top_left,
+                next(texts),
+                fill=color_scheme.get_row_name_color(element),
+                font_weight=400,
+                font_size=15,
             )
 
-            for i, element in enumerate(get_charpanel_keys(rank=rank)):
-                draw.text(
-                    layout.char_data.rows[i][0].inner_box.top_left,
-                    get_row_name(loc, element),
-                    fill=color_scheme.get_row_name_color(element),
-                    font_weight=400,
-                    font_size=15,
-                )
+        for i, id in enumerate(STATPOINT_IDS):
+            draw.text(
+                layout.statpoints.rows[i][0].inner_box.top_left,
+                next(texts),
+                fill=color_scheme.get_row_name_color(id),
+                font_weight=400,
+                font_size=15,
+            )
 
-            for i, id in enumerate(list(range(6)) + [22]):
+        stat_layout = BUILDSCORE_STAT_LAYOUT if buildscore else DEFAULT_STAT_LAYOUT
+        for c, column in enumerate(stat_layout):
+            for r, row in enumerate(column):
                 draw.text(
-                    layout.statpoints.rows[i][0].inner_box.top_left,
-                    get_stat_name(loc, id),
-                    fill=color_scheme.get_row_name_color(id),
+                    layout.stats[c].rows[r][0].inner_box.top_left,
+                    next(texts),
+                    fill=color_scheme.get_row_name_color(row),
                     font_weight=400,
-                    font_size=15,
+                    font_size=13,
                 )
 
-            stat_layout = BUILDSCORE_STAT_LAYOUT if buildscore else DEFAULT_STAT_LAYOUT
-            for c, column in enumerate(stat_layout):
-                for r, row in enumerate(column):
-                    draw.text(
-                        layout.stats[c].rows[r][0].inner_box.top_left,
-                        get_stat_name(loc, row),
-                        fill=color_scheme.get_row_name_color(row),
-                        font_weight=400,
-                        font_size=13,
-                    )
+        return image
 
-            bytes_ = BytesIO()
-            image.save(bytes_, format="PNG")
-            bytes_.seek(0)
-
-        return bytes_
+    @staticmethod
+    def render_background(
+        loc: Mapping[str, Any],
+        font_loader: FontLoaderP,
+        color_scheme: CharacterScheme = DEFAULT_CHARACTER_SCHEME,
+        rank: bool = False,
+        buildscore: bool = False,
+    ) -> BytesIO:
+        texts = CharacterImage._get_background_texts(loc, rank, buildscore)
+        with CharacterImage._draw_background(texts, font_loader, color_scheme, rank, buildscore) as image:
+            return encode_image(image)
 
     def render(
         self,
@@ -234,84 +418,235 @@ class CharacterImage:
         rank: bool = False,
         buildscore: bool = False,
         extended_quality: bool = False,
+        output: Optional[OutputOptions] = None,
     ) -> BytesIO:
-        with Image.open(self.background) as image:
-            draw = DrawScaler(image, font_loader=self.font_loader)
+        """Renders `character` encoded with `output`, or `self.output` when None.
 
-            stats = character.stats
-            statpoints = character.statpoints
+        Results are reused from `render_cache` when it's set, concurrent renders of the same character are done once.
+        Cached renders are keyed by character state and don't follow changes of `ranking`.
+        """
 
-            class_name = get_class_name(self.loc, character.class_id)
-            faction_name = get_faction_name(self.loc, character.faction_id)
+        output = output or self.output
+        if self.render_cache is None:
+            return self._render(character, rank, buildscore, extended_quality, output)
 
-            # Items
-            for slot, item in character.slots:
-                if slot not in EQUIP_SLOT_IDS:
-                    continue
+        return BytesIO(self._render_cached(character, rank, buildscore, extended_quality, output))
 
-                if item:
-                    quality = get_quality(item.percent, extended=extended_quality)
-                    image_path = get_item_image_path(item, quality)
-                    border_color = self.color_scheme.ITEM_QUALITY[quality]
-                else:
-                    image_path = get_slot_image_path(slot)
-                    border_color = '#293c40'
+    def render_image(
+        self,
+        character: Character,
+        rank: bool = False,
+        buildscore: bool = False,
+        extended_quality: bool = False,
+    ) -> Image.Image:
+        """Renders `character` without encoding, the image is owned by the caller. `render_cache` is not used."""
+        return self._render_image(character, rank, buildscore, extended_quality)
 
-                element = self.layout.items.children[slot - 101]
-                position = element.outer_box.top_left
-                border = element.border
-                border_size = (int(border.top), int(border.right), int(border.bottom), int(border.left))
+    def render_buffer(
+        self,
+        character: Character,
+        rank: bool = False,
+        buildscore: bool = False,
+        extended_quality: bool = False,
+        mode: str = 'RGBA',
+    ) -> memoryview:
+        """Raw pixels of `render_image` in `mode`, row by row."""
+        with self._render_image(character, rank, buildscore, extended_quality) as image:
+            return get_buffer(image, mode)
 
-                with Image.open(self.loader.open(image_path)) as img_:
-                    with ImageOps.expand(img_, border=border_size, fill=border_color) as img:
-                        image.paste(img, position)
+    def render_array(
+        self,
+        character: Character,
+        rank: bool = False,
+        buildscore: bool = False,
+        extended_quality: bool = False,
+        mode: str = 'RGBA',
+    ) -> 'npt.NDArray[np.uint8]':
+        """Read-only array of `render_buffer` with shape (height, width, bands). Requires NumPy."""
+        with self._render_image(character, rank, buildscore, extended_quality) as image:
+            return get_array(image, mode)
 
-                if item and item.type != 'charm' and item.upgrade and item.upgrade > 0:
-                    text_position = element.inner_box.shift_position(-4, -4).bottom_right
-                    text = f"+{format_bigint(item.upgrade, accuracy=0, maxdigit=2)}"
+    def render_to(
+        self,
+        fp: Union[IO[bytes], int],
+        character: Character,
+        rank: bool = False,
+        buildscore: bool = False,
+        extended_quality: bool = False,
+        output: Optional[OutputOptions] = None,
+    ) -> None:
+        """Same as `render`, but writes into a binary stream or file descriptor `fp` instead of a new buffer."""
+        output = output or self.output
+        with open_output(fp) as file:
+            if self.render_cache is not None:
+                file.write(self._render_cached(character, rank, buildscore, extended_quality, output))
+                return
 
-                    bbox = draw.textbbox(
-                        text_position,
-                        text,
-                        font_weight=700,
-                        font_size=13,
-                        anchor='rb',
-                    )
+            with self._render_image(character, rank, buildscore, extended_quality) as image:
+                save_image(image, file, output)
 
-                    draw.rounded_rectangle(
-                        pad_bbox(bbox, Indentation(1)),
-                        radius=2,
-                        fill=self.color_scheme.UPGRADE_BACKGROUND,
-                    )
+    def render_locales(
+        self,
+        character: Character,
+        locales: Sequence[Mapping[str, Any]],
+        rank: bool = False,
+        buildscore: bool = False,
+        extended_quality: bool = False,
+        output: Optional[OutputOptions] = None,
+    ) -> list[BytesIO]:
+        """Renders `character` once per localization of `locales`, in the same order. `render_cache` is not used.
+
+        Item slots, buffs, icons and stat formatting are done once for all locales, only backgrounds and character
+        data are drawn per locale. Backgrounds are drawn for locales other than `self.loc`, so an explicit
+        `background` only applies to `self.loc`.
+        """
+
+        output = output or self.output
+        encoded: list[BytesIO] = []
+        for image in self._render_images(character, locales, rank, buildscore, extended_quality):
+            with image:
+                encoded.append(encode_image(image, output))
+
+        return encoded
+
+    @memoize_method('render_cache', key=_get_render_key)
+    def _render_cached(
+        self, character: Character, rank: bool, buildscore: bool, extended_quality: bool, output: OutputOptions
+    ) -> bytes:
+        return self._render(character, rank, buildscore, extended_quality, output).getvalue()
+
+    @memoize_method('_tiles')
+    def _get_slot_tile(
+        self,
+        image_path: str,
+        border_color: str,
+        border_size: tuple[int, int, int, int],
+        upgrade_text: Optional[str],
+        text_position: tuple[float, float],
+        mode: str,
+    ) -> Image.Image:
+        """Item or empty slot icon with quality border and upgrade badge."""
+
+        with ImageOps.expand(open_image(self.loader, image_path), border=border_size, fill=border_color) as expanded:
+            tile = expanded.convert(mode)
+
+        if upgrade_text:
+            draw = DrawScaler(tile, font_loader=self.font_loader, glyph_cache=self._glyphs, measure_cache=self._measures)
+
+            bbox = draw.textbbox(
+                text_position,
+                upgrade_text,
+                font_weight=700,
+                font_size=13,
+                anchor='rb',
+            )
 
-                    draw.text(
-                        text_position,
-                        text,
-                        fill=self.color_scheme.UPGRADE,
-                        font_weight=700,
-                        font_size=13,
-                        anchor='rb',
-                    )
+            draw.rounded_rectangle(
+                pad_bbox(bbox, Indentation(1)),
+                radius=2,
+                fill=self.color_scheme.UPGRADE_BACKGROUND,
+            )
+
+            draw.text(
+                text_position,
+                upgrade_text,
+                fill=self.color_scheme.UPGRADE,
+                font_weight=700,
+                font_size=13,
+                anchor='rb',
+            )
+
+        return tile
+
+    @memoize_method('_templates', key=_get_template_key)
+    def _get_template(self, rank: bool, buildscore: bool) -> Image.Image:
+        if self.background is None:
+            texts = self._get_background_texts(self.loc, rank, buildscore)
+            return self._draw_background(texts, self.font_loader, self.color_scheme, rank, buildscore)
+
+        # Explicit background is used regardless of options
+        self.background.seek(0)
+        with Image.open(self.background) as image:
+            image.load()
+            return image.copy()
+
+    @memoize_method('_localized_templates')
+    def _get_localized_template(self, texts: tuple[str, ...], rank: bool, buildscore: bool) -> Image.Image:
+        return self._draw_background(texts, self.font_loader, self.color_scheme, rank, buildscore)
+
+    def _get_locale_template(self, texts: Optional[tuple[str, ...]], rank: bool, buildscore: bool) -> Image.Image:
+        """Background with `texts` of `_get_background_texts`, or the one of `self.loc` when None."""
+        if texts is None:
+            return self._get_template(rank, buildscore)
+
+        return self._get_localized_template(texts, rank, buildscore)
+
+    def _get_slot_spec(self, slot: int, item: Optional[Item], extended_quality: bool) -> SlotSpec:
+        if item:
+            quality = get_quality(item.percent, extended=extended_quality)
+            image_path = get_item_image_path(item, quality)
+            border_color = self.color_scheme.ITEM_QUALITY[quality]
+        else:
+            image_path = get_slot_image_path(slot)
+            border_color = '#293c40'
+
+        upgrade_text = None
+        if item and item.type != 'charm' and item.upgrade and item.upgrade > 0:
+            upgrade_text = f"+{format_bigint(item.upgrade, accuracy=0, maxdigit=2)}"
+
+        return (slot, image_path, border_color, upgrade_text)
+
+    @memoize_method('_layers')
+    def _render_equipment_layer(
+        self,
+        slots: tuple[SlotSpec, ...],
+        buffs: tuple[tuple[Optional[str], int], ...],
+        rank: bool,
+        buildscore: bool,
+    ) -> Optional[_Patch]:
+        """Item row and buff strip."""
+
+        template = self._get_template(rank, buildscore)
+        with template.copy() as image:
+            draw = DrawScaler(image, font_loader=self.font_loader, glyph_cache=self._glyphs, measure_cache=self._measures)
+
+            # Items
+            for slot, image_path, border_color, upgrade_text in slots:
+                element = self.layout.items.children[slot - 101]
+                position = element.outer_box.top_left
+                border = element.border
+                border_size = (int(border.top), int(border.right), int(border.bottom), int(border.left))
+                text_position = element.inner_box.shift_position(-4, -4).bottom_right
+
+                tile = self._get_slot_tile(
+                    image_path,
+                    border_color,
+                    border_size,
+                    upgrade_text,
+                    (text_position[0] - position[0], text_position[1] - position[1]),
+                    image.mode,
+                )
+                image.paste(tile, position)
 
             # Buffs
             icon_size = (30, 30)
             base_position = Rectangle(
                 min(
                     self.layout.title.inner_box.width * 0.59,
-                    self.layout.title.inner_box.top_right[0] - icon_size[0] * len(character.effects),
+                    self.layout.title.inner_box.top_right[0] - icon_size[0] * len(buffs),
                 ),
                 self.layout.inner_box.top_left[1],
                 *icon_size,
             ).shift_position(0, 5)
-            for i, effect in enumerate(character.effects):
-                if not effect.logic.icon:
+            for i, (icon, level) in enumerate(buffs):
+                if not icon:
                     continue
-                buff_img = resize(Image.open(self.loader.open(effect.logic.icon)), icon_size)
+                buff_img = open_image(self.loader, icon, icon_size)
                 position = base_position.shift_position(buff_img.width * i, 0)
                 image.paste(buff_img, position.top_left)
 
                 text_position = position.shift_position(-2, -1).bottom_right
-                text = str(effect.level)
+                text = str(level)
 
                 bbox = draw.textbbox(
                     text_position,
@@ -336,58 +671,61 @@ class CharacterImage:
                     font_size=12,
                 )
 
+            return _get_patch(image, template)
+
+    @memoize_method('_layers')
+    def _render_stats_layer(
+        self,
+        data: tuple[str, ...],
+        icons: tuple[int, int, int],
+        rank_entry: Optional[tuple[str, int]],
+        statpoints_available: bool,
+        statpoints: tuple[tuple[str, bool], ...],
+        stats: tuple[str, ...],
+        rank: bool,
+        buildscore: bool,
+        background_texts: Optional[tuple[str, ...]] = None,
+    ) -> Optional[_Patch]:
+        """Character data, statpoints and stats panels.
+
+        Values can overlap long row names, so the layer is diffed against the background of its locale.
+        """
+
+        class_id, faction_id, elo_rank = icons
+
+        template = self._get_locale_template(background_texts, rank, buildscore)
+        with template.copy() as image:
+            draw = DrawScaler(image, font_loader=self.font_loader, glyph_cache=self._glyphs, measure_cache=self._measures)
+
             # Character data
-            data = (
-                character.name,
-                character.level,
-                class_name.title(),
-                faction_name.title(),
-                get_prestige_string(character, self.loc),
-                f'{character.elo.value:,}',
-            )
             data_fill = (
                 None,
                 None,
-                self.color_scheme.CLASSES[character.class_id],
-                self.color_scheme.FACTIONS[character.faction_id],
+                self.color_scheme.CLASSES[class_id],
+                self.color_scheme.FACTIONS[faction_id],
                 self.color_scheme.PRESTIGE,
                 self.color_scheme.ELO,
             )
 
-            with (
-                Image.open(self.loader.open(f'ui/classes/{character.class_id}')) as class_img,
-                Image.open(self.loader.open(f'ui/factions/{character.faction_id}')) as faction_img,
-                Image.open(self.loader.open(f'ui/currency/prestige')) as prestige_img,
-                Image.open(self.loader.open(f'ui/elo/{character.elo.rank}')) as elo_img,
-            ):
-                resize(class_img, (15, 15))
-                resize(faction_img, (15, 15))
-                resize(prestige_img, (13, 15))
-                resize(elo_img, (14, 17))
-                data_icon = (
-                    None,
-                    None,
-                    class_img,
-                    faction_img,
-                    prestige_img,
-                    elo_img,
-                )
+            data_icon = (
+                None,
+                None,
+                open_image(self.loader, f'ui/classes/{class_id}', (15, 15)),
+                open_image(self.loader, f'ui/factions/{faction_id}', (15, 15)),
+                open_image(self.loader, 'ui/currency/prestige', (13, 15)),
+                open_image(self.loader, f'ui/elo/{elo_rank}', (14, 17)),
+            )
 
             for id, (stat, fill, icon) in enumerate(zip(data, data_fill, data_icon)):
                 position = self.layout.char_data.rows[id][1].inner_box.top_left
                 if icon:
                     image.paste(icon, (position[0], position[1] + 2), icon)
                     position = position[0] + icon.width + 3, position[1]
-                draw.text(position, str(stat), font_weight=700, font_size=15, fill=fill)
+                draw.text(position, stat, font_weight=700, font_size=15, fill=fill)
 
             # Ranks
-            if self.ranking and rank:
-                rank_id = get_tierlist_rank(self.ranking, stats[107])
-                text = get_tierlist_rank_name(rank_id)
-                if rank_id in range(2):
-                    leaderboard_position = get_leaderboard_rank(self.ranking, stats[107])
-                    text = f'#{leaderboard_position + 1} {text}'
-
+            if rank_entry:
+                text, rank_id = rank_entry
                 draw.text(
                     self.layout.char_data.rows[-1][1].inner_box.top_left,
                     text,
@@ -397,49 +735,123 @@ class CharacterImage:
                 )
 
             # Statpoints
-            arrow = Image.open(self.loader.open('ui/icons/arrow'))
-            resize(arrow, (17, 17))
+            arrow = open_image(self.loader, 'ui/icons/arrow', (17, 17))
 
-            if not character.statpoints_available:
+            if not statpoints_available:
                 background_fill = self.color_scheme.STATBUTTON_DISABLED
             else:
                 background_fill = self.color_scheme.STATBUTTON
 
             arrow_rectangle = Image.new('RGBA', arrow.size, background_fill)
             arrow_rectangle.paste(arrow, mask=arrow)
-            if not character.statpoints_available:
+            if not statpoints_available:
                 arrow_rectangle = set_opacity(arrow_rectangle, 0.5)
 
-            for i, (id, stat) in enumerate(chain(statpoints, [(22, stats[22])])):
-                text = format_stat(id, stats[id], accuracy=2, maxdigit=5)
-
-                if id != 22:
+            for i, (text, has_arrow) in enumerate(statpoints):
+                if has_arrow:
                     arrow_pos = self.layout.statpoints.rows[i][2].inner_box.top_left
                     image.paste(arrow_rectangle, (arrow_pos), arrow_rectangle)
-                    if stat:
-                        text = f'(+{stat}) {text}'
 
                 position = self.layout.statpoints.rows[i][1].inner_box.top_right
                 draw.text(position, text, anchor="ra", font_weight=700, font_size=15, fill=self.color_scheme.STATPOINTS)
 
             # Stats
             stat_layout = BUILDSCORE_STAT_LAYOUT if buildscore else DEFAULT_STAT_LAYOUT
+            formatted = iter(stats)
             for column_index, column in enumerate(stat_layout):
-                for row_index, row in enumerate(column):
+                for row_index, _ in enumerate(column):
                     position = self.layout.stats[column_index].rows[row_index][1].inner_box.top_right
 
-                    formatted = format_stat(row, stats[row], 4, 6)
                     draw.text(
                         position,
-                        formatted,
+                        next(formatted),
                         anchor="ra",
                         font_weight=700,
                         font_size=13,
                         fill=self.color_scheme.STAT_PRIMARY,
                     )
 
-            bytes_ = BytesIO()
-            image.save(bytes_, format="PNG")
-            bytes_.seek(0)
+            return _get_patch(image, template)
+
+    def _render(
+        self, character: Character, rank: bool, buildscore: bool, extended_quality: bool, output: OutputOptions
+    ) -> BytesIO:
+        with self._render_image(character, rank, buildscore, extended_quality) as image:
+            return encode_image(image, output)
+
+    def _render_image(self, character: Character, rank: bool, buildscore: bool, extended_quality: bool) -> Image.Image:
+        return self._render_images(character, (self.loc,), rank, buildscore, extended_quality)[0]
+
+    def _render_images(
+        self,
+        character: Character,
+        locales: Sequence[Mapping[str, Any]],
+        rank: bool,
+        buildscore: bool,
+        extended_quality: bool,
+    ) -> list[Image.Image]:
+        # Layers are keyed by what is drawn on them, so e.g. statpoint changes reuse the equipment layer
+        stats = character.stats
+
+        slots = tuple(
+            self._get_slot_spec(slot, item, extended_quality) for slot, item in character.slots if slot in EQUIP_SLOT_IDS
+        )
+        buffs = tuple((effect.logic.icon, effect.level) for effect in character.effects)
+
+        rank_entry = None
+        if self.ranking and rank:
+            rank_id = get_tierlist_rank(self.ranking, stats[107])
+            text = get_tierlist_rank_name(rank_id)
+            if rank_id in range(2):
+                leaderboard_position = get_leaderboard_rank(self.ranking, stats[107])
+                text = f'#{leaderboard_position + 1} {text}'
+            rank_entry = (text, rank_id)
+
+        statpoints: list[tuple[str, bool]] = []
+        for id, stat in chain(character.statpoints, [(22, stats[22])]):
+            text = format_stat(id, stats[id], accuracy=2, maxdigit=5)
+            if id != 22 and stat:
+                text = f'(+{stat}) {text}'
+            statpoints.append((text, id != 22))
+
+        stat_layout = BUILDSCORE_STAT_LAYOUT if buildscore else DEFAULT_STAT_LAYOUT
+        stat_texts = tuple(format_stat(row, stats[row], 4, 6) for column in stat_layout for row in column)
+
+        # Item slots and buffs are opaque and away from localized texts, so one layer fits every locale
+        equipment = self._render_equipment_layer(slots, buffs, rank, buildscore)
+
+        images: list[Image.Image] = []
+        for loc in locales:
+            background_texts = None if loc is self.loc else self._get_background_texts(loc, rank, buildscore)
+            data = (
+                character.name,
+                str(character.level),
+                get_class_name(loc, character.class_id).title(),
+                get_faction_name(loc, character.faction_id).title(),
+                get_prestige_string(character, loc),
+                f'{character.elo.value:,}',
+            )
+
+            layers = (
+                equipment,
+                self._render_stats_layer(
+                    data,
+                    (character.class_id, character.faction_id, character.elo.rank),
+                    rank_entry,
+                    bool(character.statpoints_available),
+                    tuple(statpoints),
+                    stat_texts,
+                    rank,
+                    buildscore,
+                    background_texts,
+                ),
+            )
+
+            image = self._get_locale_template(background_texts, rank, buildscore).copy()
+            for patch in layers:
+                if patch:
+                    image.paste(patch.image, patch.position, patch.mask)
+
+            images.append(image)
 
-        return bytes_
+        return images
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any, Iterable, Literal, NamedTuple, Optional, TypedDict, Union
+
+from PIL import Image
+
+from .assets import AssetLoaderP, open_image
+from .font import FontLoaderP
+from .utils import DrawScaler, GlyphCache, MeasureCache, get_size
+
+if TYPE_CHECKING:
+    from .utils import Coords, Ink
+
+# fmt: off
+__all__ = (
+    'DrawOp',
+    'DisplayList',
+    'DisplayListRecorder',
+)
+# fmt: on
+
+OpName = Literal['text', 'rectangle', 'rounded_rectangle', 'paste']
+
+
+class DrawOp(NamedTuple):
+    name: OpName
+    args: dict[str, Any]
+
+
+class DisplayListDict(TypedDict):
+    size: tuple[int, int]
+    mode: str
+    ops: list[tuple[OpName, dict[str, Any]]]
+
+
+def _to_tuples(value: Any) -> Any:
+    # JSON turns tuples into lists, PIL expects colours and coordinates as tuples
+    if isinstance(value, list):
+        return tuple(_to_tuples(item) for item in value)  # pyright: ignore[reportUnknownVariableType]
+    return value
+
+
+class DisplayList:
+    """Draw operations of an image in unscaled coordinates.
+
+    Replaying gives the same pixels as drawing directly with `DrawScaler` at any size multiplier, so one list
+    serves every scale. Lists are exported as JSON for clients that draw cards themselves.
+
+    Parameters
+    ----------
+    size : tuple[int, int]
+        Unscaled size of the image.
+    mode : str, optional
+        Mode of the image. Defaults to RGB.
+    ops : Iterable[DrawOp], optional
+        Recorded operations.
+    """
+
+    def __init__(self, size: tuple[int, int], mode: str = 'RGB', ops: Iterable[DrawOp] = ()) -> None:
+        self.size = size
+        self.mode = mode
+        self.ops = list(ops)
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def replay(self, draw: DrawScaler, loader: Optional[AssetLoaderP] = None) -> None:
+        """Draws operations with `draw`, `loader` opens images of paste operations."""
+        for name, args in self.ops:
+            if name == 'text':
+                draw.text(**args)
+            elif name == 'rectangle':
+                draw.rectangle(**args)
+            elif name == 'rounded_rectangle':
+                draw.rounded_rectangle(**args)
+            elif name == 'paste':
+                if loader is None:
+                    raise ValueError('Expected loader to replay paste operations')
+
+                image = open_image(
+                    loader, args['path'], size=get_size(args['size'], draw.size_multiplier), mode=args.get('mode')
+                )
+                draw.paste(image, args['xy'], mask=image if args.get('mask') else None)
+            else:
+                raise ValueError(f'Unknown draw operation {name!r}')
+
+    def render(
+        self,
+        font_loader: FontLoaderP,
+        size_multiplier: int = 1,
+        *,
+        loader: Optional[AssetLoaderP] = None,
+        glyph_cache: Optional[GlyphCache] = None,
+        measure_cache: Optional[MeasureCache] = None,
+    ) -> Image.Image:
+        image = Image.new(self.mode, get_size(self.size, size_multiplier))
+        draw = DrawScaler(
+            image,
+            font_loader=font_loader,
+            size_multiplier=size_multiplier,
+            glyph_cache=glyph_cache,
+            measure_cache=measure_cache,
+        )
+        self.replay(draw, loader)
+
+        return image
+
+    def to_dict(self) -> DisplayListDict:
+        return {'size': self.size, 'mode': self.mode, 'ops': [(op.name, op.args) for op in self.ops]}
+
+    @classmethod
+    def from_dict(cls, data: DisplayListDict) -> DisplayList:
+        ops = (DrawOp(name, {key: _to_tuples(value) for key, value in args.items()}) for name, args in data['ops'])
+        return cls(_to_tuples(data['size']), data['mode'], ops)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, data: Union[str, bytes]) -> DisplayList:
+        return cls.from_dict(json.loads(data))
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} size={self.size} mode={self.mode!r} ops={len(self.ops)}>'
+
+
+class DisplayListRecorder:
+    """Records calls with `DrawScaler` interface into a `DisplayList` instead of drawing them.
+
+    Measurements are done with unscaled fonts, same as with `DrawScaler`, so recorded lists don't depend on
+    the size multiplier. Arguments left as None are not recorded.
+    """
+
+    def __init__(
+        self,
+        size: tuple[int, int],
+        font_loader: FontLoaderP,
+        mode: str = 'RGB',
+        measure_cache: Optional[MeasureCache] = None,
+    ) -> None:
+        self.display_list = DisplayList(size, mode)
+        self.font_loader = font_loader
+        self.measure_cache = measure_cache
+
+    def _record(self, name: OpName, **args: Any) -> None:
+        self.display_list.ops.append(DrawOp(name, {key: value for key, value in args.items() if value is not None}))
+
+    def text(
+        self,
+        xy: tuple[float, float],
+        text: str,
+        fill: Ink | None = None,
+        font_size: float = 16,
+        font_weight: int = 400,
+        anchor: str | None = None,
+        spacing: float = 4,
+        align: str = 'left',
+    ) -> None:
+        self._record(
+            'text',
+            xy=xy,
+            text=text,
+            fill=fill,
+            font_size=font_size,
+            font_weight=font_weight,
+            anchor=anchor,
+            spacing=spacing if spacing != 4 else None,
+            align=align if align != 'left' else None,
+        )
+
+    def textlength(self, text: str, font_size: float = 16, font_weight: int = 400) -> float:
+        if self.measure_cache is not None:
+            return self.measure_cache.getlength(font_weight, font_size, text)
+
+        return self.font_loader.get_font(font_weight, font_size).getlength(text)
+
+    def textbbox(
+        self, xy: tuple[float, float], text: str, font_size: float = 16, font_weight: int = 400, anchor: str | None = None
+    ) -> tuple[float, float, float, float]:
+        if self.measure_cache is not None:
+            left, top, right, bottom = self.measure_cache.getbbox(font_weight, font_size, text, anchor)
+        else:
+            left, top, right, bottom = self.font_loader.get_font(font_weight, font_size).getbbox(text, anchor=anchor)
+
+        return left + xy[0], top + xy[1], right + xy[0], bottom + xy[1]
+
+    def rectangle(self, xy: Coords, fill: Ink | None = None, outline: Ink | None = None, width: int = 1) -> None:
+        self._record('rectangle', xy=xy, fill=fill, outline=outline, width=width)
+
+    def rounded_rectangle(
+        self,
+        xy: Coords,
+        radius: float = 0,
+        fill: Ink | None = None,
+        outline: Ink | None = None,
+        width: int = 1,
+        *,
+        corners: tuple[bool, bool, bool, bool] | None = None,
+    ) -> None:
+        self._record('rounded_rectangle', xy=xy, radius=radius, fill=fill, outline=outline, width=width, corners=corners)
+
+    def paste(
+        self, path: str, xy: tuple[int, int], size: tuple[int, int], mode: Optional[str] = None, mask: bool = False
+    ) -> None:
+        """Records pasting of asset `path` shrunk to fit in unscaled `size`, using its alpha as mask when `mask`."""
+        self._record('paste', path=path, xy=xy, size=size, mode=mode, mask=mask or None)
@@ -5,6 +5,8 @@ from typing import Protocol, Union
 from PIL import ImageFont
 from PIL.ImageFont import FreeTypeFont
 
+from ..cache import CacheInfo, CacheRegistry, PolicyCache, cache_registry, memoize_method
+
 # fmt: off
 __all__ = (
     'FontLoader',
@@ -16,12 +18,37 @@ class FontLoaderP(Protocol):
     def get_font(self, weight: int, size: float = ...) -> FreeTypeFont: ...
 
 
+def _get_font_size(font: FreeTypeFont) -> int:
+    # Variants opened from memory keep their own copy of the font file
+    return len(getattr(font, 'font_bytes', b''))
+
+
+def _get_weight_key(weight: int) -> int:
+    return weight
+
+
+def _get_variant_key(weight: int, size: float) -> tuple[int, float]:
+    return (weight, size)
+
+
 class FontLoader:
-    def __init__(self, font_paths: dict[int, Union[str, Path]]):
+    def __init__(self, font_paths: dict[int, Union[str, Path]], *, max_variants_size: int = 16 * 1024 * 1024):
+        """Font loader with in-memory cache of font files and their sized variants.
+
+        Parameters
+        ----------
+        font_paths : dict[int, str | Path]
+            Mapping of font weights to font files.
+        max_variants_size : int, optional
+            Maximum total size of cached font variants in bytes. Defaults to 16MB.
+        """
+
         self.font_paths = dict(sorted(((key, Path(value)) for key, value in font_paths.items()), reverse=True))
 
-        self._cache: dict[int, FreeTypeFont] = {}
-        self._variants: dict[int, dict[float, FreeTypeFont]] = {}
+        self._cache: dict[int, FreeTypeFont] = {}  # Bounded by the amount of font files
+        self._variants: PolicyCache[tuple[int, float], FreeTypeFont] = PolicyCache(
+            max_size=max_variants_size, sizeof=_get_font_size
+        )
 
     def _select_weight_key(self, weight: int) -> int:
         for key in self.font_paths:
@@ -38,23 +65,20 @@ class FontLoader:
 
         return font
 
+    @memoize_method('_cache', key=_get_weight_key)
     def _get_file(self, weight: int) -> FreeTypeFont:
-        if weight in self._cache:
-            return self._cache[weight]
-
-        font = self._open_file(weight)
-
-        self._cache[weight] = font
-        return font
+        return self._open_file(weight)
 
+    @memoize_method('_variants', key=_get_variant_key)
     def _get_variant(self, weight: int, size: float) -> FreeTypeFont:
-        if weight not in self._variants:
-            self._variants[weight] = {}
+        return self._get_file(weight).font_variant(size=size)
 
-        if size not in self._variants[weight]:
-            self._variants[weight][size] = self._get_file(weight).font_variant(size=size)
+    def cache_info(self) -> CacheInfo:
+        return self._variants.info()
 
-        return self._variants[weight][size]
+    def register_caches(self, registry: CacheRegistry = cache_registry, *, name: str = 'fonts', weight: float = 1.0) -> None:
+        """Puts the font variant cache under the memory budget of `registry`."""
+        registry.register(name, self._variants, weight=weight)
 
     def get_font(self, weight: int, size: float = 16) -> FreeTypeFont:
         key = self._select_weight_key(weight)
@@ -1,20 +1,29 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import math
+from concurrent.futures import Executor, Future
+from dataclasses import asdict
 from io import BytesIO
-from typing import TYPE_CHECKING, Any, Mapping, Optional, TypedDict
+from typing import IO, TYPE_CHECKING, Any, Iterator, Mapping, MutableMapping, Optional, Sequence, TypedDict, Union
 
 from PIL import Image
 
+from ..cache import CacheInfo, CacheRegistry, PolicyCache, cache_registry, memoize_method
 from ..utils import math_round
 from .colors import DEFAULT_ITEM_SCHEME, ItemScheme, get_quality
+from .display import DisplayList, DisplayListRecorder
 from .font import FontLoaderP
 from .formatters import format_bigint, format_stat
-from .layout import Indentation, Layout, Panel, create_panels
+from .layout import FontMetrics, Indentation, Layout, Panel, create_panels, layout_cache
+from .output import DEFAULT_OUTPUT, OutputOptions, encode_image, get_array, get_buffer, open_output, save_image
 from .strings import BOUND_NAMES, QUALITY_NAMES, get_item_name, get_stat_name
-from .utils import DrawScaler, get_size
+from .utils import DrawScaler, GlyphCache, MeasureCache, get_image_size, get_size
 
 if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
     from typing_extensions import Unpack
 
     from ..item import Item
@@ -54,61 +63,84 @@ ERROR_ITEM: _RenderProps = {
 }
 
 
+def _wrap_text(text: str, width: float, measure: MeasureCache, font_weight: int, font_size: int) -> list[str]:
+    if measure.getbbox(font_weight, font_size, text)[2] < width:
+        return [text]
+
+    lines: list[str] = []
+    line: list[str] = []
+    for i, word in enumerate(text.split()):
+        if measure.getlength(font_weight, font_size, ' '.join(line + [word])) >= width and i != 0:
+            lines.append(' '.join(line))
+            line = []
+
+        line.append(word)
+    lines.append(' '.join(line))
+
+    return lines
+
+
 def fit_text(
     text: str,
     wh: tuple[int, int],
-    font_loader: FontLoaderP,
+    measure: MeasureCache,
     font_weight: int,
     font_size: int,
     size_multiplier: int = 1,
+    min_font_size: int = 8,
 ) -> tuple[str, int]:
-    font = font_loader.get_font(font_weight, font_size * size_multiplier)
+    """Wraps `text` by words into lines narrower than `wh` and picks the largest font size they fit at.
 
-    text_bounding_box = font.getbbox(text)
+    Font sizes between `min_font_size` and `font_size` are binary searched. At `min_font_size` only the width is
+    checked, text that is still too wide is returned as is.
 
-    lines: list[list[str]] = []
+    Returns
+    -------
+    tuple[str, int]
+        Wrapped text and its font size, not multiplied by `size_multiplier`.
+    """
 
-    if text_bounding_box[2] >= wh[0]:
-        words = text.split()
+    width, height = wh[0] * size_multiplier, wh[1] * size_multiplier
 
-        line: list[str] = []
-        for i, word in enumerate(words):
-            if font.getlength(' '.join(line + [word])) >= wh[0] and i != 0:
-                lines.append(line)
-                line = []
+    def fit(size: int) -> tuple[str, bool]:
+        scaled_size = size * size_multiplier
+        lines = _wrap_text(text, width, measure, font_weight, scaled_size)
 
-            line.append(word)
-        lines.append(line)
+        lines_height = sum(measure.getbbox(font_weight, scaled_size, line)[3] for line in lines)
+        lines_maxwidth = max(measure.getlength(font_weight, scaled_size, line) for line in lines)
 
-        final = '\n'.join([' '.join(line) for line in lines])
-    else:
-        final = text
+        fits = lines_maxwidth < width and (lines_height < height or size <= min_font_size)
+        return '\n'.join(lines), fits
 
-    lines_height = sum(font.getbbox(' '.join(line))[3] for line in lines)
-    lines_maxwidth = max(font.getlength(' '.join(line)) for line in lines)
-    if lines_height >= wh[1] and font_size > 8 or lines_maxwidth >= wh[0]:
-        return fit_text(
-            text=text,
-            wh=wh,
-            font_loader=font_loader,
-            font_weight=font_weight,
-            font_size=font_size - 1,
-        )
+    final, fits = fit(font_size)
+    if fits or font_size <= min_font_size:
+        return final, font_size
+
+    # Largest fitting size is in [low, high), smaller fonts are assumed to always fit when larger ones do
+    low, high = min_font_size, font_size
+    final, fits = fit(low)
+    while high - low > 1:
+        middle = (low + high) // 2
+        middle_final, middle_fits = fit(middle)
+        if middle_fits:
+            low, final = middle, middle_final
+        else:
+            high = middle
 
-    return final, font_size * size_multiplier
+    return final, low
 
 
 class ItemLayout(Layout):
-    def __init__(self, font_loader: FontLoaderP):
-        font_title = font_loader.get_font(700, size=20)
-        font_quality = font_loader.get_font(700, size=15)
-        font_id = font_loader.get_font(400, size=13)
-        font_stats = font_loader.get_font(400, size=16)
+    FONTS = ((700, 20), (700, 15), (400, 13), (400, 16))
 
-        self.title = Panel(height=sum(font_title.getmetrics()))
-        self.quality = Panel(height=sum(font_quality.getmetrics()))
-        self.id = Panel(height=sum(font_id.getmetrics()), padding=Indentation(4, 0, 3))
-        self.stats = Panel(*create_panels(7, height=sum(font_stats.getmetrics())))
+    def __init__(self, font_loader: Union[FontLoaderP, FontMetrics], *, boxes: Optional[Sequence[int]] = None):
+        metrics = self._get_metrics(font_loader)
+        font_title, font_quality, font_id, font_stats = self.FONTS
+
+        self.title = Panel(height=sum(metrics[font_title]))
+        self.quality = Panel(height=sum(metrics[font_quality]))
+        self.id = Panel(height=sum(metrics[font_id]), padding=Indentation(4, 0, 3))
+        self.stats = Panel(*create_panels(7, height=sum(metrics[font_stats])))
 
         super().__init__(
             Panel(
@@ -121,9 +153,39 @@ class ItemLayout(Layout):
             width=238,
             height=218,
             border=Indentation(3),
+            boxes=boxes,
         )
 
 
+def _get_render_key(
+    *items: Item,
+    loc_key: str,
+    text: Optional[str],
+    text_color: Optional[str],
+    extended_quality: bool,
+    output: OutputOptions,
+) -> str:
+    return json.dumps([[item.to_dict() for item in items], loc_key, text, text_color, extended_quality, asdict(output)])
+
+
+def _get_loc_key(loc: Mapping[str, Any]) -> str:
+    """Digest of all texts of `loc`, so renders of other localizations don't share `render_cache` entries."""
+    return hashlib.sha256(json.dumps(loc, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _get_display_list_key(extended_quality: bool = False, **item: Any) -> str:
+    return json.dumps([item, extended_quality], sort_keys=True)
+
+
+def _get_card_key(size_multiplier: int, extended_quality: bool = False, **item: Any) -> str:
+    return json.dumps([item, extended_quality, size_multiplier], sort_keys=True)
+
+
+def _get_display_list_size(display_list: DisplayList) -> int:
+    # Rough size of an operation with its arguments
+    return 256 * len(display_list)
+
+
 class ItemImage:
     def __init__(
         self,
@@ -132,14 +194,58 @@ class ItemImage:
         color_scheme: ItemScheme = DEFAULT_ITEM_SCHEME,
         error_item: _RenderProps = ERROR_ITEM,
         size_multiplier: int = 1,
+        render_cache: Optional[MutableMapping[str, bytes]] = None,
+        max_glyph_cache_size: int = 2 * 1024 * 1024,
+        max_display_list_cache_size: int = 1024 * 1024,
+        max_card_cache_size: int = 16 * 1024 * 1024,
+        output: OutputOptions = DEFAULT_OUTPUT,
     ):
-        self.loc = loc
         self.font_loader = font_loader
         self.color_scheme = color_scheme
         self.error_item = error_item
         self.size_multiplier = size_multiplier
+        self.render_cache = render_cache
+        self.output = output
+
+        # Text masks, item names and stat lines repeat between items
+        self._glyphs = GlyphCache(max_glyph_cache_size)
+        # Text widths, shared by drawing and fitting of captions
+        self._measures = MeasureCache(font_loader)
+        # Recorded item cards, keyed by render props
+        self._display_lists: PolicyCache[str, DisplayList] = PolicyCache(
+            max_size=max_display_list_cache_size, sizeof=_get_display_list_size
+        )
+        # Finished item cards, keyed by render props and size multiplier
+        self._cards: PolicyCache[str, Image.Image] = PolicyCache(max_size=max_card_cache_size, sizeof=get_image_size)
 
-        self.layout = ItemLayout(font_loader)
+        self.loc = loc
+        self.layout = layout_cache.get(ItemLayout, font_loader)
+
+    @property
+    def loc(self) -> Mapping[str, Any]:
+        return self._loc
+
+    @loc.setter
+    def loc(self, loc: Mapping[str, Any]) -> None:
+        # Cards contain localized names
+        self._loc = loc
+        self._loc_key = _get_loc_key(loc)
+        self._display_lists.clear()
+        self._cards.clear()
+
+    def card_cache_info(self) -> CacheInfo:
+        """Hits and misses of finished item cards."""
+        return self._cards.info()
+
+    def register_caches(self, registry: CacheRegistry = cache_registry, *, name: str = 'item', weight: float = 1.0) -> None:
+        """Puts render caches under the memory budget of `registry`.
+
+        Caches are registered as `name.glyphs`, `name.measures`, `name.display_lists` and `name.cards`.
+        """
+        registry.register(f'{name}.glyphs', self._glyphs, weight=weight)
+        registry.register(f'{name}.measures', self._measures, weight=weight)
+        registry.register(f'{name}.display_lists', self._display_lists, weight=weight)
+        registry.register(f'{name}.cards', self._cards, weight=weight)
 
     def _get_display_items(self, *items: Item) -> tuple[Item, ...]:
         item_count = len(items)
@@ -156,7 +262,7 @@ class ItemImage:
         root = math.sqrt(item_amount)
 
         width = max(math.ceil(root), 1)
-        height = max(math_round(root), 1)
+        height = max(int(math_round(root)), 1)
 
         return (width, height)
 
@@ -192,115 +298,138 @@ class ItemImage:
             'stats': item.stats.to_raw(),
         }
 
-    def _render_single(self, extended_quality: bool = False, **item: Unpack[_RenderProps]):
+    @memoize_method('_display_lists', key=_get_display_list_key)
+    def _record_single(self, extended_quality: bool = False, **item: Unpack[_RenderProps]) -> DisplayList:
         quality = get_quality(item['percent'], extended=extended_quality)
 
         border_color = self.color_scheme.ITEM_QUALITY[quality]
         border_width = 3
 
-        with Image.new('RGB', get_size(IMAGE_SIZE, size_multiplier=self.size_multiplier)) as image:
-            draw = DrawScaler(image, font_loader=self.font_loader, size_multiplier=self.size_multiplier)
+        draw = DisplayListRecorder(IMAGE_SIZE, font_loader=self.font_loader, measure_cache=self._measures)
+
+        # Background and borders
+        draw.rectangle(
+            self.layout.outer_box.bbox,
+            fill=self.color_scheme.BACKGROUND,
+            outline=border_color,
+            width=border_width,
+        )
+
+        # Item name + upgrade
+        position = self.layout.title.inner_box.top_left
+        draw.text(position, item['name'], font_weight=700, font_size=20, fill=border_color)
+        if (
+            isinstance(item['upgrade'], int)
+            and item['upgrade'] > 0
+            or isinstance(item['stacks'], int)
+            and item['stacks'] > 0
+        ):
+            if isinstance(item['upgrade'], int) and item['upgrade'] > 0:
+                upgrade_text = f" +{format_bigint(item['upgrade'], accuracy=0, maxdigit=4)}"
+            elif isinstance(item['stacks'], int) and item['stacks'] > 0:
+                upgrade_text = f" x{item['stacks']}"
+            else:
+                upgrade_text = ''
+
+            text_width = draw.textlength(item['name'], font_weight=700, font_size=20)
+
+            if text_width >= (210):
+                position = (22, 30)
+            else:
+                position = (10, 10)
 
-            # Background and borders
-            draw.rectangle(
-                self.layout.outer_box.bbox,
-                fill=self.color_scheme.BACKGROUND,
-                outline=border_color,
-                width=border_width,
+            draw.text(
+                (text_width + position[0], position[1]),
+                upgrade_text,
+                font_weight=700,
+                font_size=20,
+                fill=self.color_scheme.UPGRADE,
             )
 
-            # Item name + upgrade
-            position = self.layout.title.inner_box.top_left
-            draw.text(position, item['name'], font_weight=700, font_size=20, fill=border_color)
-            if (
-                isinstance(item['upgrade'], int)
-                and item['upgrade'] > 0
-                or isinstance(item['stacks'], int)
-                and item['stacks'] > 0
-            ):
-                if isinstance(item['upgrade'], int) and item['upgrade'] > 0:
-                    upgrade_text = f" +{format_bigint(item['upgrade'], accuracy=0, maxdigit=4)}"
-                elif isinstance(item['stacks'], int) and item['stacks'] > 0:
-                    upgrade_text = f" x{item['stacks']}"
-                else:
-                    upgrade_text = ''
+        # Item Rarity, Type, Percent
+        position = self.layout.quality.inner_box.top_left
+        draw.text(
+            position,
+            f"{QUALITY_NAMES[quality].title()} T{item['tier']+1} {item['type'].title()} {item['percent']}%",
+            font_weight=700,
+            font_size=15,
+            fill=self.color_scheme.PERCENT,
+        )
 
-                text_width = draw.textlength(item['name'], font_weight=700, font_size=20)
+        # Item ID line
+        position = self.layout.id.inner_box
+        texts = (
+            f"GS: {format_bigint(item['gearscore'], accuracy=0, maxdigit=4)}" if item['gearscore'] else None,
+            f"ID: {item['id'] or 'Generated'}",
+            f"{BOUND_NAMES[item['bound']]}",
+        )
+        fill = (
+            self.color_scheme.GS,
+            self.color_scheme.ID,
+            self.color_scheme.BOUND,
+        )
+        gap = 7
 
-                if text_width >= (210):
-                    position = (22, 30)
-                else:
-                    position = (10, 10)
-
-                draw.text(
-                    (text_width + position[0], position[1]),
-                    upgrade_text,
-                    font_weight=700,
-                    font_size=20,
-                    fill=self.color_scheme.UPGRADE,
-                )
+        for i, (text, fill) in enumerate(zip(texts, fill)):
+            if not text:
+                continue
 
-            # Item Rarity, Type, Percent
-            position = self.layout.quality.inner_box.top_left
             draw.text(
-                position,
-                f"{QUALITY_NAMES[quality].title()} T{item['tier']+1} {item['type'].title()} {item['percent']}%",
-                font_weight=700,
-                font_size=15,
-                fill=self.color_scheme.PERCENT,
+                position.top_left,
+                text=text,
+                fill=fill,
+                font_weight=400,
+                font_size=13,
             )
 
-            # Item ID line
-            position = self.layout.id.inner_box
-            texts = (
-                f"GS: {format_bigint(item['gearscore'], accuracy=0, maxdigit=4)}" if item['gearscore'] else None,
-                f"ID: {item['id'] or 'Generated'}",
-                f"{BOUND_NAMES[item['bound']]}",
-            )
-            fill = (
-                self.color_scheme.GS,
-                self.color_scheme.ID,
-                self.color_scheme.BOUND,
+            length = draw.textlength(
+                text,
+                font_size=13,
+                font_weight=400,
             )
-            gap = 7
-
-            for i, (text, fill) in enumerate(zip(texts, fill)):
-                if not text:
-                    continue
-
-                draw.text(
-                    position.top_left,
-                    text=text,
-                    fill=fill,
-                    font_weight=400,
-                    font_size=13,
-                )
 
-                length = draw.textlength(
-                    text,
-                    font_size=13,
-                    font_weight=400,
-                )
-
-                position = position.shift_position(int(length + gap), 0)
-
-            # Stats
-            stats = item['stats']
-            for i, stat in enumerate(stats):
-                formatted = format_stat(stat['id'], stat['value'], 1, 5)
-                if stat['type'] == 'main':
-                    text = f"{formatted} {get_stat_name(self.loc,stat['id'])}"
-                    fill = border_color
-                elif stat['type'] == 'bonus':
-                    text = f"+ {formatted} {get_stat_name(self.loc,stat['id'])} {stat['percent']}%"
-                    fill = self.color_scheme.STAT_QUALITY[get_quality(stat['percent'], extended=extended_quality)]
-                else:
-                    continue
+            position = position.shift_position(int(length + gap), 0)
+
+        # Stats
+        stats = item['stats']
+        for i, stat in enumerate(stats):
+            formatted = format_stat(stat['id'], stat['value'], 1, 5)
+            if stat['type'] == 'main':
+                text = f"{formatted} {get_stat_name(self.loc,stat['id'])}"
+                fill = border_color
+            elif stat['type'] == 'bonus':
+                text = f"+ {formatted} {get_stat_name(self.loc,stat['id'])} {stat['percent']}%"
+                fill = self.color_scheme.STAT_QUALITY[get_quality(stat['percent'], extended=extended_quality)]
+            else:
+                continue
+
+            position = self.layout.stats.children[i].inner_box.top_left
+            draw.text(position, text, font_weight=400, font_size=16, fill=fill)
+
+        return draw.display_list
+
+    def _render_single(self, extended_quality: bool = False, **item: Unpack[_RenderProps]) -> Image.Image:
+        """Card of a single item, shared between renders, so it must not be modified."""
+        return self._render_card(self.size_multiplier, extended_quality, **item)
+
+    @memoize_method('_cards', key=_get_card_key)
+    def _render_card(
+        self, size_multiplier: int, extended_quality: bool = False, **item: Unpack[_RenderProps]
+    ) -> Image.Image:
+        display_list = self._record_single(extended_quality, **item)
+        return display_list.render(
+            self.font_loader,
+            size_multiplier,
+            glyph_cache=self._glyphs,
+            measure_cache=self._measures,
+        )
 
-                position = self.layout.stats.children[i].inner_box.top_left
-                draw.text(position, text, font_weight=400, font_size=16, fill=fill)
+    def render_display_list(self, item: Item, extended_quality: bool = False) -> DisplayList:
+        """Draw operations of the card of `item`, independent of `size_multiplier`.
 
-            return image
+        Lists are cached by item and shared between renders, so they must not be modified.
+        """
+        return self._record_single(extended_quality, **self._get_render_props(item))
 
     def render(
         self,
@@ -308,7 +437,185 @@ class ItemImage:
         text: Optional[str] = None,
         text_color: Optional[str] = None,
         extended_quality: bool = False,
-    ):
+        output: Optional[OutputOptions] = None,
+    ) -> BytesIO:
+        """Renders `items` encoded with `output`, or `self.output` when None.
+
+        Results are reused from `render_cache` when it's set, concurrent renders of the same items are done once.
+        """
+
+        output = output or self.output
+        if self.render_cache is None:
+            return self._render(*items, text=text, text_color=text_color, extended_quality=extended_quality, output=output)
+
+        return BytesIO(
+            self._render_cached(
+                *items,
+                loc_key=self._loc_key,
+                text=text,
+                text_color=text_color,
+                extended_quality=extended_quality,
+                output=output,
+            )
+        )
+
+    def render_image(
+        self,
+        *items: Item,
+        text: Optional[str] = None,
+        text_color: Optional[str] = None,
+        extended_quality: bool = False,
+    ) -> Image.Image:
+        """Renders `items` without encoding, the image is owned by the caller. `render_cache` is not used."""
+        return self._render_image(*items, text=text, text_color=text_color, extended_quality=extended_quality)
+
+    def render_buffer(
+        self,
+        *items: Item,
+        text: Optional[str] = None,
+        text_color: Optional[str] = None,
+        extended_quality: bool = False,
+        mode: str = 'RGBA',
+    ) -> memoryview:
+        """Raw pixels of `render_image` in `mode`, row by row."""
+        with self._render_image(*items, text=text, text_color=text_color, extended_quality=extended_quality) as image:
+            return get_buffer(image, mode)
+
+    def render_array(
+        self,
+        *items: Item,
+        text: Optional[str] = None,
+        text_color: Optional[str] = None,
+        extended_quality: bool = False,
+        mode: str = 'RGBA',
+    ) -> npt.NDArray[np.uint8]:
+        """Read-only array of `render_buffer` with shape (height, width, bands). Requires NumPy."""
+        with self._render_image(*items, text=text, text_color=text_color, extended_quality=extended_quality) as image:
+            return get_array(image, mode)
+
+    def render_to(
+        self,
+        fp: Union[IO[bytes], int],
+        *items: Item,
+        text: Optional[str] = None,
+        text_color: Optional[str] = None,
+        extended_quality: bool = False,
+        output: Optional[OutputOptions] = None,
+    ) -> None:
+        """Same as `render`, but writes into a binary stream or file descriptor `fp` instead of a new buffer."""
+        output = output or self.output
+        with open_output(fp) as file:
+            if self.render_cache is not None:
+                file.write(
+                    self._render_cached(
+                        *items,
+                        loc_key=self._loc_key,
+                        text=text,
+                        text_color=text_color,
+                        extended_quality=extended_quality,
+                        output=output,
+                    )
+                )
+                return
+
+            with self._render_image(*items, text=text, text_color=text_color, extended_quality=extended_quality) as image:
+                save_image(image, file, output)
+
+    def render_pages(
+        self,
+        *items: Item,
+        grid_size: tuple[int, int] = (5, 4),
+        extended_quality: bool = False,
+        output: Optional[OutputOptions] = None,
+        executor: Optional[Executor] = None,
+    ) -> Iterator[BytesIO]:
+        """Renders `items` into pages of at most `grid_size` (columns, rows) cards, encoded with `output`.
+
+        Pages are yielded as soon as they're encoded and only one is kept in memory at a time, so inventories
+        of any size can be streamed. With `executor`, cards of the next page are rendered while the current one
+        is composed and encoded. `render_cache` is not used.
+        """
+
+        columns, rows = grid_size
+        if not (columns > 0 and rows > 0):
+            raise ValueError(f'Expected grid size to be positive, received {grid_size}')
+
+        output = output or self.output
+        props = [self._get_render_props(item) for item in self._get_display_items(*items)] or [self.error_item]
+        page_length = columns * rows
+        pages = [props[start : start + page_length] for start in range(0, len(props), page_length)]
+
+        def submit(page: list[_RenderProps]) -> list[Future[Image.Image]]:
+            assert executor is not None
+            return [executor.submit(self._render_single, extended_quality, **item) for item in page]
+
+        pending = submit(pages[0]) if executor is not None else []
+        try:
+            for index, page in enumerate(pages):
+                if executor is not None:
+                    cards = [future.result() for future in pending]
+                    pending = submit(pages[index + 1]) if index + 1 < len(pages) else []
+                else:
+                    cards = [self._render_single(extended_quality, **item) for item in page]
+
+                with self._compose_page(cards, min(columns, len(props))) as image:
+                    encoded = encode_image(image, output)
+
+                yield encoded
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def _compose_page(self, cards: Sequence[Image.Image], columns: int) -> Image.Image:
+        margin = 5
+        grid_size = (columns, math.ceil(len(cards) / columns))
+
+        background_size = self._get_background_size(grid_size, text_bg_height=0, margin=margin)
+        item_positions = self._get_item_positions(grid_size, text_bg_height=0, margin=margin)
+
+        background = Image.new(
+            'RGB',
+            get_size(background_size, size_multiplier=self.size_multiplier),
+            self.color_scheme.BACKGROUND,
+        )
+        for card, position in zip(cards, item_positions):
+            background.paste(card, get_size(position, self.size_multiplier))
+
+        return background
+
+    @memoize_method('render_cache', key=_get_render_key)
+    def _render_cached(
+        self,
+        *items: Item,
+        loc_key: str,
+        text: Optional[str],
+        text_color: Optional[str],
+        extended_quality: bool,
+        output: OutputOptions,
+    ) -> bytes:
+        """`loc_key` is only part of the cache key, renders use `self.loc`."""
+        return self._render(
+            *items, text=text, text_color=text_color, extended_quality=extended_quality, output=output
+        ).getvalue()
+
+    def _render(
+        self,
+        *items: Item,
+        text: Optional[str],
+        text_color: Optional[str],
+        extended_quality: bool,
+        output: OutputOptions,
+    ) -> BytesIO:
+        with self._render_image(*items, text=text, text_color=text_color, extended_quality=extended_quality) as image:
+            return encode_image(image, output)
+
+    def _render_image(
+        self,
+        *items: Item,
+        text: Optional[str],
+        text_color: Optional[str],
+        extended_quality: bool,
+    ) -> Image.Image:
         display_items = self._get_display_items(*items)
 
         text_bg_height = 120 if text else 0
@@ -320,44 +627,45 @@ class ItemImage:
 
         text_bg_width = background_size[0]
 
-        with Image.new(
+        background = Image.new(
             'RGB',
             get_size(background_size, size_multiplier=self.size_multiplier),
             self.color_scheme.BACKGROUND,
-        ) as background:
-            if text is not None:
-                text, text_font_size = fit_text(
-                    text,
-                    (text_bg_width, text_bg_height),
-                    font_loader=self.font_loader,
-                    font_weight=400,
-                    font_size=43,
-                    size_multiplier=self.size_multiplier,
-                )
-
-                draw = DrawScaler(background, font_loader=self.font_loader, size_multiplier=self.size_multiplier)
-                draw.text(
-                    (text_bg_width / 2, text_bg_height / 2),
-                    text,
-                    font_weight=400,
-                    font_size=text_font_size,
-                    anchor="mm",
-                    align='center',
-                    fill=text_color or '#FFF',
-                )
+        )
+        if text is not None:
+            text, text_font_size = fit_text(
+                text,
+                (text_bg_width, text_bg_height),
+                measure=self._measures,
+                font_weight=400,
+                font_size=43,
+                size_multiplier=self.size_multiplier,
+            )
 
-            for index, item in enumerate(display_items):
-                props = self._get_render_props(item)
-                with self._render_single(**props, extended_quality=extended_quality) as single:
-                    background.paste(single, get_size(item_positions[index], self.size_multiplier))
+            draw = DrawScaler(
+                background,
+                font_loader=self.font_loader,
+                size_multiplier=self.size_multiplier,
+                glyph_cache=self._glyphs,
+                measure_cache=self._measures,
+            )
+            draw.text(
+                (text_bg_width / 2, text_bg_height / 2),
+                text,
+                font_weight=400,
+                font_size=text_font_size,
+                anchor="mm",
+                align='center',
+                fill=text_color or '#FFF',
+            )
 
-            if len(display_items) == 0:
-                with self._render_single(**self.error_item) as image:
-                    background.paste(image, get_size(item_positions[0], self.size_multiplier))
+        for index, item in enumerate(display_items):
+            props = self._get_render_props(item)
+            single = self._render_single(**props, extended_quality=extended_quality)
+            background.paste(single, get_size(item_positions[index], self.size_multiplier))
 
-            bytes_ = BytesIO()
-            background.save(bytes_, format="PNG")
-            bytes_.seek(0)
+        if len(display_items) == 0:
+            single = self._render_single(**self.error_item)
+            background.paste(single, get_size(item_positions[0], self.size_multiplier))
 
-        return bytes_
-        return bytes_
+        return background
@@ -1,13 +1,35 @@
 from __future__ import annotations
 
 from collections.abc import Sequence
-from typing import Iterator, Literal, Optional, SupportsIndex, Union, overload
+from threading import Lock
+from typing import (
+    TYPE_CHECKING,
+    ClassVar,
+    Iterable,
+    Iterator,
+    Literal,
+    Mapping,
+    Optional,
+    SupportsIndex,
+    TypedDict,
+    TypeVar,
+    Union,
+    overload,
+)
 
 from ..utils import MISSING
+from .font import FontLoaderP
+
+if TYPE_CHECKING:
+    from typing_extensions import Self
 
 Auto = Literal['auto']
 Align = Literal['start', 'center', 'end']
 
+FontKey = tuple[int, float]
+FontMetrics = Mapping[FontKey, tuple[int, int]]
+"""Ascent and descent of fonts keyed by font weight and size."""
+
 
 class Indentation:
     def __init__(self, *props: float):
@@ -152,6 +174,12 @@ class Element:
     def __iter__(self) -> Iterator[Element]:
         return self.children.__iter__()
 
+    def walk(self) -> Iterator[Element]:
+        """Yields the element and all of its descendants, depth first."""
+        yield self
+        for child in self.children:
+            yield from child.walk()
+
 
 class Panel(Element):
     def __init__(
@@ -271,6 +299,11 @@ class Grid(Element):
 
 
 class Layout(Element):
+    FONTS: ClassVar[tuple[FontKey, ...]] = ()
+    """Fonts whose metrics the layout depends on."""
+    VERSION: ClassVar[int] = 1
+    """Changed with the structure of the layout, so stale exported boxes are not loaded."""
+
     def __init__(
         self,
         *children: Element,
@@ -279,9 +312,126 @@ class Layout(Element):
         padding: Optional[Indentation] = MISSING,
         border: Optional[Indentation] = MISSING,
         outline: Optional[int] = MISSING,
+        boxes: Optional[Sequence[int]] = None,
     ):
         super().__init__(*children, width=width, height=height, padding=padding, border=border, outline=outline)
-        self._update(0, 0, self._get_width(), self._get_height())
+
+        if boxes is None:
+            self._update(0, 0, self._get_width(), self._get_height())
+        else:
+            self._load_boxes(boxes)
+
+        self.boxes = self._dump_boxes()
+
+    @classmethod
+    def from_metrics(cls, metrics: FontMetrics, *, boxes: Optional[Sequence[int]] = None) -> Self:
+        """Builds the layout from metrics of `FONTS`, or takes its boxes from `boxes` when given.
+
+        Subclasses are constructed with a font loader or metrics of `FONTS`, e.g. `CharacterLayout`.
+        """
+        return cls(metrics, boxes=boxes)  # pyright: ignore[reportArgumentType]
+
+    @classmethod
+    def _get_metrics(cls, font_loader: Union[FontLoaderP, FontMetrics]) -> FontMetrics:
+        return font_loader if isinstance(font_loader, Mapping) else get_font_metrics(font_loader, cls.FONTS)
+
+    def _dump_boxes(self) -> tuple[int, ...]:
+        boxes: list[int] = []
+        for element in self.walk():
+            for box in (element.outer_box, element.inner_box):
+                boxes.extend((box.x, box.y, box.width, box.height))
+
+        return tuple(boxes)
+
+    def _load_boxes(self, boxes: Sequence[int]) -> None:
+        elements = list(self.walk())
+        if len(boxes) != len(elements) * 8:
+            raise ValueError(f'Expected {len(elements) * 8} box coordinates, received {len(boxes)}')
+
+        for i, element in enumerate(elements):
+            element.outer_box = Rectangle(*boxes[i * 8 : i * 8 + 4])
+            element.inner_box = Rectangle(*boxes[i * 8 + 4 : i * 8 + 8])
+
+
+def get_font_metrics(font_loader: FontLoaderP, fonts: Iterable[FontKey]) -> dict[FontKey, tuple[int, int]]:
+    return {(weight, size): font_loader.get_font(weight, size).getmetrics() for weight, size in fonts}
+
+
+L = TypeVar('L', bound=Layout)
+
+
+# Layout name, version and metrics of its fonts
+_LayoutKey = tuple[str, int, tuple[tuple[int, float, int, int], ...]]
+
+
+class LayoutDict(TypedDict):
+    layout: str
+    version: int
+    metrics: list[tuple[int, float, int, int]]
+    boxes: list[int]
+
+
+class LayoutCache:
+    """Layouts shared between renderers, built once for each set of font metrics.
+
+    Layouts depend only on metrics of their fonts, so the same layout is returned for font loaders with equal
+    metrics. Layouts must not be modified. Boxes of built layouts can be exported with `dump` and loaded with
+    `load`, e.g. at startup, so they are not computed again.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._layouts: dict[_LayoutKey, Layout] = {}
+        self._boxes: dict[_LayoutKey, tuple[int, ...]] = {}
+
+    @staticmethod
+    def _get_key(layout: type[Layout], metrics: FontMetrics) -> _LayoutKey:
+        fingerprint = tuple(sorted((weight, size, ascent, descent) for (weight, size), (ascent, descent) in metrics.items()))
+        return (layout.__qualname__, layout.VERSION, fingerprint)
+
+    def get(self, cls: type[L], font_loader: FontLoaderP) -> L:
+        metrics = get_font_metrics(font_loader, cls.FONTS)
+        key = self._get_key(cls, metrics)
+
+        with self._lock:
+            layout = self._layouts.get(key)
+            boxes = self._boxes.get(key)
+
+        if layout is None:
+            layout = cls.from_metrics(metrics, boxes=boxes)
+            with self._lock:
+                layout = self._layouts.setdefault(key, layout)
+
+        return layout  # pyright: ignore[reportReturnType]
+
+    def dump(self) -> list[LayoutDict]:
+        """Boxes of built and loaded layouts, serializable to JSON."""
+        with self._lock:
+            boxes = {**self._boxes, **{key: layout.boxes for key, layout in self._layouts.items()}}
+
+        return [
+            {'layout': name, 'version': version, 'metrics': list(metrics), 'boxes': list(layout_boxes)}
+            for (name, version, metrics), layout_boxes in boxes.items()
+        ]
+
+    def load(self, data: Iterable[LayoutDict]) -> None:
+        """Adds boxes exported by `dump`, used by layouts built afterwards."""
+        with self._lock:
+            for layout in data:
+                fingerprint = tuple(
+                    sorted((weight, size, ascent, descent) for weight, size, ascent, descent in layout['metrics'])
+                )
+                key = (layout['layout'], layout['version'], fingerprint)
+                self._boxes[key] = tuple(layout['boxes'])
+
+    def clear(self) -> None:
+        with self._lock:
+            self._layouts.clear()
+            self._boxes.clear()
+
+
+layout_cache = LayoutCache()
+"""Process-wide cache used by renderers."""
 
 
 def pad_bbox(bbox: tuple[float, float, float, float], padding: Indentation):
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from io import BytesIO
+from typing import IO, TYPE_CHECKING, Generator, Iterable, Literal, NamedTuple, Union
+
+from PIL import Image
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+# fmt: off
+__all__ = (
+    'OutputOptions',
+    'EncodeBenchmark',
+    'DEFAULT_OUTPUT',
+    'BENCHMARK_OUTPUTS',
+    'encode_image',
+    'save_image',
+    'open_output',
+    'get_buffer',
+    'get_array',
+    'benchmark_encoders',
+)
+# fmt: on
+
+OutputFormat = Literal['PNG', 'WEBP', 'JPEG', 'RAW']
+
+MIMETYPES: dict[OutputFormat, str] = {
+    'PNG': 'image/png',
+    'WEBP': 'image/webp',
+    'JPEG': 'image/jpeg',
+    'RAW': 'application/octet-stream',
+}
+
+
+@dataclass(frozen=True)
+class OutputOptions:
+    """Encoding of rendered images.
+
+    Parameters
+    ----------
+    format : 'PNG' | 'WEBP' | 'JPEG' | 'RAW', optional
+        Output format. RAW is uncompressed pixels in the mode of the image, RGBA for characters and RGB for items.
+        JPEG drops transparency. Defaults to PNG.
+    compress_level : int, optional
+        PNG zlib level from 0 to 9, lower levels encode faster into larger files. Defaults to 6.
+    optimize : bool, optional
+        Extra PNG and JPEG pass for smaller files, much slower. Defaults to False.
+    quality : int, optional
+        WEBP and JPEG quality from 0 to 100. Defaults to 90.
+    lossless : bool, optional
+        Whether WEBP is lossless, `quality` is then the compression effort. Defaults to False.
+    quantize : bool, optional
+        Reduce PNG to a palette of `colors` before encoding. Cards use few colours, so it's mostly noticeable
+        on antialiased text and icons. Defaults to False.
+    colors : int, optional
+        Palette size of `quantize`, from 2 to 256. Defaults to 256.
+    """
+
+    format: OutputFormat = 'PNG'
+    compress_level: int = 6
+    optimize: bool = False
+    quality: int = 90
+    lossless: bool = False
+    quantize: bool = False
+    colors: int = 256
+
+    def __post_init__(self) -> None:
+        if self.format not in MIMETYPES:
+            raise ValueError(f'Expected format to be one of {", ".join(MIMETYPES)}, received {self.format!r}')
+        if not 0 <= self.compress_level <= 9:
+            raise ValueError(f'Expected compress level to be between 0 and 9, received {self.compress_level}')
+        if not 0 <= self.quality <= 100:
+            raise ValueError(f'Expected quality to be between 0 and 100, received {self.quality}')
+        if not 2 <= self.colors <= 256:
+            raise ValueError(f'Expected colors to be between 2 and 256, received {self.colors}')
+
+    @property
+    def mimetype(self) -> str:
+        return MIMETYPES[self.format]
+
+
+DEFAULT_OUTPUT = OutputOptions()
+
+BENCHMARK_OUTPUTS = (
+    OutputOptions(compress_level=1),
+    DEFAULT_OUTPUT,
+    OutputOptions(compress_level=9),
+    OutputOptions(optimize=True),
+    OutputOptions(compress_level=1, quantize=True),
+    OutputOptions(quantize=True),
+    OutputOptions('WEBP'),
+    OutputOptions('WEBP', lossless=True),
+    OutputOptions('JPEG'),
+    OutputOptions('RAW'),
+)
+"""Options compared by `benchmark_encoders` by default."""
+
+
+@contextmanager
+def open_output(fp: Union[IO[bytes], int]) -> Generator[IO[bytes], None, None]:
+    """Writable binary stream of `fp`, file descriptors are wrapped without being closed afterwards."""
+    if not isinstance(fp, int):
+        yield fp
+        return
+
+    with os.fdopen(fp, 'wb', closefd=False) as file:
+        yield file
+
+
+def save_image(image: Image.Image, fp: Union[IO[bytes], int], options: OutputOptions = DEFAULT_OUTPUT) -> None:
+    """Encodes `image` according to `options` straight into a writable binary stream or file descriptor `fp`."""
+    with open_output(fp) as file:
+        if options.format == 'RAW':
+            file.write(get_buffer(image, image.mode))
+        elif options.format == 'PNG':
+            if options.quantize:
+                # Fast octree is the only method that keeps the alpha channel
+                image = image.quantize(options.colors, method=Image.Quantize.FASTOCTREE)
+            image.save(file, format='PNG', compress_level=options.compress_level, optimize=options.optimize)
+        elif options.format == 'WEBP':
+            image.save(file, format='WEBP', quality=options.quality, lossless=options.lossless)
+        else:
+            if image.mode != 'RGB':
+                image = image.convert('RGB')
+            image.save(file, format='JPEG', quality=options.quality, optimize=options.optimize)
+
+
+def encode_image(image: Image.Image, options: OutputOptions = DEFAULT_OUTPUT) -> BytesIO:
+    """Encodes `image` according to `options`.
+
+    Returns
+    -------
+    BytesIO
+        Encoded image, positioned at the start.
+    """
+
+    bytes_ = BytesIO()
+    save_image(image, bytes_, options)
+    bytes_.seek(0)
+
+    return bytes_
+
+
+def get_buffer(image: Image.Image, mode: str = 'RGBA') -> memoryview:
+    """Raw pixels of `image` converted to `mode`, row by row.
+
+    Pixels are copied out of the image once, the view doesn't copy them again.
+    """
+
+    if image.mode != mode:
+        image = image.convert(mode)
+
+    return memoryview(image.tobytes())
+
+
+def get_array(image: Image.Image, mode: str = 'RGBA') -> npt.NDArray[np.uint8]:
+    """Read-only array view of `get_buffer` with shape (height, width, bands), `mode` has to be 8-bit.
+
+    Requires NumPy.
+    """
+    import numpy as np
+
+    shape = (image.height, image.width, Image.getmodebands(mode))
+    return np.frombuffer(get_buffer(image, mode), dtype=np.uint8).reshape(shape)  # pyright: ignore[reportUnknownMemberType]
+
+
+class EncodeBenchmark(NamedTuple):
+    options: OutputOptions
+    # Fastest encode out of all repeats
+    seconds: float
+    # Encoded size in bytes
+    size: int
+
+
+def benchmark_encoders(
+    image: Image.Image, outputs: Iterable[OutputOptions] = BENCHMARK_OUTPUTS, *, repeat: int = 5
+) -> list[EncodeBenchmark]:
+    """Measures encode time and size of `image` for each of `outputs`, e.g. a decoded render.
+
+    Parameters
+    ----------
+    image : Image.Image
+        Encoded image.
+    outputs : Iterable[OutputOptions], optional
+        Compared options. Defaults to `BENCHMARK_OUTPUTS`.
+    repeat : int, optional
+        Encodes per option, the fastest one is reported. Defaults to 5.
+    """
+
+    if not repeat > 0:
+        raise ValueError(f'Expected repeat to be more than 0, received {repeat}')
+
+    image.load()
+
+    results: list[EncodeBenchmark] = []
+    for options in outputs:
+        best = float('inf')
+        size = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            size = encode_image(image, options).getbuffer().nbytes
+            best = min(best, time.perf_counter() - start)
+
+        results.append(EncodeBenchmark(options, best, size))
+
+    return results
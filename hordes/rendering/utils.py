@@ -1,9 +1,11 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, AnyStr, Sequence, TypeVar, Union
+import math
+from typing import TYPE_CHECKING, Any, AnyStr, NamedTuple, Optional, Sequence, TypeVar, Union
 
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageChops, ImageColor, ImageDraw, ImageFont
 
+from ..cache import CacheInfo, PolicyCache
 from .font import FontLoaderP
 
 if TYPE_CHECKING:
@@ -11,7 +13,7 @@ if TYPE_CHECKING:
     Coords = Union[Sequence[float], Sequence[Sequence[float]]]
     T = TypeVar('T', int, float, tuple[float, float], tuple[int, int], list[int], Coords)
 
-    _Ink = Union[float, tuple[int, ...], str]
+    Ink = Union[float, tuple[int, ...], str]
 
 
 def set_opacity(image: Image.Image, opacity: float) -> Image.Image:
@@ -55,6 +57,11 @@ def resize(image: Image.Image, wh: tuple[int, int]) -> Image.Image:
     return image
 
 
+def get_image_size(image: Image.Image) -> int:
+    """Approximate memory used by pixels of `image` in bytes."""
+    return image.width * image.height * len(image.getbands())
+
+
 def account_draw_offset(coords: Coords) -> Coords:
     if isinstance(coords[0], Sequence) and isinstance(coords[1], Sequence):
         return coords[0], (coords[1][0] - 1, coords[1][1] - 1)
@@ -81,11 +88,240 @@ def get_size(data: T, size_multiplier: int) -> T:
         raise TypeError(f'Expected int, float, tuple or list, received {data.__class__.__name__}')
 
 
+class _Mask(NamedTuple):
+    offset: tuple[int, int]
+    mask: Optional[Image.Image]
+
+
+def _get_mask_size(mask: _Mask) -> int:
+    return 64 if mask.mask is None else 64 + get_image_size(mask.mask)
+
+
+class _DigitMetrics(NamedTuple):
+    advances: dict[str, float]
+    # Whether any pair of digits is kerned, composed runs would be misplaced then
+    kerned: bool
+
+
+def _get_digit_metrics_size(_: object) -> int:
+    return 1
+
+
+class GlyphCache:
+    """Rasterized text masks reused between draws of the same text.
+
+    Masks are keyed by text, font, anchor and subpixel offset, fill is applied when pasting, so one mask serves
+    every colour. Numeric strings are composed from masks of single glyphs, so new numbers don't have to be
+    rasterized. Glyphs are keyed by font weight and size, so a cache should only be used with one font loader.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        Maximum size of masks in bytes. Defaults to 2MB.
+    max_fonts : int, optional
+        Maximum amount of fonts whose digit advances and kerning are kept. Defaults to 64.
+    """
+
+    DIGITS = frozenset('0123456789+-.,%() ')
+
+    def __init__(self, max_size: int = 2 * 1024 * 1024, *, max_fonts: int = 64) -> None:
+        self._masks: PolicyCache[tuple[Any, ...], _Mask] = PolicyCache(max_size=max_size, sizeof=_get_mask_size)
+        # Keyed by font weight and size
+        self._digits: PolicyCache[tuple[int, float], _DigitMetrics] = PolicyCache(
+            max_size=max_fonts, sizeof=_get_digit_metrics_size
+        )
+
+    @property
+    def max_size(self) -> int:
+        return self._masks.max_size
+
+    def info(self) -> CacheInfo:
+        return self._masks.info()
+
+    def resize(self, max_size: int) -> None:
+        self._masks.resize(max_size)
+
+    def clear(self) -> None:
+        self._masks.clear()
+
+    @staticmethod
+    def _rasterize(
+        font: ImageFont.FreeTypeFont, text: str, fraction: tuple[float, float], anchor: str, spacing: float, align: str
+    ) -> _Mask:
+        with Image.new('L', (1, 1)) as dummy:
+            left, top, right, bottom = ImageDraw.Draw(dummy).textbbox(
+                fraction, text, font=font, anchor=anchor, spacing=spacing, align=align
+            )
+
+        x, y = min(math.floor(left), 0), min(math.floor(top), 0)
+        mask = Image.new('L', (math.ceil(right) - x + 2, math.ceil(bottom) - y + 2))
+        ImageDraw.Draw(mask).text(
+            (fraction[0] - x, fraction[1] - y), text, fill=255, font=font, anchor=anchor, spacing=spacing, align=align
+        )
+
+        bbox = mask.getbbox()
+        if bbox is None:
+            return _Mask((0, 0), None)
+
+        return _Mask((x + bbox[0], y + bbox[1]), mask.crop(bbox))
+
+    def _get_digit_metrics(self, font: ImageFont.FreeTypeFont, font_key: tuple[int, float]) -> _DigitMetrics:
+        metrics = self._digits.get(font_key)
+        if metrics is None:
+            advances = {char: font.getlength(char) for char in self.DIGITS}
+            kerned = any(font.getlength(a + b) != advances[a] + advances[b] for a in self.DIGITS for b in self.DIGITS)
+            metrics = self._digits[font_key] = _DigitMetrics(advances, kerned)
+
+        return metrics
+
+    def _compose(
+        self,
+        font: ImageFont.FreeTypeFont,
+        font_key: tuple[int, float],
+        text: str,
+        fraction: tuple[float, float],
+        anchor: str,
+    ) -> _Mask:
+        digit_advances = self._get_digit_metrics(font, font_key).advances
+        advances = [digit_advances[char] for char in text]
+        # Advances are multiples of 1/64, so glyph positions are exact
+        pen = fraction[0] - (sum(advances) if anchor[0] == 'r' else 0)
+
+        glyphs: list[tuple[int, int, Image.Image]] = []
+        for char, advance in zip(text, advances):
+            x = math.floor(pen)
+            glyph = self.get_mask(font, font_key, char, (pen - x, fraction[1]), 'l' + anchor[1])
+            if glyph.mask is not None:
+                glyphs.append((x + glyph.offset[0], glyph.offset[1], glyph.mask))
+            pen += advance
+
+        if not glyphs:
+            return _Mask((0, 0), None)
+
+        left = min(x for x, _, _ in glyphs)
+        top = min(y for _, y, _ in glyphs)
+        right = max(x + mask.width for x, _, mask in glyphs)
+        bottom = max(y + mask.height for _, y, mask in glyphs)
+
+        # Antialiased edges of neighbouring glyphs can overlap, FreeType keeps the larger value
+        run = Image.new('L', (right - left, bottom - top))
+        for x, y, mask in glyphs:
+            box = (x - left, y - top, x - left + mask.width, y - top + mask.height)
+            run.paste(ImageChops.lighter(run.crop(box), mask), box)
+
+        return _Mask((left, top), run)
+
+    def get_mask(
+        self,
+        font: ImageFont.FreeTypeFont,
+        font_key: tuple[int, float],
+        text: str,
+        fraction: tuple[float, float],
+        anchor: str,
+        spacing: float = 4,
+        align: str = 'left',
+    ) -> _Mask:
+        """Mask of `text` drawn at `fraction` and its offset from the integer part of the position.
+
+        `font_key` is font weight and size of `font`.
+        """
+
+        key = (*font_key, text, fraction, anchor, spacing, align)
+        mask = self._masks.get(key)
+        if mask is not None:
+            return mask
+
+        # Centered and descender anchors are computed from the whole run, so composed runs end up off by a pixel
+        if (
+            len(text) > 1
+            and anchor[0] in 'lr'
+            and anchor[1] in 'asm'
+            and self.DIGITS.issuperset(text)
+            and not self._get_digit_metrics(font, font_key).kerned
+        ):
+            mask = self._compose(font, font_key, text, fraction, anchor)
+        else:
+            mask = self._rasterize(font, text, fraction, anchor, spacing, align)
+
+        self._masks[key] = mask
+        return mask
+
+
+def _get_measure_size(_: object) -> int:
+    return 128
+
+
+class MeasureCache:
+    """Widths and bounding boxes of text drawn with fonts of `font_loader`.
+
+    Keyed by font weight, size and text, so words and lines that repeat between renders are measured once.
+
+    Parameters
+    ----------
+    font_loader : FontLoaderP
+        Loader of measured fonts.
+    max_size : int, optional
+        Maximum size of measurements in bytes, roughly 128 bytes each. Defaults to 1MB.
+    """
+
+    def __init__(self, font_loader: FontLoaderP, max_size: int = 1024 * 1024) -> None:
+        self.font_loader = font_loader
+        self._measures: PolicyCache[tuple[Any, ...], Any] = PolicyCache(max_size=max_size, sizeof=_get_measure_size)
+
+    @property
+    def max_size(self) -> int:
+        return self._measures.max_size
+
+    def info(self) -> CacheInfo:
+        return self._measures.info()
+
+    def resize(self, max_size: int) -> None:
+        self._measures.resize(max_size)
+
+    def clear(self) -> None:
+        self._measures.clear()
+
+    def getlength(self, font_weight: int, font_size: float, text: str) -> float:
+        key = (font_weight, font_size, text)
+        length: Optional[float] = self._measures.get(key)
+        if length is None:
+            length = self._measures[key] = self.font_loader.get_font(font_weight, font_size).getlength(text)
+
+        return length
+
+    def getbbox(
+        self, font_weight: int, font_size: float, text: str, anchor: Optional[str] = None
+    ) -> tuple[float, float, float, float]:
+        """Bounding box of single line `text` drawn at the origin."""
+        key = (font_weight, font_size, text, anchor)
+        bbox: Optional[tuple[float, float, float, float]] = self._measures.get(key)
+        if bbox is None:
+            bbox = self._measures[key] = self.font_loader.get_font(font_weight, font_size).getbbox(text, anchor=anchor)
+
+        return bbox
+
+
 class DrawScaler:
-    def __init__(self, im: Image.Image, font_loader: FontLoaderP, mode: Union[str, None] = None, size_multiplier: int = 1):
+    def __init__(
+        self,
+        im: Image.Image,
+        font_loader: FontLoaderP,
+        mode: Union[str, None] = None,
+        size_multiplier: int = 1,
+        glyph_cache: Optional[GlyphCache] = None,
+        measure_cache: Optional[MeasureCache] = None,
+    ):
+        self._image = im
         self._draw = ImageDraw.Draw(im, mode)
         self.font_loader = font_loader
         self.size_multiplier = size_multiplier
+        self.glyph_cache = glyph_cache
+        self.measure_cache = measure_cache
+
+        # Pasting masks matches drawing only when colours are written as is
+        self._paste_text = glyph_cache is not None and im.mode in ('RGB', 'RGBA') and mode in (None, im.mode)
+        # Bilevel images are measured with monochrome hinting
+        self._measure_text = measure_cache is not None and self._draw.fontmode == 'L'
 
     def _getsize(self, data: T) -> T:
         return get_size(data, self.size_multiplier)
@@ -97,7 +333,7 @@ class DrawScaler:
         self,
         xy: tuple[float, float],
         text: AnyStr,
-        fill: _Ink | None = None,
+        fill: Ink | None = None,
         font_size: float = 16,
         font_weight: int = 400,
         anchor: str | None = None,
@@ -107,11 +343,25 @@ class DrawScaler:
         features: list[str] | None = None,
         language: str | None = None,
         stroke_width: float = 0,
-        stroke_fill: _Ink | None = None,
+        stroke_fill: Ink | None = None,
         embedded_color: bool = False,
         *args: Any,
         **kwargs: Any,
     ) -> None:
+        if (
+            self._paste_text
+            and isinstance(text, str)
+            and not isinstance(fill, (int, float))
+            and direction is None
+            and features is None
+            and language is None
+            and not stroke_width
+            and not embedded_color
+            and not args
+            and not kwargs
+        ):
+            return self._paste(xy, text, fill, font_size, font_weight, anchor or 'la', spacing, align)
+
         return self._draw.text(
             xy=self._getsize(xy),
             text=text,
@@ -130,6 +380,38 @@ class DrawScaler:
             **kwargs,
         )
 
+    def _paste(
+        self,
+        xy: tuple[float, float],
+        text: str,
+        fill: Ink | None,
+        font_size: float,
+        font_weight: int,
+        anchor: str,
+        spacing: float,
+        align: str,
+    ) -> None:
+        assert self.glyph_cache is not None
+
+        x, y = self._getsize(xy)
+        fraction = (math.modf(x)[0], math.modf(y)[0])
+        font_key = (font_weight, font_size * self.size_multiplier)
+
+        offset, mask = self.glyph_cache.get_mask(
+            self._getfont(font_weight, font_size), font_key, text, fraction, anchor, spacing, align
+        )
+        if mask is None:
+            return
+
+        if fill is None:
+            ink: Union[float, tuple[int, ...]] = (255, 255, 255, 255)
+        elif isinstance(fill, str):
+            ink = ImageColor.getcolor(fill, self._image.mode)
+        else:
+            ink = fill
+
+        self._image.paste(ink, (int(x) + offset[0], int(y) + offset[1]), mask)
+
     def textlength(
         self,
         text: AnyStr,
@@ -140,6 +422,17 @@ class DrawScaler:
         language: str | None = None,
         embedded_color: bool = False,
     ) -> float:
+        if (
+            self._measure_text
+            and self.measure_cache is not None
+            and isinstance(text, str)
+            and direction is None
+            and features is None
+            and language is None
+            and not embedded_color
+        ):
+            return self.measure_cache.getlength(font_weight, font_size, text)
+
         return self._draw.textlength(
             text=text,
             font=self.font_loader.get_font(font_weight, font_size),
@@ -165,6 +458,20 @@ class DrawScaler:
         stroke_width: float = 0,
         embedded_color: bool = False,
     ) -> tuple[float, float, float, float]:
+        if (
+            self._measure_text
+            and self.measure_cache is not None
+            and isinstance(text, str)
+            and '\n' not in text
+            and direction is None
+            and features is None
+            and language is None
+            and not stroke_width
+            and not embedded_color
+        ):
+            left, top, right, bottom = self.measure_cache.getbbox(font_weight, font_size, text, anchor)
+            return left + xy[0], top + xy[1], right + xy[0], bottom + xy[1]
+
         return self._draw.textbbox(
             xy=xy,
             text=text,
@@ -183,8 +490,8 @@ class DrawScaler:
     def rectangle(
         self,
         xy: Coords,
-        fill: _Ink | None = None,
-        outline: _Ink | None = None,
+        fill: Ink | None = None,
+        outline: Ink | None = None,
         width: int = 1,
     ) -> None:
         return self._draw.rectangle(
@@ -198,8 +505,8 @@ class DrawScaler:
         self,
         xy: Coords,
         radius: float = 0,
-        fill: _Ink | None = None,
-        outline: _Ink | None = None,
+        fill: Ink | None = None,
+        outline: Ink | None = None,
         width: int = 1,
         *,
         corners: tuple[bool, bool, bool, bool] | None = None,
@@ -212,3 +519,7 @@ class DrawScaler:
             width=width,
             corners=corners,
         )
+
+    def paste(self, im: Image.Image, xy: tuple[int, int], mask: Optional[Image.Image] = None) -> None:
+        """Pastes `im`, which is expected to be scaled already, at scaled `xy`."""
+        self._image.paste(im, self._getsize(xy), mask)
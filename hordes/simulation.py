@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import heapq
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, NamedTuple, Optional
+
+from .buildscore import get_buildscore
+from .effects import Effect
+from .item.logic import ITEM_LOGIC
+
+if TYPE_CHECKING:
+    from .character import Character
+
+__all__ = (
+    'CharmBuff',
+    'CharmState',
+    'StatStates',
+    'SimulationResult',
+    'get_stat_states',
+    'simulate',
+    'simulate_population',
+)
+
+
+class CharmBuff(NamedTuple):
+    effect_id: Optional[int]
+    duration: float
+    damage_reduction: float = 0
+
+
+class CharmState(NamedTuple):
+    tier: int
+    cooldown: float
+    cast_time: float
+    duration: float
+
+
+class StatStates(NamedTuple):
+    charms: tuple[CharmState, ...]
+    dps: tuple[float, ...]
+    ehp: tuple[float, ...]
+
+
+class SimulationResult(NamedTuple):
+    dps: float
+    ehp: float
+    damage: float
+    uptime: tuple[float, ...]
+
+
+# Values of charm tooltips in `CHARM_LOGIC`, the game doesn't expose them as data
+PROTECTION_CHARM_TIER = 1  # "Protects you against 30% of incoming damage for 10 seconds."
+PROTECTION_DAMAGE_REDUCTION = 0.3
+PROTECTION_DURATION = 10
+
+DAMAGE_CHARM_TIER = 2  # "Increases your damage by 20% for 10 seconds."
+DAMAGE_CHARM_EFFECT_ID = 110  # Charm buff of `EffectsLogic`, adds 20 to stat 30 (damage %)
+DAMAGE_CHARM_DURATION = 10
+
+# On-use charm buffs by charm tier. Charms without an entry have no combat impact.
+CHARM_BUFFS: dict[int, CharmBuff] = {
+    PROTECTION_CHARM_TIER: CharmBuff(
+        effect_id=None, duration=PROTECTION_DURATION, damage_reduction=PROTECTION_DAMAGE_REDUCTION
+    ),
+    DAMAGE_CHARM_TIER: CharmBuff(effect_id=DAMAGE_CHARM_EFFECT_ID, duration=DAMAGE_CHARM_DURATION),
+}
+
+CAST_TICK = 0.1  # `anim_cast` is stored in ticks of 100ms
+
+_CAST_START = 0
+_CAST_END = 1
+_EXPIRE = 2
+
+
+def get_stat_states(character: Character) -> StatStates:
+    """Precomputes DPS and EHP of `character` for every combination of active charm buffs.
+
+    Values are indexed by a bitmask where bit `i` is set when the buff of `charms[i]` is active.
+    """
+
+    charms: list[CharmState] = []
+    buffs: list[CharmBuff] = []
+    for _, item in character.slots:
+        if not item or item.type != 'charm' or item.tier not in CHARM_BUFFS:
+            continue
+
+        logic = ITEM_LOGIC[item.type][item.tier]
+        if 'use_cd' not in logic:
+            continue
+
+        buff = CHARM_BUFFS[item.tier]
+        charms.append(
+            CharmState(
+                tier=item.tier,
+                cooldown=logic['use_cd'],
+                cast_time=logic.get('anim_cast', 0) * CAST_TICK,
+                duration=buff.duration,
+            )
+        )
+        buffs.append(buff)
+
+    dps: list[float] = []
+    ehp: list[float] = []
+    for mask in range(1 << len(charms)):
+        active = [buff for i, buff in enumerate(buffs) if mask & (1 << i)]
+        effects = [Effect(buff.effect_id, level=1, stacks=1) for buff in active if buff.effect_id is not None]
+
+        stats = character.get_stats_with_effects(*effects) if effects else character.stats
+        buildscore = get_buildscore(stats, class_id=character.class_id)
+
+        reduction = 1.0
+        for buff in active:
+            reduction *= 1 - buff.damage_reduction
+
+        dps.append(buildscore.dps)
+        ehp.append(buildscore.ehp / reduction)
+
+    return StatStates(charms=tuple(charms), dps=tuple(dps), ehp=tuple(ehp))
+
+
+@lru_cache(maxsize=1024)
+def _get_timeline(charms: tuple[CharmState, ...], duration: float) -> tuple[tuple[float, ...], tuple[float, ...]]:
+    """Runs the event queue for a charm setup.
+
+    Returns time spent attacking and time spent casting for every buff mask.
+    Timeline only depends on charms, so it is shared by every character with the same setup.
+    """
+
+    attacking = [0.0] * (1 << len(charms))
+    casting = [0.0] * (1 << len(charms))
+
+    events: list[tuple[float, int, int, int]] = []
+    sequence = 0
+    for index in range(len(charms)):
+        heapq.heappush(events, (0.0, sequence, _CAST_START, index))
+        sequence += 1
+
+    mask = 0
+    casts = 0
+    busy_until = 0.0
+    last = 0.0
+
+    while events and events[0][0] < duration:
+        time, _, kind, index = heapq.heappop(events)
+
+        elapsed = time - last
+        if casts:
+            casting[mask] += elapsed
+        else:
+            attacking[mask] += elapsed
+        last = time
+
+        charm = charms[index]
+        if kind == _CAST_START:
+            if time < busy_until:  # Another charm is being cast, wait for it to finish
+                heapq.heappush(events, (busy_until, sequence, _CAST_START, index))
+            else:
+                casts += 1
+                busy_until = time + charm.cast_time
+                heapq.heappush(events, (busy_until, sequence, _CAST_END, index))
+                heapq.heappush(events, (time + charm.cooldown, sequence + 1, _CAST_START, index))
+            sequence += 2
+        elif kind == _CAST_END:
+            casts -= 1
+            mask |= 1 << index
+            heapq.heappush(events, (time + charm.duration, sequence, _EXPIRE, index))
+            sequence += 1
+        elif kind == _EXPIRE:
+            mask &= ~(1 << index)
+
+    if casts:
+        casting[mask] += duration - last
+    else:
+        attacking[mask] += duration - last
+
+    return tuple(attacking), tuple(casting)
+
+
+def simulate(states: StatStates, duration: float = 60) -> SimulationResult:
+    """Simulates `duration` seconds of a fight using charms on cooldown.
+
+    No damage is dealt while a charm is being cast.
+
+    Parameters
+    ----------
+    states : StatStates
+        Precomputed stat states, see `get_stat_states`.
+    duration : float, optional
+        Fight length in seconds. Defaults to 60.
+
+    Returns
+    -------
+    SimulationResult
+        Time-averaged DPS and EHP, total damage and uptime of each charm buff.
+    """
+
+    if not duration > 0:
+        raise ValueError(f'Expected duration to be more than 0, received {duration}')
+
+    attacking, casting = _get_timeline(states.charms, float(duration))
+
+    damage = sum(time * dps for time, dps in zip(attacking, states.dps))
+    ehp = sum((a + c) * ehp for a, c, ehp in zip(attacking, casting, states.ehp)) / duration
+
+    uptime: list[float] = []
+    for i in range(len(states.charms)):
+        active = sum(a + c for mask, (a, c) in enumerate(zip(attacking, casting)) if mask & (1 << i))
+        uptime.append(active / duration)
+
+    return SimulationResult(dps=damage / duration, ehp=ehp, damage=damage, uptime=tuple(uptime))
+
+
+def simulate_population(population: Iterable[StatStates], duration: float = 60) -> list[SimulationResult]:
+    """Simulates every entry of `population`, see `simulate`.
+
+    Stat states should be computed once per character with `get_stat_states`
+    and reused between runs, event timelines are shared between identical charm setups.
+    """
+
+    return [simulate(states, duration) for states in population]
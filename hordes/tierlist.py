@@ -1,13 +1,480 @@
-from .models import Ranking
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import os
+import random
+from bisect import bisect_left, insort
+from itertools import chain, islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Mapping, Optional, Sequence, Union, overload
+
+from .models import Ranking, RankingDict
 from .utils import find_first_index, get_attr_or_item, math_round
 
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+    from typing_extensions import Self
+
+    from .types.common import StrPath
+
+    _Key = tuple[float, float, int]
+
 __all__ = (
+    'RankingIndex',
+    'Leaderboard',
+    'QuantileSketch',
     'get_tierlist_rank',
     'get_leaderboard_rank',
 )
 
 
+def _round_array(array: npt.NDArray[np.float64], ndigits: int) -> npt.NDArray[np.float64]:
+    """Vectorized `math_round`."""
+    import numpy as np
+
+    factor = float(10**ndigits)
+    scaled = array * factor
+    floor = np.floor(scaled)
+
+    return np.where(scaled - floor < 0.5, floor, np.ceil(scaled)) / factor
+
+
+class RankingIndex:
+    """Sorted index over a `Ranking` for O(log n) rank lookups.
+
+    Thresholds in `ranks` and scores in `leaderboard` are expected in descending order,
+    which is the order `get_tierlist_rank` and `get_leaderboard_rank` search them in.
+    """
+
+    def __init__(self, ranking: Ranking) -> None:
+        self.ranks: tuple[float, ...] = tuple(get_attr_or_item(ranking, 'ranks'))
+        self.leaderboard: tuple[float, ...] = tuple(get_attr_or_item(ranking, 'leaderboard'))
+
+        # Negated to search descending sequences in ascending order
+        self._ranks = sorted(-value for value in self.ranks)
+        self._leaderboard = sorted(-math_round(value, 4) for value in self.leaderboard)
+
+        self._arrays: Optional[tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]] = None
+
+    def _get_arrays(self) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+        if self._arrays is None:
+            import numpy as np
+
+            self._arrays = (np.asarray(self._ranks, dtype=np.float64), np.asarray(self._leaderboard, dtype=np.float64))
+
+        return self._arrays
+
+    def get_tierlist_rank(self, buildscore: float) -> int:
+        index = bisect_left(self._ranks, -buildscore)
+        return index if index < len(self._ranks) else -1
+
+    def get_leaderboard_rank(self, buildscore: float) -> int:
+        index = bisect_left(self._leaderboard, -math_round(buildscore, 4))
+        return index if index < len(self._leaderboard) else -1
+
+    def get_tierlist_ranks(self, buildscores: npt.ArrayLike) -> npt.NDArray[np.intp]:
+        """Tierlist rank of every buildscore in `buildscores`. Requires NumPy."""
+        import numpy as np
+
+        ranks, _ = self._get_arrays()
+        indices = np.searchsorted(ranks, -np.asarray(buildscores, dtype=np.float64), side='left')
+
+        return np.where(indices < len(ranks), indices, -1)
+
+    def get_leaderboard_ranks(self, buildscores: npt.ArrayLike) -> npt.NDArray[np.intp]:
+        """Leaderboard rank of every buildscore in `buildscores`. Requires NumPy."""
+        import numpy as np
+
+        _, leaderboard = self._get_arrays()
+        rounded = _round_array(np.asarray(buildscores, dtype=np.float64), 4)
+        indices = np.searchsorted(leaderboard, -rounded, side='left')
+
+        return np.where(indices < len(leaderboard), indices, -1)
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} ranks={len(self.ranks)} leaderboard={len(self.leaderboard)}>'
+
+
+class _SortedKeyList:
+    """Sorted list split into blocks, with a Fenwick tree over block lengths for positional lookups."""
+
+    def __init__(self, keys: Sequence[_Key] = (), *, load: int = 1000) -> None:
+        self._load = load
+        self._blocks: list[list[_Key]] = [list(keys[i : i + load]) for i in range(0, len(keys), load)]
+        self._maxes: list[_Key] = [block[-1] for block in self._blocks]
+        self._len = len(keys)
+        self._rebuild_tree()
+
+    def _rebuild_tree(self) -> None:
+        tree = [0] + [len(block) for block in self._blocks]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _update_tree(self, block: int, delta: int) -> None:
+        i = block + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, block: int) -> int:
+        """Amount of keys before `block`."""
+        total = 0
+        i = block
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, index: int) -> tuple[int, int]:
+        """Finds block and offset of a positional `index`."""
+        block = 0
+        mask = 1 << (len(self._tree) - 1).bit_length()
+        while mask:
+            next = block + mask
+            if next < len(self._tree) and self._tree[next] <= index:
+                block = next
+                index -= self._tree[next]
+            mask >>= 1
+        return block, index
+
+    def add(self, key: _Key) -> None:
+        if not self._blocks:
+            self._blocks.append([key])
+            self._maxes.append(key)
+            self._len = 1
+            self._rebuild_tree()
+            return
+
+        block = min(bisect_left(self._maxes, key), len(self._blocks) - 1)
+        insort(self._blocks[block], key)
+        self._maxes[block] = self._blocks[block][-1]
+        self._len += 1
+
+        if len(self._blocks[block]) > self._load * 2:
+            half = self._blocks[block][self._load :]
+            del self._blocks[block][self._load :]
+            self._blocks.insert(block + 1, half)
+            self._maxes[block] = self._blocks[block][-1]
+            self._maxes.insert(block + 1, half[-1])
+            self._rebuild_tree()
+        else:
+            self._update_tree(block, 1)
+
+    def remove(self, key: _Key) -> None:
+        block = bisect_left(self._maxes, key)
+        if block == len(self._blocks):
+            raise KeyError(key)
+
+        keys = self._blocks[block]
+        index = bisect_left(keys, key)
+        if index == len(keys) or keys[index] != key:
+            raise KeyError(key)
+
+        del keys[index]
+        self._len -= 1
+
+        if keys:
+            self._maxes[block] = keys[-1]
+            self._update_tree(block, -1)
+        else:
+            del self._blocks[block]
+            del self._maxes[block]
+            self._rebuild_tree()
+
+    def bisect_left(self, key: tuple[float, ...]) -> int:
+        block = bisect_left(self._maxes, key)
+        if block == len(self._blocks):
+            return self._len
+
+        return self._prefix(block) + bisect_left(self._blocks[block], key)
+
+    def __getitem__(self, index: int) -> _Key:
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError('index out of range')
+
+        block, offset = self._locate(index)
+        return self._blocks[block][offset]
+
+    def __iter__(self) -> Iterator[_Key]:
+        return chain.from_iterable(self._blocks)
+
+    def __len__(self) -> int:
+        return self._len
+
+
+class _LeaderboardView(Sequence[float]):
+    """Read-only view of leaderboard scores in descending order."""
+
+    def __init__(self, keys: _SortedKeyList) -> None:
+        self._keys = keys
+
+    @overload
+    def __getitem__(self, index: int) -> float: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[float]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[float, list[float]]:
+        if isinstance(index, slice):
+            return [-self._keys[i][1] for i in range(*index.indices(len(self._keys)))]
+
+        return -self._keys[index][1]
+
+    def __iter__(self) -> Iterator[float]:
+        return (-key[1] for key in self._keys)
+
+    def __len__(self) -> int:
+        return self._keys.__len__()
+
+
+class Leaderboard:
+    """Mutable leaderboard of character scores keyed by character ID.
+
+    Keeps scores sorted in blocks, so updates and rank lookups don't require rebuilding the whole sequence.
+    Can be used as a `Ranking` anywhere a static one is accepted.
+    """
+
+    def __init__(self, scores: Optional[Mapping[int, float]] = None, *, ranks: Sequence[float] = ()) -> None:
+        self.ranks: Sequence[float] = tuple(ranks)
+
+        self._scores: dict[int, float] = dict(scores or {})
+        self._keys = _SortedKeyList(sorted(self._get_key(id, score) for id, score in self._scores.items()))
+
+    @staticmethod
+    def _get_key(id: int, score: float) -> _Key:
+        # Ordered by rounded score first to match `get_leaderboard_rank` comparisons
+        return (-math_round(score, 4), -score, id)
+
+    @property
+    def leaderboard(self) -> Sequence[float]:
+        return _LeaderboardView(self._keys)
+
+    def upsert(self, id: int, score: float) -> None:
+        if id in self._scores:
+            self._keys.remove(self._get_key(id, self._scores[id]))
+
+        self._scores[id] = score
+        self._keys.add(self._get_key(id, score))
+
+    def remove(self, id: int) -> None:
+        score = self._scores.pop(id)
+        self._keys.remove(self._get_key(id, score))
+
+    def get_score(self, id: int) -> Optional[float]:
+        return self._scores.get(id)
+
+    def get_position(self, id: int) -> int:
+        """Position of character `id` on the leaderboard, starting from 0."""
+        return self._keys.bisect_left(self._get_key(id, self._scores[id]))
+
+    def get_leaderboard_rank(self, buildscore: float) -> int:
+        index = self._keys.bisect_left((-math_round(buildscore, 4),))
+        return index if index < len(self._keys) else -1
+
+    def get_tierlist_rank(self, buildscore: float) -> int:
+        return find_first_index(self.ranks, buildscore)
+
+    def top(self, amount: int) -> list[tuple[int, float]]:
+        """Returns `(id, score)` of the `amount` highest scores."""
+        return [(key[2], -key[1]) for key in islice(self._keys, amount)]
+
+    def dump(self, path: StrPath) -> None:
+        """Writes a snapshot of the leaderboard to `path`."""
+        path = Path(path)
+        data = {
+            'ranks': list(self.ranks),
+            'scores': [[id, score] for id, score in self._scores.items()],
+        }
+
+        temporary = path.with_name(f'{path.name}.tmp')
+        temporary.write_text(json.dumps(data))
+        os.replace(temporary, path)
+
+    @classmethod
+    def load(cls, path: StrPath) -> Self:
+        """Restores a leaderboard from a snapshot written by `dump`."""
+        data = json.loads(Path(path).read_text())
+        return cls({int(id): float(score) for id, score in data['scores']}, ranks=data['ranks'])
+
+    def __contains__(self, id: int) -> bool:
+        return self._scores.__contains__(id)
+
+    def __len__(self) -> int:
+        return self._scores.__len__()
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} len={len(self)}>'
+
+
+class QuantileSketch:
+    """Mergeable streaming quantile sketch of buildscores.
+
+    KLL sketch for the body of the distribution, plus the exact `tail` highest scores so that
+    cutoffs of top ranks stay exact. Memory is bounded regardless of how many scores are added,
+    with `k=200` rank error of the KLL part is about 1.65% of the amount of scores.
+
+    Sketches built on separate shards can be combined with `merge`, or moved between processes with `to_dict`.
+    """
+
+    def __init__(self, k: int = 200, *, tail: int = 1000, seed: Optional[int] = None) -> None:
+        if not k >= 8:
+            raise ValueError(f'Expected k to be at least 8, received {k}')
+
+        self.k = k
+        self.tail = tail
+
+        self._compactors: list[list[float]] = [[]]
+        self._size = 0
+        self._count = 0
+        self._top: list[float] = []  # Min-heap of the highest scores
+        self._min = math.inf
+        self._random = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._compactors) - level - 1
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(level) for level in range(len(self._compactors)))
+
+    def _compress(self) -> None:
+        while self._size >= self._max_size():
+            for level, items in enumerate(self._compactors):
+                if len(items) < self._capacity(level):
+                    continue
+
+                if level + 1 == len(self._compactors):
+                    self._compactors.append([])
+
+                items.sort()
+                # Odd item stays on its level
+                leftover = [items.pop()] if len(items) % 2 else []
+                promoted = items[self._random.randint(0, 1) :: 2]
+
+                self._compactors[level + 1].extend(promoted)
+                self._size -= len(items) - len(promoted)
+                items[:] = leftover
+                break
+
+    def update(self, buildscore: float) -> None:
+        self._compactors[0].append(buildscore)
+        self._size += 1
+        self._count += 1
+        self._min = min(self._min, buildscore)
+
+        if len(self._top) < self.tail:
+            heapq.heappush(self._top, buildscore)
+        elif self.tail and buildscore > self._top[0]:
+            heapq.heapreplace(self._top, buildscore)
+
+        if self._size >= self._max_size():
+            self._compress()
+
+    def extend(self, buildscores: Iterable[float]) -> None:
+        for buildscore in buildscores:
+            self.update(buildscore)
+
+    def merge(self, other: QuantileSketch) -> None:
+        """Adds scores summarized by `other` into this sketch."""
+        while len(self._compactors) < len(other._compactors):
+            self._compactors.append([])
+
+        for level, items in enumerate(other._compactors):
+            self._compactors[level].extend(items)
+
+        self._size += other._size
+        self._count += other._count
+        self._min = min(self._min, other._min)
+        self._top = heapq.nlargest(self.tail, chain(self._top, other._top))
+        heapq.heapify(self._top)
+
+        self._compress()
+
+    def quantile(self, fraction: float) -> float:
+        """Approximate score below which `fraction` of scores are."""
+        if not self._count:
+            raise ValueError('Sketch is empty')
+
+        weighted = sorted(
+            (item, 1 << level) for level, items in enumerate(self._compactors) for item in items  # Weight doubles per level
+        )
+        total = sum(weight for _, weight in weighted)
+
+        target = fraction * total
+        cumulative = 0
+        for item, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return item
+
+        return weighted[-1][0]
+
+    def get_cutoff(self, share: float) -> float:
+        """Approximate lowest score among the top `share` of scores."""
+        if not self._count:
+            raise ValueError('Sketch is empty')
+
+        amount = max(1, math.ceil(share * self._count))
+        if amount >= self._count:
+            return self._min
+        if amount <= len(self._top):
+            return heapq.nlargest(amount, self._top)[-1]
+
+        return self.quantile(1 - share)
+
+    def get_ranks(self, shares: Sequence[float]) -> tuple[float, ...]:
+        """Tierlist rank thresholds in descending order, one per share of `shares`.
+
+        `shares` are fractions of characters at or above each rank from the highest one, e.g. `(0.01, 0.05, ..., 1)`.
+        The game doesn't publish them, so they're up to the caller.
+        """
+        return tuple(self.get_cutoff(share) for share in shares)
+
+    def to_ranking(self, shares: Sequence[float], leaderboard: Sequence[float] = ()) -> RankingDict:
+        """`Ranking` with thresholds of `get_ranks`."""
+        return RankingDict(leaderboard=leaderboard, ranks=self.get_ranks(shares))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'k': self.k,
+            'tail': self.tail,
+            'count': self._count,
+            'min': self._min,
+            'compactors': [list(items) for items in self._compactors],
+            'top': list(self._top),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> Self:
+        sketch = cls(data['k'], tail=data['tail'])
+        sketch._compactors = [list(items) for items in data['compactors']]
+        sketch._size = sum(len(items) for items in sketch._compactors)
+        sketch._count = data['count']
+        sketch._min = data['min']
+        sketch._top = list(data['top'])
+        heapq.heapify(sketch._top)
+
+        return sketch
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __repr__(self) -> str:
+        return f'<{self.__class__.__name__} k={self.k} count={self._count} size={self._size}>'
+
+
 def get_tierlist_rank(ranking: Ranking, buildscore: float) -> int:
+    if isinstance(ranking, (RankingIndex, Leaderboard)):
+        return ranking.get_tierlist_rank(buildscore)
+
     return find_first_index(get_attr_or_item(ranking, 'ranks'), buildscore)
 
 
@@ -16,4 +483,7 @@ def _leaderboard_comp_func(a: float, b: float) -> bool:
 
 
 def get_leaderboard_rank(ranking: Ranking, buildscore: float) -> int:
+    if isinstance(ranking, (RankingIndex, Leaderboard)):
+        return ranking.get_leaderboard_rank(buildscore)
+
     return find_first_index(get_attr_or_item(ranking, 'leaderboard'), buildscore, _leaderboard_comp_func)
@@ -0,0 +1,54 @@
+import hashlib
+from io import BytesIO
+from pathlib import Path
+from typing import Union
+
+import pytest
+from PIL import Image, ImageFont
+from PIL.ImageFont import FreeTypeFont
+
+
+class FakeLocale(str):
+    """Locale where every nested key exists, texts are the language code followed by the last key."""
+
+    def __getitem__(self, key: object) -> 'FakeLocale':  # pyright: ignore[reportIncompatibleMethodOverride]
+        return FakeLocale(f'{str.__getitem__(self, slice(2))} {key}')
+
+
+class DefaultFontLoader:
+    """Pillow's bundled font for every weight."""
+
+    def get_font(self, weight: int, size: float = 10) -> FreeTypeFont:
+        font = ImageFont.load_default(size)
+        assert isinstance(font, FreeTypeFont)
+        return font
+
+
+class GeneratedLoader:
+    """Asset loader with a solid color image for every path."""
+
+    def __init__(self) -> None:
+        self.paths: list[str] = []
+
+    def open(self, path: Union[str, Path]) -> BytesIO:
+        self.paths.append(str(path))
+        r, g, b = hashlib.md5(str(path).encode()).digest()[:3]
+        buffer = BytesIO()
+        Image.new('RGBA', (64, 48), (r, g, b, 200)).save(buffer, 'PNG')
+        buffer.seek(0)
+        return buffer
+
+
+@pytest.fixture
+def loc() -> FakeLocale:
+    return FakeLocale('en')
+
+
+@pytest.fixture
+def font_loader() -> DefaultFontLoader:
+    return DefaultFontLoader()
+
+
+@pytest.fixture
+def loader() -> GeneratedLoader:
+    return GeneratedLoader()
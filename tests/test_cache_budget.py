@@ -0,0 +1,94 @@
+import gc
+
+import pytest
+
+from hordes.cache import CacheRegistry, PolicyCache
+
+
+def make_cache() -> PolicyCache[int, bytes]:
+    return PolicyCache(max_size=1)
+
+
+def request(cache: PolicyCache[int, bytes], hits: int) -> None:
+    cache[0] = b'x'
+    for _ in range(hits):
+        cache[0]
+
+
+def test_register_splits_budget_by_weight():
+    registry = CacheRegistry(1000, min_share=0.2)
+    first, second = make_cache(), make_cache()
+
+    registry.register('first', first)
+    registry.register('second', second, weight=3)
+
+    # 100 each from the floor, the remaining 800 split 1:3
+    assert first.max_size == 300
+    assert second.max_size == 700
+
+
+def test_rebalance_follows_hits():
+    registry = CacheRegistry(1000, min_share=0.2)
+    busy, idle = make_cache(), make_cache()
+    registry.register('busy', busy)
+    registry.register('idle', idle)
+
+    request(busy, 10)
+    registry.rebalance()
+
+    # Halfway from 500 towards the target of 900
+    assert busy.max_size == 700
+    assert idle.max_size == 300
+    assert busy.max_size + idle.max_size <= registry.budget
+
+    registry.rebalance()  # Nothing was requested since, allocations are kept
+    assert busy.max_size == 700
+
+
+def test_set_budget():
+    registry = CacheRegistry(1000)
+    cache = make_cache()
+    registry.register('cache', cache)
+
+    registry.set_budget(400)
+
+    assert cache.max_size == 400
+    with pytest.raises(ValueError):
+        registry.set_budget(0)
+
+
+def test_snapshot():
+    registry = CacheRegistry(1000)
+    cache = make_cache()
+    registry.register('cache', cache, weight=2)
+    request(cache, 3)
+
+    (usage,) = registry.snapshot()
+
+    assert (usage.name, usage.hits, usage.misses, usage.weight) == ('cache', 3, 0, 2)
+    assert usage.hit_ratio == 1
+
+
+def test_duplicate_names():
+    registry = CacheRegistry(1000)
+    cache = make_cache()
+    registry.register('cache', cache)
+
+    with pytest.raises(ValueError):
+        registry.register('cache', make_cache())
+
+    registry.unregister('cache')
+    registry.register('cache', cache)
+
+
+def test_collected_caches_are_dropped():
+    registry = CacheRegistry(1000)
+    kept = make_cache()
+    registry.register('kept', kept)
+    registry.register('dropped', make_cache())
+    gc.collect()
+
+    registry.set_budget(600)
+
+    assert [usage.name for usage in registry.snapshot()] == ['kept']
+    assert kept.max_size == 600
@@ -0,0 +1,76 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from hordes.cache import ConcurrentBytesCache, ConcurrentSizedCache
+from hordes.cache.concurrent import _ConcurrentCache  # pyright: ignore[reportPrivateUsage]
+
+
+def test_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        _ConcurrentCache(max_size=1)  # pyright: ignore[reportAbstractUsage]
+
+
+def test_counters_and_lru_eviction():
+    cache: ConcurrentSizedCache[str, int] = ConcurrentSizedCache(max_size=2)
+    cache['a'] = 1
+    cache['b'] = 2
+    assert cache['a'] == 1  # `b` is now least recently used
+    cache['c'] = 3
+
+    with pytest.raises(KeyError):
+        cache['b']
+
+    assert 'a' in cache and 'c' in cache
+    info = cache.info()
+    assert (info.hits, info.misses, info.evictions, info.length, info.max_size) == (1, 1, 1, 2, 2)
+
+
+def test_bytes_cache_size():
+    cache: ConcurrentBytesCache[str] = ConcurrentBytesCache(max_size=10)
+    cache['a'] = b'12345'
+    cache['b'] = b'123'
+    assert cache.size == 8
+
+    cache['c'] = b'1234'
+    assert 'a' not in cache
+    assert cache.size == 7
+    assert cache.info().peak_size == 8
+
+
+def test_resize_evicts():
+    cache: ConcurrentBytesCache[int] = ConcurrentBytesCache(max_size=100)
+    for i in range(10):
+        cache[i] = b'x' * 10
+
+    cache.resize(35)
+
+    assert cache.max_size == 35
+    assert cache.size <= 35
+    assert list(cache) == [7, 8, 9]
+    assert cache.info().evictions == 7
+
+
+def test_shards_split_max_size():
+    cache: ConcurrentSizedCache[int, int] = ConcurrentSizedCache(max_size=8, shards=4)
+    for i in range(100):
+        cache[i] = i
+
+    assert len(cache) <= 8
+    with pytest.raises(ValueError):
+        ConcurrentSizedCache(max_size=8, shards=0)
+
+
+def test_concurrent_writes():
+    cache: ConcurrentSizedCache[int, int] = ConcurrentSizedCache(max_size=1000, shards=8)
+
+    def write(start: int) -> None:
+        for i in range(start, start + 100):
+            cache[i] = i
+            assert cache[i] == i
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(write, range(0, 800, 100)))
+
+    assert len(cache) == 800
+    assert cache.info().hits == 800
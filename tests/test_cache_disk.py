@@ -0,0 +1,145 @@
+import os
+
+import pytest
+
+from hordes.cache import ConcurrentBytesCache, DiskCache, TieredCache
+
+
+def test_get_and_set(tmp_path):
+    cache = DiskCache(tmp_path, max_size=100)
+    assert cache.get('a') is None
+
+    cache.set('a', b'value')
+
+    assert cache.get('a') == b'value'
+    assert 'a' in cache
+    assert cache.size == 5
+    info = cache.info()
+    assert (info.hits, info.misses, info.length) == (1, 1, 1)
+
+
+def test_overwrite_counts_size_once(tmp_path):
+    cache = DiskCache(tmp_path, max_size=100)
+
+    for _ in range(50):
+        cache.set('a', b'x' * 10)
+    cache.set('a', b'x' * 4)
+
+    assert cache.size == 4
+    assert cache.info().evictions == 0
+    assert cache.get('a') == b'x' * 4
+
+
+def test_prune_removes_least_recently_used(tmp_path):
+    cache = DiskCache(tmp_path, max_size=30, low_water=1)
+    for key in 'abc':
+        cache.set(key, b'x' * 10)
+
+    cache.get('a')  # Marks as recently used
+    cache.set('d', b'x' * 10)
+
+    assert 'b' not in cache
+    assert all(key in cache for key in 'acd')
+    assert cache.size == 30
+    assert cache.info().evictions == 1
+
+
+def test_prune_down_to_low_water(tmp_path):
+    cache = DiskCache(tmp_path, max_size=100, low_water=0.5)
+    for key in range(10):
+        cache.set(str(key), b'x' * 10)
+
+    cache.set('10', b'x' * 10)
+
+    # Oldest files are removed until half of the space is free, following writes don't prune
+    assert cache.size == 50
+    assert cache.info().evictions == 6
+    assert [str(key) in cache for key in range(11)] == [False] * 6 + [True] * 5
+    for key in range(11, 16):
+        cache.set(str(key), b'x' * 10)
+    assert cache.info().evictions == 6
+
+
+def test_sync_orders_by_modification_time(tmp_path):
+    writer = DiskCache(tmp_path, max_size=100)
+    for i, key in enumerate('abc'):
+        writer.set(key, b'x' * 10)
+        os.utime(writer._get_path(key), (i, i))  # pyright: ignore[reportPrivateUsage]
+    os.utime(writer._get_path('a'))  # pyright: ignore[reportPrivateUsage]
+
+    # Another process starts with files of the first one, least recently modified is removed first
+    cache = DiskCache(tmp_path, max_size=30, low_water=1)
+    cache.set('d', b'x' * 10)
+
+    assert 'b' not in cache
+    assert all(key in cache for key in 'acd')
+    assert cache.info().length == 3
+
+
+def test_sync_picks_up_other_writers(tmp_path):
+    cache = DiskCache(tmp_path, max_size=100)
+    DiskCache(tmp_path, max_size=100).set('a', b'x' * 10)
+    assert cache.size == 0
+
+    cache.sync()
+
+    assert cache.size == 10
+    assert cache.info().length == 1
+
+
+def test_oversized_values_are_skipped(tmp_path):
+    cache = DiskCache(tmp_path, max_size=4)
+    cache.set('a', b'12345')
+
+    assert cache.get('a') is None
+    assert cache.size == 0
+
+
+def test_shared_between_instances(tmp_path):
+    DiskCache(tmp_path, max_size=100).set('a', b'value')
+
+    cache = DiskCache(tmp_path, max_size=100)
+
+    assert cache.size == 5
+    assert cache.get('a') == b'value'
+    assert cache.delete('a')
+    assert not cache.delete('a')
+    assert cache.size == 0
+
+
+def test_clear(tmp_path):
+    cache = DiskCache(tmp_path, max_size=100)
+    cache.set('a', b'1')
+    cache.set('b', b'2')
+    cache.clear()
+
+    assert cache.size == 0
+    assert cache.info().length == 0
+
+
+def test_invalid_size(tmp_path):
+    with pytest.raises(ValueError):
+        DiskCache(tmp_path, max_size=0)
+    with pytest.raises(ValueError):
+        DiskCache(tmp_path, max_size=10, low_water=1.5)
+
+
+def test_tiered_cache(tmp_path):
+    disk = DiskCache(tmp_path, max_size=100)
+    TieredCache(ConcurrentBytesCache(max_size=100), disk, namespace='v1:')['a'] = b'value'
+
+    # New process starts with an empty memory tier
+    memory: ConcurrentBytesCache[str] = ConcurrentBytesCache(max_size=100)
+    cache = TieredCache(memory, disk, namespace='v1:')
+
+    assert 'a' in cache
+    assert cache['a'] == b'value'
+    assert memory['a'] == b'value'
+    assert 'a' not in TieredCache(ConcurrentBytesCache(max_size=100), disk, namespace='v2:')
+
+    del cache['a']
+    assert 'a' not in cache
+    with pytest.raises(KeyError):
+        cache['a']
+    with pytest.raises(KeyError):
+        del cache['a']
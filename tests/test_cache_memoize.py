@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from hordes.cache import SingleFlight, SizedCache, make_key, memoize, memoize_async, memoize_method
+
+
+def test_make_key():
+    assert make_key(1, 2) == (1, 2)
+    assert make_key(1, b=2, a=3) == make_key(1, a=3, b=2)
+
+
+def test_single_flight_shares_one_call():
+    flight: SingleFlight[str, int] = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = 0
+
+    def load() -> int:
+        nonlocal calls
+        calls += 1
+        started.set()
+        release.wait()
+        return 42
+
+    with ThreadPoolExecutor(4) as executor:
+        leader = executor.submit(flight.do, 'key', load)
+        started.wait()
+        followers = [executor.submit(flight.do, 'key', load) for _ in range(3)]
+        time.sleep(0.1)  # Lets followers start waiting for the leader
+        release.set()
+
+        assert leader.result() == 42
+        assert [future.result() for future in followers] == [42, 42, 42]
+
+    assert calls == 1
+
+
+def test_single_flight_shares_errors():
+    flight: SingleFlight[str, int] = SingleFlight()
+
+    def fail() -> int:
+        raise ValueError('failed')
+
+    with pytest.raises(ValueError):
+        flight.do('key', fail)
+
+    # Failed calls are not remembered
+    assert flight.do('key', lambda: 1) == 1
+
+
+def test_memoize():
+    calls: list[int] = []
+
+    @memoize(SizedCache(max_size=2))
+    def square(value: int) -> int:
+        calls.append(value)
+        return value * value
+
+    assert [square(2), square(2), square(3), square(2)] == [4, 4, 9, 4]
+    assert calls == [2, 3]
+
+
+def test_memoize_does_not_cache_errors():
+    calls = 0
+
+    @memoize({})
+    def flaky() -> int:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise RuntimeError
+        return calls
+
+    with pytest.raises(RuntimeError):
+        flaky()
+    assert flaky() == 2
+    assert flaky() == 2
+
+
+def test_memoize_method_uses_instance_cache():
+    def get_key(value: int, *, scale: int = 1) -> tuple[int, int]:
+        return (value, scale)
+
+    class Renderer:
+        def __init__(self) -> None:
+            self.cache: dict[tuple[int, int], int] = {}
+            self.calls = 0
+
+        @memoize_method('cache', key=get_key)
+        def render(self, value: int, *, scale: int = 1) -> int:
+            self.calls += 1
+            return value * scale
+
+    first, second = Renderer(), Renderer()
+    assert first.render(2, scale=3) == first.render(2, scale=3) == 6
+    assert second.render(2, scale=3) == 6
+
+    assert first.calls == second.calls == 1
+    assert first.cache == {(2, 3): 6}
+
+
+def test_memoize_async():
+    calls = 0
+
+    @memoize_async({})
+    async def load(value: int) -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return value
+
+    async def main() -> list[int]:
+        results = await asyncio.gather(*(load(1) for _ in range(5)))
+        return [*results, await load(1)]
+
+    assert asyncio.run(main()) == [1] * 6
+    assert calls == 1
@@ -0,0 +1,114 @@
+import pytest
+
+from hordes.cache import GDSFPolicy, LRUPolicy, PolicyCache, TinyLFUPolicy, compare_policies, replay_trace
+
+
+def test_lru_policy_evicts_least_recently_used():
+    policy: LRUPolicy[str] = LRUPolicy(3)
+    assert policy.insert('a', 1, 1) == []
+    assert policy.insert('b', 1, 1) == []
+    assert policy.insert('c', 1, 1) == []
+    policy.access('a', True)
+
+    assert policy.insert('d', 1, 1) == ['b']
+    assert policy.resize(1) == ['c', 'a']
+    assert policy.size == 1
+
+
+def test_gdsf_keeps_expensive_entries():
+    policy: GDSFPolicy[str] = GDSFPolicy(2)
+    policy.insert('expensive', 1, 100)
+    policy.insert('cheap', 1, 1)
+
+    assert policy.insert('new', 1, 50) == ['cheap']
+
+
+def test_gdsf_prefers_small_entries():
+    policy: GDSFPolicy[str] = GDSFPolicy(10)
+    policy.insert('large', 8, 1)
+    policy.insert('small', 1, 1)
+
+    assert policy.insert('other', 2, 1) == ['large']
+
+
+def test_tinylfu_rejects_one_off_entries():
+    policy: TinyLFUPolicy[int] = TinyLFUPolicy(10, window=0.1)
+    for key in range(10):
+        policy.insert(key, 1, 1)
+    for _ in range(5):
+        for key in range(10):
+            policy.access(key, True)
+
+    # New keys pass through the window and are rejected, popular ones stay
+    evicted = [key for new in range(100, 120) for key in policy.insert(new, 1, 1)]
+
+    assert set(range(100, 119)) <= set(evicted)
+    assert policy.size <= 10
+    assert len(set(range(10)) - set(evicted)) >= 8
+
+
+def test_tinylfu_admission_weighs_cost():
+    def admitted(cost: float) -> bool:
+        policy: TinyLFUPolicy[str] = TinyLFUPolicy(2, window=0.5)
+        policy.insert('resident', 1, 1)
+        policy.insert('filler', 1, 1)  # Moves `resident` out of the window into the main segment
+        policy.access('candidate', False)
+        policy.access('resident', True)
+        policy.access('resident', True)
+
+        # `candidate` is requested less often than `resident`, it's only worth more when it's expensive
+        evicted = policy.insert('candidate', 1, cost) + policy.insert('next', 1, 1)
+        return 'candidate' not in evicted
+
+    assert not admitted(1)
+    assert admitted(100)
+
+
+def test_policy_cache():
+    cache: PolicyCache[str, bytes] = PolicyCache(max_size=10)
+    cache['a'] = b'12345'
+    cache['b'] = b'12345'
+    assert cache['a'] == b'12345'
+    cache['c'] = b'123'
+
+    assert 'b' not in cache
+    assert cache.size == 8
+    assert not cache.set('d', b'x' * 11)
+
+    info = cache.info()
+    assert (info.hits, info.evictions, info.length) == (1, 1, 2)
+
+    cache.resize(3)
+    assert list(cache) == ['c']
+    with pytest.raises(ValueError):
+        cache.resize(0)
+
+
+def test_policy_cache_overwrite():
+    cache: PolicyCache[str, bytes] = PolicyCache(max_size=10, policy=GDSFPolicy)
+    cache.set('a', b'1234', cost=5)
+    cache.set('a', b'12')
+
+    assert cache.size == 2
+    assert len(cache) == 1
+
+
+def test_replay_trace():
+    trace = [('a', 10, 1.0), ('b', 10, 5.0), ('a', 10, 1.0), ('b', 10, 5.0), ('c', 100, 1.0)]
+
+    result = replay_trace(trace, LRUPolicy(20))
+
+    assert result.requests == 5
+    assert result.hits == 2
+    assert result.hit_ratio == pytest.approx(2 / 5)
+    assert result.byte_hit_ratio == pytest.approx(20 / 140)
+    assert result.cost_hit_ratio == pytest.approx(6 / 13)
+
+
+def test_compare_policies():
+    trace = [(key % 7, 1, 1.0) for key in range(100)]
+
+    results = compare_policies(trace, 10)
+
+    assert set(results) == {'lru', 'tinylfu', 'gdsf'}
+    assert all(result.hits == 93 for result in results.values())
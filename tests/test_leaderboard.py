@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from hordes.models import RankingDict
+from hordes.tierlist import _SortedKeyList  # pyright: ignore[reportPrivateUsage]
+from hordes.tierlist import Leaderboard, get_leaderboard_rank, get_tierlist_rank
+
+RANKS = [2000.0 - 100 * i for i in range(17)]
+
+
+def test_sorted_key_list():
+    rng = random.Random(1)
+    keys = _SortedKeyList(load=4)
+    expected: list[tuple[float, float, int]] = []
+
+    for id in range(200):
+        key = (rng.random(), rng.random(), id)
+        keys.add(key)
+        expected.append(key)
+    for key in rng.sample(expected, 120):
+        keys.remove(key)
+        expected.remove(key)
+    expected.sort()
+
+    assert len(keys) == len(expected)
+    assert list(keys) == expected
+    assert [keys[i] for i in range(len(keys))] == expected
+    assert keys[-1] == expected[-1]
+    for key in expected[::7]:
+        assert keys.bisect_left(key) == expected.index(key)
+
+    with pytest.raises(KeyError):
+        keys.remove((2.0, 0.0, 0))
+    with pytest.raises(IndexError):
+        keys[len(expected)]
+
+
+def test_leaderboard_updates():
+    leaderboard = Leaderboard({1: 100.0, 2: 300.0, 3: 200.0}, ranks=RANKS)
+
+    assert list(leaderboard.leaderboard) == [300.0, 200.0, 100.0]
+    assert leaderboard.get_position(1) == 2
+
+    leaderboard.upsert(1, 400.0)
+    leaderboard.remove(2)
+
+    assert leaderboard.top(2) == [(1, 400.0), (3, 200.0)]
+    assert leaderboard.get_leaderboard_rank(250.0) == get_leaderboard_rank(
+        RankingDict(ranks=RANKS, leaderboard=[400, 200]), 250
+    )
+    assert leaderboard.get_tierlist_rank(1950.0) == get_tierlist_rank(RankingDict(ranks=RANKS, leaderboard=[]), 1950)
+
+
+def test_leaderboard_snapshot(tmp_path):
+    leaderboard = Leaderboard({1: 100.0, 2: 300.0}, ranks=RANKS)
+    leaderboard.dump(tmp_path / 'leaderboard.json')
+
+    loaded = Leaderboard.load(tmp_path / 'leaderboard.json')
+
+    assert list(loaded.leaderboard) == list(leaderboard.leaderboard)
+    assert tuple(loaded.ranks) == tuple(RANKS)
+
+
+def test_leaderboard_ties_and_missing_ids():
+    leaderboard = Leaderboard({1: 200.0, 2: 200.0, 3: 100.0})
+
+    # Equal scores keep a stable order by id
+    assert leaderboard.top(3) == [(1, 200.0), (2, 200.0), (3, 100.0)]
+    assert leaderboard.get_score(4) is None
+    assert 4 not in leaderboard
+
+    leaderboard.upsert(3, 100.0)
+    assert len(leaderboard) == 3
+    with pytest.raises(KeyError):
+        leaderboard.remove(4)
@@ -0,0 +1,74 @@
+import math
+
+import pytest
+
+from hordes import Character, Item
+from hordes.data import STATPOINTS_PER_LEVEL
+
+POOL = ('sword50t2', 'sword50t7', 'armor50t3', 'armor50t5', 'boot50t6', 'charm90t3')
+STATPOINTS = {0: 70, 1: 50, 3: 15}
+# Item level boundaries of `POOL` on both sides, and the level range ends
+LEVELS = (1, 4, 5, 19, 20, 34, 35, 37, 38, 39, 40, 44, 45)
+
+
+def make_character() -> Character:
+    character = Character('Tester', 0, 0, 45, prestige=20000, id=1)
+    character.add_statpoints(STATPOINTS)
+    return character
+
+
+def get_reference_stats(level: int, pool: list[Item]) -> dict[int, float]:
+    """Stats of a character built at `level` the regular way, with the gear `level_curve` should pick."""
+    available = level * STATPOINTS_PER_LEVEL
+    used = sum(STATPOINTS.values())
+    scale = min(available / used, 1)
+
+    reference = make_character()
+    reference.set_level(level)
+    reference.clear_statpoints()
+    reference.add_statpoints({id: math.floor(value * scale) for id, value in STATPOINTS.items()})
+    # Later items replace earlier ones in the same slot, so the best legal item of each slot stays
+    reference.set_items(*sorted(pool, key=lambda item: item.gearscore))
+
+    return dict(reference.stats)
+
+
+def test_level_curve_matches_characters_at_each_level():
+    pool = [Item.from_generated(item) for item in POOL]
+    character = make_character()
+
+    curve = character.level_curve(LEVELS, items=pool)
+
+    assert curve.levels == LEVELS
+    for level in LEVELS:
+        assert curve.get_row(level) == pytest.approx(get_reference_stats(level, pool)), level
+
+
+def test_level_curve_gear_follows_item_levels():
+    pool = [Item.from_generated(item) for item in POOL]
+
+    curve = make_character().level_curve((4, 5, 34, 35, 45), items=pool)
+
+    gear = [sorted(POOL[pool.index(item)] for item in items) for items in curve.gear]
+    assert gear == [
+        [],
+        ['sword50t2'],
+        ['armor50t3', 'sword50t2'],
+        ['armor50t3', 'sword50t7'],
+        ['armor50t5', 'boot50t6', 'charm90t3', 'sword50t7'],
+    ]
+
+
+def test_level_curve_does_not_change_character():
+    character = make_character()
+    character.set_items(Item.from_generated('sword50t7'), Item.from_generated('armor50t3'))
+    stats = dict(character.stats)
+
+    curve = character.level_curve()
+
+    assert curve.levels == tuple(range(1, 46))
+    assert dict(character.stats) == stats
+    assert character.level == 45
+    # Equipped items are the default pool
+    assert curve[25] == tuple(float(sum(item.gearscore for item in gear)) for gear in curve.gear)
+    assert len(curve[0]) == 45
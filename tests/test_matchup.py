@@ -0,0 +1,93 @@
+import math
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from hordes import Character, Item
+from hordes.matchup import _get_ttk  # pyright: ignore[reportPrivateUsage]
+from hordes.matchup import MatchupProfiles, get_matchup_matrix, get_matchup_profiles, iter_matchup_tiles
+
+
+def make_profiles(size: int, seed: int = 0) -> MatchupProfiles:
+    rng = np.random.default_rng(seed)
+    return MatchupProfiles(
+        dps=rng.uniform(50, 500, size),
+        burst=rng.uniform(0, 300, size),
+        ehp=rng.uniform(500, 3000, size),
+        variance=rng.uniform(0, 0.05, size),
+    )
+
+
+def test_ttk_edge_cases():
+    dps = np.array([100.0, 0.0, 0.0, 100.0])
+    burst = np.array([0.0, 0.0, 500.0, 600.0])
+    ehp = np.array([1000.0, 1000.0, 500.0, 500.0])
+
+    # Regular, no damage, killed by burst without DPS, burst larger than EHP
+    assert _get_ttk(dps, burst, ehp).tolist() == [10.0, math.inf, 0.0, 0.0]
+
+
+def test_win_matrix_is_complementary():
+    profiles = make_profiles(37)
+    ttk, win = get_matchup_matrix(profiles, dtype=np.float64)
+
+    assert np.allclose(win + win.T, 1)
+    assert np.allclose(np.diagonal(win), 0.5)
+    assert np.all((win >= 0) & (win <= 1))
+    assert ttk.shape == (37, 37)
+
+
+def test_win_matrix_with_unkillable_and_instant_kills():
+    profiles = MatchupProfiles(
+        dps=np.array([0.0, 100.0, 100.0]),
+        burst=np.array([0.0, 5000.0, 0.0]),
+        ehp=np.array([1000.0, 1000.0, 1000.0]),
+        variance=np.zeros(3),
+    )
+
+    ttk, win = get_matchup_matrix(profiles, dtype=np.float64)
+
+    assert not np.isnan(win).any()
+    assert np.allclose(win + win.T, 1)
+    assert ttk[0, 1] == math.inf and ttk[1, 0] == 0
+    assert win[1, 0] == 1 and win[0, 1] == 0
+
+
+@pytest.mark.parametrize('tile_size', [1, 4, 16])
+def test_tiles_match_full_matrix(tile_size: int):
+    profiles = make_profiles(37)
+    ttk, win = get_matchup_matrix(profiles, tile_size=64)
+
+    tiled_ttk, tiled_win = get_matchup_matrix(profiles, tile_size=tile_size)
+
+    assert np.array_equal(tiled_ttk, ttk)
+    assert np.array_equal(tiled_win, win)
+
+    tiles = list(iter_matchup_tiles(profiles, tile_size=tile_size))
+    assert len(tiles) == math.ceil(37 / tile_size) ** 2
+
+
+def test_matrix_into_given_arrays():
+    profiles = make_profiles(5)
+    out = (np.zeros((5, 5), dtype=np.float64), np.zeros((5, 5), dtype=np.float64))
+
+    ttk, win = get_matchup_matrix(profiles, tile_size=2, dtype=np.float64, out=out)
+
+    assert ttk is out[0] and win is out[1]
+    assert np.allclose(win + win.T, 1)
+    with pytest.raises(ValueError):
+        get_matchup_matrix(profiles, out=(np.zeros((4, 4)), np.zeros((5, 5))))
+    with pytest.raises(ValueError):
+        next(iter_matchup_tiles(profiles, tile_size=0))
+
+
+def test_profiles_from_characters():
+    character = Character('Tester', 0, 0, 45, id=1)
+    character.set_items(Item.from_generated('sword100t10m100M100'), Item.from_generated('armor90t8hp80def80'))
+
+    profiles = get_matchup_profiles([character, character])
+
+    assert profiles.dps.tolist() == [character.stats[101]] * 2
+    assert profiles.ehp.tolist() == [character.stats[103]] * 2
+    assert all(value >= 0 for value in profiles.variance)
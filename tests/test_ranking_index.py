@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from hordes.models import RankingDict
+from hordes.tierlist import RankingIndex, get_leaderboard_rank, get_tierlist_rank
+
+RANKS = [2000.0 - 100 * i for i in range(17)]
+LEADERBOARD = sorted((random.Random(0).uniform(0, 3000) for _ in range(500)), reverse=True)
+
+
+def test_ranking_index_matches_linear_search():
+    ranking = RankingDict(ranks=RANKS, leaderboard=LEADERBOARD)
+    index = RankingIndex(ranking)
+
+    for buildscore in [-1.0, 0.0, 400.0, 1450.5, 2000.0, 2999.99, 3500.0, *LEADERBOARD[::37]]:
+        assert index.get_tierlist_rank(buildscore) == get_tierlist_rank(ranking, buildscore)
+        assert index.get_leaderboard_rank(buildscore) == get_leaderboard_rank(ranking, buildscore)
+
+
+def test_ranking_index_empty_ranking():
+    ranking = RankingDict(ranks=[], leaderboard=[])
+    index = RankingIndex(ranking)
+
+    assert index.get_tierlist_rank(1000.0) == get_tierlist_rank(ranking, 1000.0) == -1
+    assert index.get_leaderboard_rank(1000.0) == get_leaderboard_rank(ranking, 1000.0) == -1
+
+
+def test_ranking_index_batch_lookups():
+    np = pytest.importorskip('numpy')
+
+    ranking = RankingDict(ranks=RANKS, leaderboard=LEADERBOARD)
+    index = RankingIndex(ranking)
+    buildscores = [-1.0, 350.0, 1999.99995, 2000.0, 3500.0, *LEADERBOARD[::50]]
+
+    assert np.array_equal(index.get_tierlist_ranks(buildscores), [index.get_tierlist_rank(b) for b in buildscores])
+    assert np.array_equal(index.get_leaderboard_ranks(buildscores), [index.get_leaderboard_rank(b) for b in buildscores])
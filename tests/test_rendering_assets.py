@@ -0,0 +1,101 @@
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import pytest
+from PIL import Image
+
+from hordes.cache import DiskCache
+from hordes.rendering import AssetLoader, assets
+from hordes.rendering.assets import ImageLoaderP, open_image
+
+SVG = '<svg xmlns="http://www.w3.org/2000/svg" width="{}" height="{}"><rect width="100%" height="100%" fill="red"/></svg>'
+
+
+class BytesLoader:
+    """Loader that only implements `AssetLoaderP.open`."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def open(self, path: Union[str, Path]) -> BytesIO:
+        self.calls += 1
+        buffer = BytesIO()
+        Image.new('RGBA', (64, 32), (255, 0, 0, 255)).save(buffer, 'PNG')
+        buffer.seek(0)
+        return buffer
+
+
+def test_open_image_without_image_loader():
+    loader = BytesLoader()
+    assert not isinstance(loader, ImageLoaderP)
+
+    image = open_image(loader, 'icon', (16, 16), 'RGB')
+
+    assert (image.size, image.mode) == ((16, 8), 'RGB')
+    assert open_image(loader, 'icon').size == (64, 32)
+    assert loader.calls == 2
+
+
+def test_open_image_is_cached(tmp_path: Path):
+    Image.new('RGBA', (64, 32)).save(tmp_path / 'icon.png')
+    loader = AssetLoader({'': str(tmp_path / '{path}.png')})
+    assert isinstance(loader, ImageLoaderP)
+
+    first = open_image(loader, 'icon', (16, 16))
+    second = open_image(loader, 'icon', (16, 16))
+
+    assert first.size == (16, 8)
+    assert loader.image_cache_info().length == 1
+    assert second.size == first.size
+
+
+def count_rasterizations(monkeypatch: pytest.MonkeyPatch) -> list[dict[str, Any]]:
+    calls: list[dict[str, Any]] = []
+    svg2png = assets._svg2png  # pyright: ignore[reportPrivateUsage]
+
+    def counted(source: bytes, **options: Any) -> bytes:
+        calls.append(options)
+        return svg2png(source, **options)
+
+    monkeypatch.setattr(assets, '_svg2png', counted)
+    return calls
+
+
+@pytest.fixture
+def svg_path(tmp_path: Path) -> Path:
+    (tmp_path / 'wide.svg').write_text(SVG.format(40, 20))
+    (tmp_path / 'tall.svg').write_text(SVG.format(10, 30))
+    return tmp_path
+
+
+def make_svg_loader(tmp_path: Path, disk_cache: Optional[DiskCache] = None) -> AssetLoader:
+    return AssetLoader({'': str(tmp_path / '{path}.svg')}, disk_cache=disk_cache)
+
+
+def test_svg_rasterized_at_target_size(svg_path: Path, monkeypatch: pytest.MonkeyPatch):
+    calls = count_rasterizations(monkeypatch)
+    loader = make_svg_loader(svg_path)
+
+    assert loader.open_image('wide', (16, 16)).size == (16, 8)
+    assert loader.open_image('wide', (80, 80)).size == (80, 40)  # Enlarged, unlike raster images
+    assert loader.open_image('tall', (60, 60)).size == (20, 60)
+    assert loader.open_image('wide').size == (40 * assets.SVG_SCALE, 20 * assets.SVG_SCALE)
+    rasterized = len(calls)
+
+    assert loader.open_image('wide', (16, 16), 'RGB').mode == 'RGB'
+    assert len(calls) == rasterized  # Other modes reuse the rasterized size
+
+
+def test_svg_disk_cache(svg_path: Path, monkeypatch: pytest.MonkeyPatch):
+    calls = count_rasterizations(monkeypatch)
+    disk_cache = DiskCache(svg_path / 'cache', max_size=1024 * 1024)
+
+    first = make_svg_loader(svg_path, disk_cache).open_image('wide', (16, 16))
+    rasterized = len(calls)
+    # A new loader, e.g. in another process, reads the rasterized file from disk
+    second = make_svg_loader(svg_path, disk_cache).open_image('wide', (16, 16))
+
+    assert rasterized > 0
+    assert len(calls) == rasterized
+    assert second.tobytes() == first.tobytes()
@@ -0,0 +1,146 @@
+from conftest import DefaultFontLoader, FakeLocale, GeneratedLoader
+from PIL import Image
+
+from hordes import Character, Item
+from hordes.cache import CacheRegistry, CacheUsage
+from hordes.data import EQUIP_SLOT_IDS
+from hordes.rendering import CharacterImage
+from hordes.rendering.character import _get_patch  # pyright: ignore[reportPrivateUsage]
+
+
+def make_character() -> Character:
+    character = Character('Tester', 0, 0, 45, prestige=20000, elo=1900, id=1)
+    character.set_items(
+        Item.from_generated('sword100t10m100M100'),
+        Item.from_generated('armor90t8hp80def80'),
+        Item.from_generated('ring80t5c50h50', upgrade=3),
+        Item.from_generated('charm90t3'),
+    )
+    return character
+
+
+def make_renderer(loc: FakeLocale, loader: GeneratedLoader, font_loader: DefaultFontLoader) -> CharacterImage:
+    return CharacterImage(loc=loc, loader=loader, font_loader=font_loader)
+
+
+def make_uncached_renderer(loc: FakeLocale, loader: GeneratedLoader, font_loader: DefaultFontLoader) -> CharacterImage:
+    """Renderer whose tile and layer caches can't hold any entry."""
+    return CharacterImage(loc=loc, loader=loader, font_loader=font_loader, max_tile_cache_size=1, max_layer_cache_size=1)
+
+
+def get_usage(renderer: CharacterImage) -> dict[str, CacheUsage]:
+    registry = CacheRegistry(1024 * 1024 * 1024)
+    renderer.register_caches(registry)
+    return {usage.name: usage for usage in registry.snapshot()}
+
+
+def get_pixels(renderer: CharacterImage, character: Character) -> bytes:
+    with renderer.render_image(character) as image:
+        return image.tobytes()
+
+
+def test_background_is_optional(loc: FakeLocale, loader: GeneratedLoader, font_loader: DefaultFontLoader):
+    background = CharacterImage.render_background(loc, font_loader)
+    positional = CharacterImage(background, loc, loader, font_loader)
+    default = CharacterImage(loc=loc, loader=loader, font_loader=font_loader)
+
+    character = make_character()
+    with Image.open(positional.render(character)) as first, Image.open(default.render(character)) as second:
+        assert first.tobytes() == second.tobytes()
+
+
+def test_render_locales(loc: FakeLocale, loader: GeneratedLoader, font_loader: DefaultFontLoader):
+    other = FakeLocale('de')
+    renderer = CharacterImage(loc=loc, loader=loader, font_loader=font_loader)
+    character = make_character()
+
+    for rank in (False, True):
+        rendered = [buffer.getvalue() for buffer in renderer.render_locales(character, [loc, other, loc], rank=rank)]
+
+        expected = renderer.render(character, rank=rank).getvalue()
+        expected_other = CharacterImage(loc=other, loader=loader, font_loader=font_loader).render(character, rank=rank)
+        assert rendered == [expected, expected_other.getvalue(), expected]
+        assert expected != expected_other.getvalue()
+
+
+def test_tiles_are_shared_between_characters(loc: FakeLocale, loader: GeneratedLoader, font_loader: DefaultFontLoader):
+    renderer = make_renderer(loc, loader, font_loader)
+    first = make_character()
+    second = make_character()
+    second.set_items(Item.from_generated('ring80t5c50h50', upgrade=5))  # Same sword, armor and empty slots
+
+    get_pixels(renderer, first)
+    tiles = get_usage(renderer)['character.tiles']
+    pixels = get_pixels(renderer, second)
+
+    usage = get_usage(renderer)['character.tiles']
+    assert usage.hits == tiles.hits + len(EQUIP_SLOT_IDS) - 1
+    assert usage.misses == tiles.misses + 1  # Only the ring with a new upgrade badge is drawn
+    assert pixels == get_pixels(make_renderer(loc, loader, font_loader), second)
+    assert pixels == get_pixels(make_uncached_renderer(loc, loader, font_loader), second)
+
+
+def test_cached_layers_match_full_redraw(loc: FakeLocale, loader: GeneratedLoader, font_loader: DefaultFontLoader):
+    renderer = make_renderer(loc, loader, font_loader)
+    uncached = make_uncached_renderer(loc, loader, font_loader)
+    character = make_character()
+    assert get_pixels(renderer, character) == get_pixels(uncached, character)
+
+    # Only the stats layer changes, the equipment layer is reused
+    layers = get_usage(renderer)['character.layers']
+    character.add_statpoints({2: 5}, strict=False)
+    pixels = get_pixels(renderer, character)
+
+    assert get_usage(renderer)['character.layers'].hits == layers.hits + 1
+    assert pixels == get_pixels(uncached, character)
+    assert get_usage(uncached)['character.layers'].hits == 0
+
+
+def test_cached_equipment_layer_on_other_locale(loc: FakeLocale, loader: GeneratedLoader, font_loader: DefaultFontLoader):
+    other = FakeLocale('de')
+    renderer = make_renderer(loc, loader, font_loader)
+    character = make_character()
+    get_pixels(renderer, character)
+
+    # Equipment layer diffed against the background of `loc` is composed onto the background of `other`
+    with Image.open(renderer.render_locales(character, [other])[0]) as image:
+        pixels = image.tobytes()
+
+    assert get_usage(renderer)['character.layers'].hits == 1
+    assert pixels == get_pixels(make_uncached_renderer(other, loader, font_loader), character)
+
+
+def compose(base: Image.Image, image: Image.Image) -> Image.Image:
+    """Pastes the patch of `image` onto a copy of `base`, the same way cached layers are composed."""
+    composed = base.copy()
+    patch = _get_patch(image, base)
+    if patch:
+        composed.paste(patch.image, patch.position, patch.mask)
+    return composed
+
+
+def test_patch_of_partial_layer():
+    base = Image.new('RGBA', (20, 10), (10, 20, 30, 255))
+    image = base.copy()
+    image.paste((200, 0, 0, 255), (3, 2, 7, 5))
+    image.putpixel((15, 8), (10, 20, 30, 128))  # Differs only in alpha
+
+    patch = _get_patch(image, base)
+
+    assert patch is not None
+    assert (patch.position, patch.image.size) == ((3, 2), (13, 7))
+    assert compose(base, image).tobytes() == image.tobytes()
+    assert _get_patch(base.copy(), base) is None
+
+
+def test_patch_covering_whole_layer():
+    base = Image.new('RGBA', (20, 10), (10, 20, 30, 255))
+    image = Image.new('RGBA', (20, 10), (0, 0, 0, 0))
+    image.paste((200, 100, 0, 255), (5, 0, 20, 10))
+
+    patch = _get_patch(image, base)
+
+    assert patch is not None
+    assert (patch.position, patch.image.size) == ((0, 0), base.size)
+    # Transparent pixels of the layer replace the base too
+    assert compose(base, image).tobytes() == image.tobytes()
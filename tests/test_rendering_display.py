@@ -0,0 +1,52 @@
+import pytest
+from conftest import DefaultFontLoader, FakeLocale, GeneratedLoader
+
+from hordes import Item
+from hordes.rendering import DisplayList, DisplayListRecorder, ItemImage
+
+
+def record(font_loader: DefaultFontLoader) -> DisplayList:
+    recorder = DisplayListRecorder((40, 30), font_loader, mode='RGBA')
+    recorder.rectangle((0, 0, 39, 29), fill=(10, 20, 30), outline='#ffffff', width=2)
+    recorder.rounded_rectangle((4, 4, 20, 20), radius=3, fill=(200, 0, 0), corners=(True, False, True, False))
+    recorder.text((5, 22), 'Text', fill=(255, 255, 255), font_size=8, anchor='ls')
+    recorder.paste('icon', (22, 4), (16, 16), mode='RGBA', mask=True)
+    return recorder.display_list
+
+
+def test_json_round_trip(font_loader: DefaultFontLoader, loader: GeneratedLoader):
+    display_list = record(font_loader)
+
+    restored = DisplayList.from_json(display_list.to_json())
+
+    assert restored.to_dict() == display_list.to_dict()
+    assert restored.to_json() == display_list.to_json()
+    for size_multiplier in (1, 3):
+        expected = display_list.render(font_loader, size_multiplier, loader=loader)
+        image = restored.render(font_loader, size_multiplier, loader=loader)
+        assert image.size == (40 * size_multiplier, 30 * size_multiplier)
+        assert image.tobytes() == expected.tobytes()
+
+
+def test_defaults_are_not_recorded(font_loader: DefaultFontLoader):
+    recorder = DisplayListRecorder((10, 10), font_loader)
+    recorder.text((0, 0), 'Text')
+
+    ((name, args),) = recorder.display_list.ops
+    assert name == 'text'
+    assert 'spacing' not in args and 'align' not in args and 'fill' not in args
+
+
+def test_paste_requires_loader(font_loader: DefaultFontLoader):
+    with pytest.raises(ValueError):
+        record(font_loader).render(font_loader)
+
+
+def test_item_display_list(loc: FakeLocale, font_loader: DefaultFontLoader):
+    renderer = ItemImage(loc, font_loader)
+    display_list = renderer.render_display_list(Item.from_generated('armor90t8hp80def80'))
+
+    restored = DisplayList.from_json(display_list.to_json())
+
+    assert len(restored) == len(display_list) > 0
+    assert restored.render(font_loader, 2).tobytes() == display_list.render(font_loader, 2).tobytes()
@@ -0,0 +1,146 @@
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import pytest
+from conftest import DefaultFontLoader, FakeLocale
+from PIL import Image
+
+from hordes import Item
+from hordes.rendering import ItemImage, OutputOptions
+from hordes.rendering.item import fit_text
+from hordes.rendering.utils import MeasureCache
+
+ITEMS = ('armor90t8hp80def80', 'ring80t5c50h50', 'boot70t6', 'sword100t10m100M100')  # Charms are dropped next to other items
+
+
+CAPTION = 'Deals additional damage to enemies below half of their health and heals for a part of it'
+
+
+def make_items(amount: int) -> list[Item]:
+    return [Item.from_generated(ITEMS[i % len(ITEMS)]) for i in range(amount)]
+
+
+def get_sizes(pages: list[BytesIO]) -> list[tuple[int, int]]:
+    sizes: list[tuple[int, int]] = []
+    for page in pages:
+        with Image.open(page) as image:
+            sizes.append(image.size)
+    return sizes
+
+
+def test_render_pages(loc: FakeLocale, font_loader: DefaultFontLoader):
+    renderer = ItemImage(loc, font_loader)
+
+    pages = list(renderer.render_pages(*make_items(7), grid_size=(3, 2)))
+
+    assert len(pages) == 2
+    (full_width, full_height), (last_width, last_height) = get_sizes(pages)
+    assert last_width == full_width
+    assert last_height < full_height
+
+    # One row of three cards, same as the last page
+    assert get_sizes(list(renderer.render_pages(*make_items(3), grid_size=(3, 2)))) == [(last_width, last_height)]
+
+
+def test_render_pages_with_executor(loc: FakeLocale, font_loader: DefaultFontLoader):
+    renderer = ItemImage(loc, font_loader)
+    items = make_items(5)
+    output = OutputOptions('RAW')
+
+    with ThreadPoolExecutor(2) as executor:
+        threaded = [
+            page.getvalue() for page in renderer.render_pages(*items, grid_size=(2, 1), output=output, executor=executor)
+        ]
+    sequential = [page.getvalue() for page in renderer.render_pages(*items, grid_size=(2, 1), output=output)]
+
+    assert len(threaded) == 3
+    assert threaded == sequential
+
+
+def test_render_pages_without_items(loc: FakeLocale, font_loader: DefaultFontLoader):
+    pages = list(ItemImage(loc, font_loader).render_pages())
+
+    assert len(pages) == 1
+
+
+def test_render_pages_invalid_grid(loc: FakeLocale, font_loader: DefaultFontLoader):
+    with pytest.raises(ValueError):
+        next(ItemImage(loc, font_loader).render_pages(*make_items(1), grid_size=(0, 2)))
+
+
+def fits(text: str, wh: tuple[int, int], font_size: int) -> bool:
+    """Whether wrapped `text` fits in `wh` according to the font itself."""
+    font = DefaultFontLoader().get_font(400, font_size)
+    lines = text.split('\n')
+    return max(font.getlength(line) for line in lines) < wh[0] and sum(font.getbbox(line)[3] for line in lines) < wh[1]
+
+
+@pytest.mark.parametrize('size_multiplier', [1, 2, 3])
+def test_fit_text_picks_largest_fitting_size(font_loader: DefaultFontLoader, size_multiplier: int):
+    measure = MeasureCache(font_loader)
+    wh = (200, 60)
+    scaled_wh = (wh[0] * size_multiplier, wh[1] * size_multiplier)
+
+    text, font_size = fit_text(CAPTION, wh, measure, 400, 24, size_multiplier=size_multiplier)
+
+    assert 8 < font_size < 24
+    assert '\n' in text and text.replace('\n', ' ') == CAPTION
+    assert fits(text, scaled_wh, font_size * size_multiplier)
+    # Wrapped at one size larger, the text no longer fits
+    larger, _ = fit_text(CAPTION, wh, measure, 400, font_size + 1, size_multiplier, min_font_size=font_size + 1)
+    assert not fits(larger, scaled_wh, (font_size + 1) * size_multiplier)
+
+
+def test_fit_text_single_line(font_loader: DefaultFontLoader):
+    measure = MeasureCache(font_loader)
+
+    assert fit_text('Sword', (200, 60), measure, 400, 24) == ('Sword', 24)
+    assert fit_text('Sword', (200, 60), measure, 400, 24, size_multiplier=2) == ('Sword', 24)
+
+
+def test_fit_text_too_wide_at_minimum_size(font_loader: DefaultFontLoader):
+    measure = MeasureCache(font_loader)
+    word = 'Unbreakable' * 4
+
+    # A single word can't be wrapped, it is returned as is at the smallest size
+    assert fit_text(word, (100, 60), measure, 400, 24) == (word, 8)
+    assert fit_text(f'{word} {word}', (100, 60), measure, 400, 24, min_font_size=10) == (f'{word}\n{word}', 10)
+
+
+def get_pixels(renderer: ItemImage, *items: Item) -> bytes:
+    with renderer.render_image(*items) as image:
+        return image.tobytes()
+
+
+def test_render_cache_follows_locale(loc: FakeLocale, font_loader: DefaultFontLoader):
+    other = FakeLocale('de')
+    renderer = ItemImage(loc, font_loader, render_cache={})
+    item = Item.from_generated(ITEMS[0])
+
+    first = renderer.render(item).getvalue()
+    renderer.loc = other
+    second = renderer.render(item).getvalue()
+
+    assert second != first
+    assert second == ItemImage(other, font_loader).render(item).getvalue()
+    renderer.loc = FakeLocale('en')  # Equal texts in another mapping share entries
+    assert renderer.render(item).getvalue() == first
+    assert renderer.render_cache is not None and len(renderer.render_cache) == 2
+
+
+def test_card_cache(loc: FakeLocale, font_loader: DefaultFontLoader):
+    renderer = ItemImage(loc, font_loader)
+    uncached = ItemImage(loc, font_loader, max_card_cache_size=1)
+    items = make_items(3)
+
+    pixels = get_pixels(renderer, *items, items[0])
+    info = renderer.card_cache_info()
+    assert (info.length, info.misses, info.hits) == (3, 3, 1)
+
+    assert get_pixels(renderer, *items, items[0]) == pixels
+    assert renderer.card_cache_info().hits == 5
+    assert pixels == get_pixels(uncached, *items, items[0])
+    assert uncached.card_cache_info().length == 0
+
+    renderer.loc = FakeLocale('de')
+    assert renderer.card_cache_info().length == 0
@@ -0,0 +1,35 @@
+import pytest
+from conftest import DefaultFontLoader
+
+from hordes.rendering.character import CharacterLayout
+from hordes.rendering.item import ItemLayout
+from hordes.rendering.layout import LayoutCache, get_font_metrics
+
+
+@pytest.mark.parametrize('layout', [CharacterLayout, ItemLayout])
+def test_built_from_font_loader_or_metrics(layout: type[CharacterLayout], font_loader: DefaultFontLoader):
+    metrics = get_font_metrics(font_loader, layout.FONTS)
+
+    built = layout(font_loader)
+
+    assert layout(metrics).boxes == built.boxes
+    assert layout.from_metrics(metrics).boxes == built.boxes
+    assert layout.from_metrics(metrics, boxes=built.boxes).title.outer_box.bbox == built.title.outer_box.bbox
+
+
+def test_invalid_boxes(font_loader: DefaultFontLoader):
+    with pytest.raises(ValueError):
+        ItemLayout(font_loader, boxes=(0, 0, 1, 1))
+
+
+def test_layout_cache(font_loader: DefaultFontLoader):
+    cache = LayoutCache()
+    layout = cache.get(CharacterLayout, font_loader)
+    assert cache.get(CharacterLayout, font_loader) is layout
+
+    exported = cache.dump()
+    restored = LayoutCache()
+    restored.load(exported)
+
+    assert restored.get(CharacterLayout, font_loader).boxes == layout.boxes
+    assert restored.dump() == exported
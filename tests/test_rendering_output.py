@@ -0,0 +1,108 @@
+import os
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from hordes.rendering import (
+    DEFAULT_OUTPUT,
+    OutputOptions,
+    benchmark_encoders,
+    encode_image,
+    get_array,
+    get_buffer,
+    save_image,
+)
+
+
+def make_image(mode: str = 'RGBA') -> Image.Image:
+    image = Image.new(mode, (32, 16), 'black')
+    for x in range(32):
+        image.putpixel((x, x % 16), (255, x * 8, 0, 128) if mode == 'RGBA' else (255, x * 8, 0))
+    return image
+
+
+@pytest.mark.parametrize(
+    ('options', 'format', 'mode'),
+    [
+        (DEFAULT_OUTPUT, 'PNG', 'RGBA'),
+        (OutputOptions(compress_level=1, optimize=True), 'PNG', 'RGBA'),
+        (OutputOptions(quantize=True, colors=16), 'PNG', 'P'),
+        (OutputOptions('WEBP'), 'WEBP', 'RGBA'),
+        (OutputOptions('JPEG', quality=50), 'JPEG', 'RGB'),
+    ],
+)
+def test_encode_image(options: OutputOptions, format: str, mode: str):
+    encoded = encode_image(make_image(), options)
+
+    assert encoded.tell() == 0
+    with Image.open(encoded) as image:
+        assert (image.format, image.mode, image.size) == (format, mode, (32, 16))
+
+
+def test_lossless_outputs_keep_pixels():
+    original = make_image()
+
+    for options in (DEFAULT_OUTPUT, OutputOptions('WEBP', lossless=True)):
+        with Image.open(encode_image(original, options)) as image:
+            assert image.tobytes() == original.tobytes()
+
+    assert encode_image(original, OutputOptions('RAW')).getvalue() == original.tobytes()
+
+
+def test_save_image_to_file_descriptor(tmp_path):
+    path = tmp_path / 'image.png'
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT)
+    try:
+        save_image(make_image(), fd)
+    finally:
+        os.close(fd)
+
+    assert path.read_bytes() == encode_image(make_image()).getvalue()
+
+
+@pytest.mark.parametrize(
+    'kwargs',
+    [{'format': 'GIF'}, {'compress_level': 10}, {'quality': -1}, {'colors': 1}],
+)
+def test_invalid_options(kwargs):
+    with pytest.raises(ValueError):
+        OutputOptions(**kwargs)
+
+
+def test_mimetype():
+    assert DEFAULT_OUTPUT.mimetype == 'image/png'
+    assert OutputOptions('RAW').mimetype == 'application/octet-stream'
+
+
+def test_buffer_and_array():
+    image = make_image('RGB')
+
+    buffer = get_buffer(image)
+    assert len(buffer) == 32 * 16 * 4
+    assert bytes(buffer) == image.convert('RGBA').tobytes()
+
+    np = pytest.importorskip('numpy')
+    array = get_array(image, 'RGB')
+    assert array.shape == (16, 32, 3)
+    assert not array.flags.writeable
+    assert np.array_equal(array[0, 0], [255, 0, 0])
+
+
+def test_benchmark_encoders():
+    outputs = (DEFAULT_OUTPUT, OutputOptions('RAW'))
+
+    results = benchmark_encoders(make_image(), outputs, repeat=1)
+
+    assert [result.options for result in results] == list(outputs)
+    assert results[1].size == 32 * 16 * 4
+    assert all(result.seconds >= 0 for result in results)
+    with pytest.raises(ValueError):
+        benchmark_encoders(make_image(), repeat=0)
+
+
+def test_encode_into_stream():
+    stream = BytesIO()
+    save_image(make_image(), stream, OutputOptions('RAW'))
+
+    assert stream.getvalue() == make_image().tobytes()
@@ -0,0 +1,99 @@
+import pytest
+from conftest import DefaultFontLoader
+from PIL import Image, ImageDraw, ImageFont
+from PIL.ImageFont import FreeTypeFont
+
+from hordes.rendering.utils import DrawScaler, GlyphCache, MeasureCache
+
+FILL = (250, 200, 100, 255)
+POSITIONS = ((10, 20), (10.25, 20.5), (10.5, 20.3), (10.8, 20.9))
+
+
+def get_font(size: float = 14) -> FreeTypeFont:
+    font = ImageFont.load_default(size)
+    assert isinstance(font, FreeTypeFont)
+    return font
+
+
+def draw_pasted(glyph_cache: GlyphCache, text: str, xy: tuple[float, float], anchor: str) -> bytes:
+    with Image.new('RGBA', (120, 40), (20, 30, 40, 255)) as image:
+        DrawScaler(image, DefaultFontLoader(), glyph_cache=glyph_cache).text(xy, text, FILL, font_size=14, anchor=anchor)
+        return image.tobytes()
+
+
+def draw_text(font: FreeTypeFont, text: str, xy: tuple[float, float], anchor: str) -> bytes:
+    with Image.new('RGBA', (120, 40), (20, 30, 40, 255)) as image:
+        ImageDraw.Draw(image).text(xy, text, FILL, font=font, anchor=anchor)
+        return image.tobytes()
+
+
+@pytest.mark.parametrize('text', ['12,345', '+3', '(99%)', '-0.5'])
+@pytest.mark.parametrize('anchor', ['ls', 'la', 'rs', 'rm'])
+def test_composed_digits_match_draw(text: str, anchor: str):
+    glyph_cache = GlyphCache()
+    font = get_font()
+
+    for x, y in POSITIONS:
+        xy = (x + 80 if anchor[0] == 'r' else x, y)
+        assert draw_pasted(glyph_cache, text, xy, anchor) == draw_text(font, text, xy, anchor), xy
+
+    # Runs are composed from masks of single characters
+    assert glyph_cache.info().length > len(POSITIONS)
+
+
+@pytest.mark.parametrize('text', ['Ab12', 'Strength 12'])
+@pytest.mark.parametrize('anchor', ['ls', 'ma', 'ld'])
+def test_rasterized_text_matches_draw(text: str, anchor: str):
+    glyph_cache = GlyphCache()
+    font = get_font()
+
+    for x, y in POSITIONS:
+        xy = (x + 40, y)
+        assert draw_pasted(glyph_cache, text, xy, anchor) == draw_text(font, text, xy, anchor), xy
+
+    assert glyph_cache.info().length == len(POSITIONS)
+
+
+def test_kerned_digits_are_rasterized(monkeypatch: pytest.MonkeyPatch):
+    glyph_cache = GlyphCache()
+    font = get_font()
+    getlength = font.getlength
+    # Pretend the font moves '1' closer to another '1'
+    monkeypatch.setattr(font, 'getlength', lambda text, *args, **kwargs: getlength(text) - (text == '11'))
+
+    mask = glyph_cache.get_mask(font, (400, 14), '1,111', (0.5, 0), 'ls')
+
+    assert glyph_cache.info().length == 1
+    assert mask.mask is not None
+    with Image.new('L', (80, 40)) as image, Image.new('L', (80, 40)) as expected:
+        image.paste(255, (10 + mask.offset[0], 20 + mask.offset[1]), mask.mask)
+        ImageDraw.Draw(expected).text((10.5, 20), '1,111', 255, font=font, anchor='ls')
+        assert image.tobytes() == expected.tobytes()
+
+
+def test_digit_metrics_are_bounded():
+    glyph_cache = GlyphCache(max_fonts=2)
+
+    for size in (10, 12, 14, 16):
+        glyph_cache.get_mask(get_font(size), (400, size), '123', (0, 0), 'ls')
+
+    digits = glyph_cache._digits.info()  # pyright: ignore[reportPrivateUsage]
+    assert (digits.length, digits.evictions, digits.misses) == (2, 2, 4)
+
+
+def test_measure_cache_matches_font():
+    font_loader = DefaultFontLoader()
+    measure = MeasureCache(font_loader)
+    texts = ('Sword', 'Deals 12 damage', 'gy', ' ')
+
+    for _ in range(2):
+        for size in (10, 16):
+            font = font_loader.get_font(400, size)
+            for text in texts:
+                assert measure.getlength(400, size, text) == font.getlength(text)
+                for anchor in (None, 'ls', 'mm'):
+                    assert measure.getbbox(400, size, text, anchor) == font.getbbox(text, anchor=anchor)
+
+    info = measure.info()
+    assert info.length == info.misses == 2 * len(texts) * 4
+    assert info.hits == info.misses
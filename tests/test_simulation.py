@@ -0,0 +1,85 @@
+import pytest
+
+from hordes import Character, Item
+from hordes.simulation import (
+    CHARM_BUFFS,
+    DAMAGE_CHARM_TIER,
+    PROTECTION_CHARM_TIER,
+    PROTECTION_DAMAGE_REDUCTION,
+    CharmState,
+    StatStates,
+    get_stat_states,
+    simulate,
+    simulate_population,
+)
+
+
+def make_character(*charms: str) -> Character:
+    character = Character('Tester', 0, 0, 45, id=1)
+    character.set_items(Item.from_generated('armor90t8hp80def80'), *(Item.from_generated(charm) for charm in charms))
+    return character
+
+
+def test_without_charms_uses_base_stats():
+    states = get_stat_states(make_character())
+
+    assert states.charms == ()
+    assert len(states.dps) == len(states.ehp) == 1
+
+    result = simulate(states, duration=30)
+    assert result.dps == pytest.approx(states.dps[0])
+    assert result.ehp == pytest.approx(states.ehp[0])
+    assert result.damage == pytest.approx(states.dps[0] * 30)
+    assert result.uptime == ()
+
+
+def test_charm_states():
+    states = get_stat_states(make_character('charm90t3', 'charm90t2'))
+
+    assert [charm.tier for charm in states.charms] == [PROTECTION_CHARM_TIER, DAMAGE_CHARM_TIER]
+    assert len(states.dps) == len(states.ehp) == 4
+
+    # Bit 0 is the protection charm, bit 1 the damage charm
+    assert states.ehp[0b01] == pytest.approx(states.ehp[0] / (1 - PROTECTION_DAMAGE_REDUCTION))
+    assert states.dps[0b01] == pytest.approx(states.dps[0])
+    assert states.dps[0b10] > states.dps[0]
+    assert states.ehp[0b10] == pytest.approx(states.ehp[0])
+
+
+def test_timeline_of_single_charm():
+    charm = CharmState(tier=1, cooldown=60, cast_time=1, duration=10)
+    states = StatStates(charms=(charm,), dps=(10.0, 20.0), ehp=(100.0, 200.0))
+
+    result = simulate(states, duration=60)
+
+    # Cast for 1s, buffed for 10s, unbuffed for the remaining 49s
+    assert result.damage == pytest.approx(49 * 10 + 10 * 20)
+    assert result.dps == pytest.approx(result.damage / 60)
+    assert result.ehp == pytest.approx((50 * 100 + 10 * 200) / 60)
+    assert result.uptime == pytest.approx((10 / 60,))
+
+
+def test_casts_wait_for_each_other():
+    charms = (
+        CharmState(tier=1, cooldown=100, cast_time=2, duration=10),
+        CharmState(tier=2, cooldown=100, cast_time=2, duration=10),
+    )
+    states = StatStates(charms=charms, dps=(1.0, 1.0, 1.0, 1.0), ehp=(1.0, 1.0, 1.0, 1.0))
+
+    # Both casts take 4s in total, no damage is dealt while casting
+    assert simulate(states, duration=20).damage == pytest.approx(16)
+
+
+def test_simulate_population_matches_simulate():
+    population = [get_stat_states(make_character()), get_stat_states(make_character('charm90t2'))]
+
+    assert simulate_population(population, 45) == [simulate(states, 45) for states in population]
+
+
+def test_invalid_duration():
+    with pytest.raises(ValueError):
+        simulate(get_stat_states(make_character()), duration=0)
+
+
+def test_charm_buff_tiers():
+    assert set(CHARM_BUFFS) == {PROTECTION_CHARM_TIER, DAMAGE_CHARM_TIER}
@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from hordes.tierlist import QuantileSketch
+
+SHARES = (0.01, 0.1, 0.5, 1)
+
+
+def test_quantile_sketch_cutoffs():
+    rng = random.Random(2)
+    scores = [rng.gauss(1000, 200) for _ in range(20_000)]
+
+    sketch = QuantileSketch(tail=100, seed=0)
+    sketch.extend(scores)
+    ordered = sorted(scores, reverse=True)
+
+    # Top of the distribution is exact, the rest is within the rank error of the sketch
+    assert sketch.get_cutoff(0.001) == ordered[19]
+    assert sketch.get_cutoff(1) == ordered[-1]
+
+    cutoff = sketch.get_cutoff(0.5)
+    share = sum(score >= cutoff for score in scores) / len(scores)
+    assert share == pytest.approx(0.5, abs=0.02)
+
+    ranks = sketch.get_ranks(SHARES)
+    assert list(ranks) == sorted(ranks, reverse=True)
+    assert sketch.to_ranking(SHARES)['ranks'] == ranks
+
+
+def test_quantile_sketch_merge_and_serialization():
+    rng = random.Random(3)
+    scores = [rng.uniform(0, 1000) for _ in range(10_000)]
+
+    left, right = QuantileSketch(seed=0), QuantileSketch(seed=1)
+    left.extend(scores[:5000])
+    right.extend(scores[5000:])
+    left.merge(right)
+
+    assert len(left) == len(scores)
+    assert left.get_cutoff(1) == min(scores)
+    assert left.get_cutoff(0.1) == pytest.approx(sorted(scores)[9000], rel=0.05)
+
+    restored = QuantileSketch.from_dict(left.to_dict())
+    assert restored.get_ranks(SHARES) == left.get_ranks(SHARES)
+
+
+def test_empty_quantile_sketch():
+    with pytest.raises(ValueError):
+        QuantileSketch().get_cutoff(0.5)